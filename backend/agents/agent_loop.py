@@ -26,6 +26,7 @@ import anthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tools.registry import ToolConfig, ToolResult, ToolProgress
+from utils.metrics import LLM_REQUEST_DURATION, LLM_TOKENS, TOOL_EXECUTION_DURATION
 from schemas.chat import (
     AgentTrace,
     AgentIteration,
@@ -588,12 +589,18 @@ async def _call_model(
         if collected_text:
             yield AgentMessage(text=collected_text, iteration=0)
 
-    api_call_ms = int((time.time() - start_time) * 1000)
+    api_call_seconds = time.time() - start_time
+    api_call_ms = int(api_call_seconds * 1000)
     usage = TokenUsage(
         input_tokens=response.usage.input_tokens,
         output_tokens=response.usage.output_tokens,
     )
 
+    model = api_kwargs.get("model", "")
+    LLM_REQUEST_DURATION.observe(api_call_seconds, model=model)
+    LLM_TOKENS.inc(usage.input_tokens, model=model, direction="input")
+    LLM_TOKENS.inc(usage.output_tokens, model=model, direction="output")
+
     yield _ModelResult(response=response, text=collected_text, usage=usage, api_call_ms=api_call_ms)
 
 
@@ -748,7 +755,13 @@ async def _process_tools(
         if cancellation_token.is_cancelled:
             raise asyncio.CancelledError("Cancelled after tool execution")
 
-        execution_ms = int((time.time() - tool_start_time) * 1000)
+        execution_seconds = time.time() - tool_start_time
+        execution_ms = int(execution_seconds * 1000)
+        TOOL_EXECUTION_DURATION.observe(
+            execution_seconds,
+            tool=tool_name if tool_config else "unknown",  # Model-supplied names stay out of labels
+            outcome="error" if exec_result.output_type == "error" else "ok",
+        )
 
         # Build full trace record
         tool_calls.append(ToolCall(
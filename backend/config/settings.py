@@ -73,10 +73,35 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = os.getenv("DB_PASSWORD")
     DB_NAME: str = os.getenv("DB_NAME")
 
+    # Run create_all at startup; disable when `python init_schema.py` runs before boot instead
+    DB_CREATE_ALL_ON_STARTUP: bool = (
+        os.getenv("DB_CREATE_ALL_ON_STARTUP", "true").lower() == "true"
+    )
+
+    # Connection pools (per engine; the replica gets its own pool of the same size)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_WAIT_WARNING_MS: int = int(
+        os.getenv("DB_POOL_WAIT_WARNING_MS", "500")
+    )  # Log a warning when a checkout takes longer than this
+
+    # Optional read replica (same user and database name); unset = reads use the primary
+    DB_READ_HOST: str = os.getenv("DB_READ_HOST", "")
+    DB_READ_PORT: str = os.getenv("DB_READ_PORT", "")
+    READ_AFTER_WRITE_SECONDS: float = float(
+        os.getenv("READ_AFTER_WRITE_SECONDS", "5")
+    )  # After a user's write, their reads stay on the primary this long
+
     # Authentication settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    AUTH_USER_CACHE_TTL_SECONDS: float = float(
+        os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30")
+    )  # validate_token user cache per worker; 0 disables it
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
 
     # API settings
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY")
@@ -119,6 +144,26 @@ class Settings(BaseSettings):
         "authorization",
     ]
     LOG_PERFORMANCE_THRESHOLD_MS: int = 500  # Log slow operations above this threshold
+    LOG_VERBOSE_SAMPLE_RATE: float = float(
+        os.getenv("LOG_VERBOSE_SAMPLE_RATE", "0.1")
+    )  # Fraction of requests logged with full details (slow/failed ones always are)
+    LOG_BODY_MAX_BYTES: int = 10000  # Cap on request/response body copies kept for logging
+
+    # Table limits
+    MAX_ROWS_PER_TABLE: int = int(os.getenv("MAX_ROWS_PER_TABLE", "100"))  # Default row cap; tables may override
+    MAX_ROWS_PER_TABLE_CEILING: int = int(
+        os.getenv("MAX_ROWS_PER_TABLE_CEILING", "1000000")
+    )  # Highest per-table override an admin can grant
+
+    # Delta sync keeps tombstones of deleted rows this long; older `since` values must resync from 0
+    TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+    # Tracking events are buffered in-process and written in multi-row inserts
+    EVENT_BUFFER_BATCH_SIZE: int = int(os.getenv("EVENT_BUFFER_BATCH_SIZE", "200"))  # Flush at this many events
+    EVENT_BUFFER_FLUSH_MS: int = int(os.getenv("EVENT_BUFFER_FLUSH_MS", "2000"))  # ...or after this long
+    EVENT_BUFFER_MAX_PENDING: int = int(
+        os.getenv("EVENT_BUFFER_MAX_PENDING", "10000")
+    )  # Events beyond this (DB slow or down) are dropped
 
     # Tool Stubbing Settings
     TOOL_STUBBING_ENABLED: bool = (
@@ -138,6 +183,14 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def DATABASE_READ_URL(self) -> str:
+        """Replica URL, or "" when no replica is configured."""
+        if not self.DB_READ_HOST:
+            return ""
+        port = self.DB_READ_PORT or self.DB_PORT
+        return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_READ_HOST}:{port}/{self.DB_NAME}"
+
     @property
     def anthropic_model(self) -> str:
         """Get the default Anthropic model"""
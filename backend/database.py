@@ -1,45 +1,32 @@
-from typing import Generator, AsyncGenerator
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
 import logging
+import time
+from fastapi import Request
+from jose import JWTError, jwt
 from models import Base
 from config.settings import settings
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from utils.metrics import DB_QUERY_DURATION
+from utils.pool_metrics import InstrumentedAsyncQueuePool, pool_status
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-import pymysql
-pymysql.install_as_MySQLdb()
 
 logger = logging.getLogger(__name__)
 
-# =============================================================================
-# Sync Engine (legacy - will be removed after full migration)
-# =============================================================================
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True
+# Shared by every engine; see utils/pool_metrics.py for the instrumentation
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def get_db() -> Generator:
-    """
-    FastAPI dependency that provides a SYNC database session.
-    DEPRECATED: Use get_async_db for new code.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =============================================================================
-# Async Engine (new - use for all new code)
+# Async Engine
 # =============================================================================
 
 # Convert sync URL to async URL: mysql+pymysql:// -> mysql+aiomysql://
@@ -57,12 +44,10 @@ ASYNC_DATABASE_URL = _convert_to_async_url(settings.DATABASE_URL)
 
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_logging_name="primary",
     echo=False,
+    **POOL_OPTIONS,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -74,17 +59,134 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+# =============================================================================
+# Read Replica (optional - DB_READ_HOST)
+# =============================================================================
+
+read_engine = None
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        _convert_to_async_url(settings.DATABASE_READ_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="replica",
+        echo=False,
+        **POOL_OPTIONS,
+    )
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine or async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Read-your-writes: user key -> monotonic time of their last commit on the primary,
+# oldest first. Per process, so with several workers a user's next read can land
+# on a worker that didn't see the write; READ_AFTER_WRITE_SECONDS should cover
+# replica lag. Entries leave once their window has passed, and the map is capped.
+_last_writes: "OrderedDict[str, float]" = OrderedDict()
+MAX_TRACKED_WRITERS = 10000
+
+
+def _writer_key(request: Request) -> Optional[str]:
     """
-    FastAPI dependency that provides an ASYNC database session.
+    The caller's user ID from their bearer token, for read-your-writes routing.
 
-    Usage:
-        @router.get("/items")
-        async def get_items(db: AsyncSession = Depends(get_async_db)):
-            result = await db.execute(select(Item))
-            return result.scalars().all()
+    The token is verified (signature and expiry) the same way validate_token
+    does, so forged or expired tokens never get a key.
     """
-    session = AsyncSessionLocal()
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        user_id = jwt.decode(auth[7:], settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]).get("user_id")
+    except JWTError:
+        return None
+    return str(user_id) if user_id is not None else None
+
+
+def _mark_written(key: str) -> None:
+    now = time.monotonic()
+    _last_writes[key] = now
+    _last_writes.move_to_end(key)
+    # Oldest first, so expired entries (and any over the cap) are at the front
+    while _last_writes:
+        oldest_key, written = next(iter(_last_writes.items()))
+        if now - written < settings.READ_AFTER_WRITE_SECONDS and len(_last_writes) <= MAX_TRACKED_WRITERS:
+            break
+        _last_writes.pop(oldest_key)
+
+
+def _wrote_recently(key: Optional[str]) -> bool:
+    if key is None:
+        return False
+    written = _last_writes.get(key)
+    if written is None:
+        return False
+    if time.monotonic() - written < settings.READ_AFTER_WRITE_SECONDS:
+        return True
+    _last_writes.pop(key, None)
+    return False
+
+
+def record_write(user_id: Optional[int]) -> None:
+    """
+    Keep a user's reads on the primary for READ_AFTER_WRITE_SECONDS.
+
+    Commits through get_async_db or writer_session() call this already; use
+    it directly for writes committed on behalf of several users at once.
+    """
+    if read_engine is not None and user_id is not None:
+        _mark_written(str(user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    """Keep a user's reads on the primary for a while after they commit."""
+    key = session.info.get("writer")
+    if key is not None:
+        _mark_written(key)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_replica_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Attempted to write through a read-only (replica) session")
+
+
+# Statement timing for db_query_duration_seconds. On Engine itself so every
+# engine (primary, replica, scripts) is covered; async engines fire these on
+# their sync_engine.
+_STATEMENT_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    keyword = statement.lstrip()[:6].upper()
+    DB_QUERY_DURATION.observe(
+        time.perf_counter() - started,
+        pool=conn.engine.pool.logging_name or "default",
+        statement=keyword if keyword in _STATEMENT_TYPES else "OTHER",
+    )
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_query_timer(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+@asynccontextmanager
+async def _session_scope(session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """Roll back on error and always close, tolerating dead connections."""
     try:
         yield session
     except Exception:
@@ -105,24 +207,84 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             logger.debug("Suppressed DB session cleanup error (likely SSE disconnect)")
 
 
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an ASYNC database session.
+
+    Usage:
+        @router.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+    """
+    session = AsyncSessionLocal()
+    if read_engine is not None:
+        session.info["writer"] = _writer_key(request)
+    async with _session_scope(session):
+        yield session
+
+
+def writer_session(user_id: Optional[int]) -> AsyncSession:
+    """
+    A primary session for writes made outside a request's own session.
+
+    Streaming endpoints write after the response has started, so they can't
+    use get_async_db; commits through this session still count as the
+    user's writes for read-your-writes routing.
+    """
+    session = AsyncSessionLocal()
+    if read_engine is not None and user_id is not None:
+        session.info["writer"] = str(user_id)
+    return session
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an ASYNC session for read-only endpoints.
+
+    Uses the read replica when one is configured, except for a caller who
+    committed a write within READ_AFTER_WRITE_SECONDS — they read from the
+    primary so they always see their own changes. Without a replica this is
+    the same as get_async_db.
+    """
+    if read_engine is None or _wrote_recently(_writer_key(request)):
+        session = AsyncSessionLocal()
+    else:
+        session = AsyncReadSessionLocal()
+        session.info["read_only"] = True
+    async with _session_scope(session):
+        yield session
+
+
+def pool_statuses() -> list:
+    """Occupancy and checkout metrics for every engine's pool."""
+    engines = [async_engine.sync_engine]
+    if read_engine is not None:
+        engines.append(read_engine.sync_engine)
+    return [pool_status(e.pool) for e in engines]
+
+
 # =============================================================================
 # Database Initialization
 # =============================================================================
 
-def init_db():
-    """Initialize database tables (sync version for startup)."""
-    logger.info("Initializing database...")
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Error initializing database: {e}")
-        raise e
-
-
 async def init_async_db():
-    """Initialize database tables (async version)."""
+    """Create any missing tables (CREATE TABLE only — columns come from migrations/)."""
     logger.info("Initializing database (async)...")
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database initialized successfully")
+
+
+async def check_database() -> None:
+    """Raise unless the primary (and the replica, if configured) answer SELECT 1."""
+    for eng in filter(None, (async_engine, read_engine)):
+        async with eng.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (shutdown)."""
+    await async_engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+"""Create any missing tables, as a deploy step before the app boots.
+
+Run this, then start the workers with DB_CREATE_ALL_ON_STARTUP=false so
+they skip create_all and come up without touching the schema.
+"""
+
+import asyncio
+
+from database import init_async_db, dispose_engines
+
+
+async def init_schema():
+    await init_async_db()
+    await dispose_engines()
+    print("Schema initialized!")
+
+
+if __name__ == "__main__":
+    asyncio.run(init_schema())
@@ -1,14 +1,18 @@
+import asyncio
+import time
+
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 from sqlalchemy import text
 from routers import auth, chat_stream, tools, user, organization, admin, help, tracking, chat, tables
-from database import init_db, AsyncSessionLocal
+from database import init_async_db, check_database, dispose_engines, AsyncSessionLocal
 from config import settings, setup_logging
 from middleware import LoggingMiddleware
+from services.event_tracking import event_buffer
 from pydantic import ValidationError
 from fastapi.exceptions import RequestValidationError
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
+from utils import metrics
 
 # Setup logging first
 logger, request_id_filter = setup_logging()
@@ -26,11 +30,11 @@ app = FastAPI(
     }
 )
 
-# Add logging middleware
+# Add logging middleware (also sets X-Request-ID and the X-New-Token refresh header)
 app.add_middleware(LoggingMiddleware, request_id_filter=request_id_filter)
 
-# CORS configuration - include X-New-Token in exposed headers for token refresh
-cors_expose_headers = list(settings.CORS_EXPOSE_HEADERS) + ["X-New-Token"]
+# CORS configuration - include X-New-Token in exposed headers for token refresh, ETag for conditional GETs
+cors_expose_headers = list(settings.CORS_EXPOSE_HEADERS) + ["X-New-Token", "ETag"]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -41,23 +45,6 @@ app.add_middleware(
 )
 
 
-@app.middleware("http")
-async def token_refresh_middleware(request: Request, call_next):
-    """
-    Middleware to inject refreshed token into response header.
-
-    If validate_token() determines the token needs refresh, it stores
-    the new token in request.state.new_token. This middleware reads it
-    and adds it to the response header so the frontend can update its stored token.
-    """
-    response = await call_next(request)
-
-    # Check if a new token was generated during validation
-    if hasattr(request.state, 'new_token') and request.state.new_token:
-        response.headers["X-New-Token"] = request.state.new_token
-
-    return response
-
 # Include routers
 logger.info("Including routers...")
 
@@ -87,11 +74,28 @@ app.include_router(chat.router)
 logger.info("Routers included")
 
 
+READY_CHECK_TIMEOUT = 2.0  # Seconds /api/ready waits for the database
+
+app.state.ready = False
+
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application starting up...")
-    init_db()
-    logger.info("Database initialized")
+    t_start = time.perf_counter()
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        await init_async_db()
+        logger.info("Database initialized")
+    event_buffer.start()
+    app.state.ready = True
+    logger.info(f"Startup complete in {(time.perf_counter() - t_start) * 1000:.0f}ms")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.ready = False
+    await event_buffer.stop()  # Write buffered tracking events before the pools close
+    await dispose_engines()
 
 
 @app.get("/")
@@ -124,6 +128,28 @@ async def health_check():
     return result
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    Readiness probe for load balancers: 503 until startup has finished and
+    while the database (and replica, if configured) can't be reached.
+    Unlike /api/health, which always answers 200 with a status, this gates traffic.
+    """
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    try:
+        await asyncio.wait_for(check_database(), timeout=READY_CHECK_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "database_error": str(e)})
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape target: request, DB, LLM and tool latency histograms for this worker."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request: Request, exc: ValidationError):
     logger.error(f"Pydantic ValidationError in {request.url.path}:")
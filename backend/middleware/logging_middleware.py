@@ -1,151 +1,192 @@
 import time
 import logging
 import json
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import random
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from config.settings import settings
 from config.logging_config import get_request_id
+from utils.metrics import HTTP_REQUEST_DURATION
 
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
-    Middleware for comprehensive request/response logging with performance tracking.
-    
+    Raw ASGI middleware for request/response logging with performance tracking.
+
     Features:
-    - Assigns a unique request ID to each request
-    - Logs request details (method, path, headers, query params, body)
-    - Logs response details (status code, headers, body)
-    - Tracks request duration and logs slow requests
+    - Assigns a unique request ID to each request (X-Request-ID header)
+    - Copies a refreshed token from validate_token (request.state.new_token)
+      into the X-New-Token response header
+    - Logs one line per request with status code and duration; slow and
+      failed requests are logged at warning/error level
+    - Logs request details (query params, client, headers, bodies) for a
+      LOG_VERBOSE_SAMPLE_RATE fraction of requests, plus every slow or failed one
     - Masks sensitive information in logs
+    - Records per-route latency in the http_request_duration_seconds histogram
+
+    Messages are passed straight through: streamed bodies (chat SSE, CSV
+    export) are never buffered, and logged bodies are copies of at most
+    LOG_BODY_MAX_BYTES.
     """
-    
+
     def __init__(self, app: ASGIApp, request_id_filter=None):
-        super().__init__(app)
+        self.app = app
         self.request_id_filter = request_id_filter
-        
-    async def dispatch(self, request: Request, call_next):
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate request ID and set in filter
         request_id = get_request_id()
         if self.request_id_filter:
             self.request_id_filter.request_id = request_id
-            
-        # Add request ID to request state for access in route handlers
-        request.state.request_id = request_id
-        
-        # Start timer for request duration
-        start_time = time.time()
-        
-        # Log request details
-        await self._log_request(request, request_id)
-        
-        # Process the request
+
+        # Shared with request.state in route handlers
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+
+        verbose = random.random() < settings.LOG_VERBOSE_SAMPLE_RATE
+        capture_request = verbose and settings.LOG_REQUEST_BODY
+        capture_response = verbose and settings.LOG_RESPONSE_BODY
+        request_body = bytearray()
+        response_body = bytearray()
+        status_code = 500
+        start_time = time.perf_counter()
+
+        if verbose:
+            logger.info(
+                f"Request: {scope['method']} {scope['path']}",
+                extra=self._request_data(scope, request_id),
+            )
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if capture_request and message["type"] == "http.request":
+                self._capture(request_body, message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                # Set by validate_token when the token is near expiry or the role changed
+                new_token = state.get("new_token")
+                if new_token:
+                    headers.append("X-New-Token", new_token)
+            elif capture_response and message["type"] == "http.response.body":
+                self._capture(response_body, message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate request duration
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Log response details
-            await self._log_response(request, response, duration_ms, request_id)
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
+            await self.app(scope, receive_wrapper if capture_request else receive, send_wrapper)
         except Exception as exc:
-            # Log exceptions
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             logger.exception(
                 f"Unhandled exception processing request: {str(exc)}",
                 extra={
                     "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": scope["method"],
+                    "path": scope["path"],
                     "duration_ms": duration_ms
                 }
             )
             raise
+        else:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self._log_response(
+                scope, request_id, status_code, duration_ms, verbose,
+                request_body if capture_request else None,
+                response_body if capture_response else None,
+            )
         finally:
+            # Route template, not the raw path, to keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start_time,
+                method=scope["method"], route=route, status=str(status_code),
+            )
             # Clear request ID from filter
             if self.request_id_filter:
                 self.request_id_filter.request_id = None
-    
-    async def _log_request(self, request: Request, request_id: str):
-        """Log details about the incoming request."""
+
+    @staticmethod
+    def _capture(buffer: bytearray, chunk: bytes) -> None:
+        """Keep a bounded copy of a body for logging."""
+        room = settings.LOG_BODY_MAX_BYTES - len(buffer)
+        if room > 0 and chunk:
+            buffer.extend(chunk[:room])
+
+    def _request_data(self, scope: Scope, request_id: str) -> dict:
+        """Details about the incoming request."""
+        headers = Headers(scope=scope)
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        client = scope.get("client")
         log_data = {
             "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "query_params": dict(request.query_params),
-            "client_host": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_string": query_string,
+            "client_host": client[0] if client else None,
+            "user_agent": headers.get("user-agent"),
         }
-        
+
         # Log headers if in debug mode
         if settings.LOG_LEVEL == "DEBUG":
-            log_data["headers"] = self._mask_sensitive_headers(dict(request.headers))
-        
-        # Log request body if enabled
-        if settings.LOG_REQUEST_BODY:
-            try:
-                # Clone the request body stream
-                body = await request.body()
-                # Restore the request body stream
-                await request._receive()
-                
-                # Try to parse as JSON
-                try:
-                    body_json = json.loads(body)
-                    log_data["body"] = self._mask_sensitive_data(body_json)
-                except:
-                    # If not JSON, log as string if not too large
-                    if len(body) < 1000:  # Don't log large binary data
-                        log_data["body"] = body.decode('utf-8', errors='replace')
-            except Exception as e:
-                log_data["body_error"] = str(e)
-        
-        logger.info(f"Request: {request.method} {request.url.path}", extra=log_data)
-    
-    async def _log_response(self, request: Request, response: Response, duration_ms: float, request_id: str):
-        """Log details about the response and request performance."""
+            log_data["headers"] = self._mask_sensitive_headers(dict(headers))
+        return log_data
+
+    def _log_response(
+        self,
+        scope: Scope,
+        request_id: str,
+        status_code: int,
+        duration_ms: float,
+        verbose: bool,
+        request_body: bytearray = None,
+        response_body: bytearray = None,
+    ):
+        """Log the response and request performance; failures and slow requests with full details."""
+        method, path = scope["method"], scope["path"]
+        slow = duration_ms > settings.LOG_PERFORMANCE_THRESHOLD_MS
         log_data = {
             "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
+            "method": method,
+            "path": path,
+            "status_code": status_code,
             "duration_ms": round(duration_ms, 2)
         }
-        
-        # Log response headers if in debug mode
-        if settings.LOG_LEVEL == "DEBUG":
-            log_data["headers"] = dict(response.headers)
-        
-        # Log response body if enabled and not a streaming response
-        if settings.LOG_RESPONSE_BODY and hasattr(response, "body"):
-            try:
-                # Try to parse as JSON
-                try:
-                    body_json = json.loads(response.body)
-                    log_data["body"] = self._mask_sensitive_data(body_json)
-                except:
-                    # If not JSON, log as string if not too large
-                    if len(response.body) < 1000:  # Don't log large binary data
-                        log_data["body"] = response.body.decode('utf-8', errors='replace')
-            except Exception as e:
-                log_data["body_error"] = str(e)
-        
+        if verbose or slow or status_code >= 400:
+            log_data.update(self._request_data(scope, request_id))
+        if request_body is not None:
+            log_data["body"] = self._body_for_log(request_body)
+        if response_body is not None:
+            log_data["response_body"] = self._body_for_log(response_body)
+
         # Log at appropriate level based on status code and duration
-        if response.status_code >= 500:
-            logger.error(f"Response: {response.status_code} - {duration_ms:.2f}ms", extra=log_data)
-        elif response.status_code >= 400:
-            logger.warning(f"Response: {response.status_code} - {duration_ms:.2f}ms", extra=log_data)
-        elif duration_ms > settings.LOG_PERFORMANCE_THRESHOLD_MS:
-            logger.warning(f"Slow response: {request.method} {request.url.path} - {response.status_code} - {duration_ms:.2f}ms", extra=log_data)
+        if status_code >= 500:
+            logger.error(f"Response: {method} {path} - {status_code} - {duration_ms:.2f}ms", extra=log_data)
+        elif status_code >= 400:
+            logger.warning(f"Response: {method} {path} - {status_code} - {duration_ms:.2f}ms", extra=log_data)
+        elif slow:
+            logger.warning(f"Slow response: {method} {path} - {status_code} - {duration_ms:.2f}ms", extra=log_data)
         else:
-            logger.info(f"Response: {response.status_code} - {duration_ms:.2f}ms", extra=log_data)
-    
+            logger.info(f"Response: {method} {path} - {status_code} - {duration_ms:.2f}ms", extra=log_data)
+
+    def _body_for_log(self, body: bytearray):
+        """Masked JSON, or text for small non-JSON bodies."""
+        try:
+            return self._mask_sensitive_data(json.loads(body))
+        except ValueError:
+            # Not JSON (or truncated); log as string if not too large
+            if len(body) < 1000:  # Don't log large binary data
+                return body.decode('utf-8', errors='replace')
+            return f"<{len(body)} bytes>"
+
     def _mask_sensitive_headers(self, headers: dict) -> dict:
         """Mask sensitive information in headers."""
         masked_headers = headers.copy()
@@ -153,7 +194,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             if any(sensitive in key.lower() for sensitive in settings.LOG_SENSITIVE_FIELDS):
                 masked_headers[key] = "********"
         return masked_headers
-    
+
     def _mask_sensitive_data(self, data):
         """Recursively mask sensitive fields in data structures."""
         if isinstance(data, dict):
@@ -167,4 +208,4 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         elif isinstance(data, list):
             return [self._mask_sensitive_data(item) for item in data]
         else:
-            return data 
\ No newline at end of file
+            return data
@@ -0,0 +1,12 @@
+-- Delta sync: per-row write versions and tombstones for deleted rows (RowService.changes)
+ALTER TABLE table_rows ADD COLUMN version INT NOT NULL DEFAULT 0;
+CREATE INDEX ix_table_rows_table_version ON table_rows(table_id, version, id);
+CREATE TABLE IF NOT EXISTS table_row_tombstones (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    table_id INT NOT NULL,
+    row_id INT NOT NULL,
+    version INT NOT NULL,
+    deleted_at DATETIME NULL,
+    CONSTRAINT fk_row_tombstones_table FOREIGN KEY (table_id) REFERENCES table_definitions(id) ON DELETE CASCADE
+);
+CREATE INDEX ix_row_tombstones_table_version ON table_row_tombstones(table_id, version);
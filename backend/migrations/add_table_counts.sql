@@ -0,0 +1,6 @@
+-- Denormalized row/column counts on table_definitions (maintained by RowService, import, TableService)
+ALTER TABLE table_definitions ADD COLUMN row_count INT NOT NULL DEFAULT 0;
+ALTER TABLE table_definitions ADD COLUMN column_count INT NOT NULL DEFAULT 0;
+UPDATE table_definitions td
+SET row_count = (SELECT COUNT(*) FROM table_rows tr WHERE tr.table_id = td.id),
+    column_count = COALESCE(JSON_LENGTH(td.columns), 0);
@@ -0,0 +1,2 @@
+-- Per-table row cap set by platform admins (NULL = MAX_ROWS_PER_TABLE)
+ALTER TABLE table_definitions ADD COLUMN max_rows INT NULL;
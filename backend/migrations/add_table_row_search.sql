@@ -0,0 +1,11 @@
+-- Full-text search documents for table rows (RowService.search)
+CREATE TABLE IF NOT EXISTS table_row_search (
+    row_id INT NOT NULL PRIMARY KEY,
+    table_id INT NOT NULL,
+    content TEXT NOT NULL,
+    CONSTRAINT fk_row_search_row FOREIGN KEY (row_id) REFERENCES table_rows(id) ON DELETE CASCADE,
+    CONSTRAINT fk_row_search_table FOREIGN KEY (table_id) REFERENCES table_definitions(id) ON DELETE CASCADE
+);
+CREATE INDEX ix_table_row_search_table_id ON table_row_search(table_id);
+CREATE FULLTEXT INDEX ft_row_search_content ON table_row_search(content);
+-- Then backfill existing rows: python reindex_tables.py
@@ -0,0 +1,14 @@
+-- Typed side index of row values for indexed sort/filter (RowService.list)
+CREATE TABLE IF NOT EXISTS table_row_values (
+    row_id INT NOT NULL,
+    column_id VARCHAR(64) NOT NULL,
+    table_id INT NOT NULL,
+    value_num DOUBLE NULL,
+    value_text VARCHAR(255) NULL,
+    PRIMARY KEY (row_id, column_id),
+    CONSTRAINT fk_row_values_row FOREIGN KEY (row_id) REFERENCES table_rows(id) ON DELETE CASCADE,
+    CONSTRAINT fk_row_values_table FOREIGN KEY (table_id) REFERENCES table_definitions(id) ON DELETE CASCADE
+);
+CREATE INDEX ix_row_values_num ON table_row_values(table_id, column_id, value_num);
+CREATE INDEX ix_row_values_text ON table_row_values(table_id, column_id, value_text);
+-- Then backfill existing rows: python reindex_tables.py
@@ -0,0 +1,2 @@
+-- Composite index for default row ordering and keyset (cursor) pagination
+CREATE INDEX ix_table_rows_table_created ON table_rows(table_id, created_at, id);
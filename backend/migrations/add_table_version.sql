@@ -0,0 +1,2 @@
+-- Per-table write version (bumped by every row and schema write) for ETag / conditional GET
+ALTER TABLE table_definitions ADD COLUMN version INT NOT NULL DEFAULT 0;
@@ -0,0 +1,3 @@
+-- Delta sync tombstone retention (RowService._prune_tombstones)
+ALTER TABLE table_definitions ADD COLUMN tombstones_pruned_version INT NOT NULL DEFAULT 0;
+CREATE INDEX ix_row_tombstones_table_deleted ON table_row_tombstones(table_id, deleted_at, version);
@@ -0,0 +1,18 @@
+-- Optional: hash-partition table_rows by table_id for deployments holding
+-- millions of rows across many tables. Every row query filters on table_id,
+-- so each one is pruned to a single partition, and a large table's rows and
+-- secondary indexes stay in their own B-trees.
+--
+-- InnoDB partitioned tables cannot have foreign keys in either direction, so
+-- this drops the cascades into and out of table_rows. The application already
+-- deletes dependent rows explicitly (RowService._delete_rows,
+-- table_service.delete_table_data), so nothing relies on them. Run after
+-- add_row_changes.sql, on a maintenance window: the ALTERs rebuild the table.
+-- Check the generated FK name first: SHOW CREATE TABLE table_rows;
+ALTER TABLE table_row_values DROP FOREIGN KEY fk_row_values_row;
+ALTER TABLE table_row_search DROP FOREIGN KEY fk_row_search_row;
+ALTER TABLE table_rows DROP FOREIGN KEY table_rows_ibfk_1;
+
+-- The partitioning column must be part of every unique key
+ALTER TABLE table_rows DROP PRIMARY KEY, ADD PRIMARY KEY (id, table_id);
+ALTER TABLE table_rows PARTITION BY KEY (table_id) PARTITIONS 64;
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Date, Enum, JSON, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Date, Enum, JSON, Boolean, Float, Double, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -288,12 +288,18 @@ class TableDefinition(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     columns = Column(JSON, nullable=False, default=list)  # [{id: "col_xxx", name, type, required, default, options}]
+    row_count = Column(Integer, nullable=False, default=0)  # Maintained by every row insert/delete path
+    column_count = Column(Integer, nullable=False, default=0)  # len(columns), kept in sync on create/update
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every row or schema write; backs ETags
+    max_rows = Column(Integer, nullable=True)  # Per-table row cap; NULL = settings.MAX_ROWS_PER_TABLE
+    tombstones_pruned_version = Column(Integer, nullable=False, default=0)  # Delta syncs from before this must resync
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="tables")
-    rows = relationship("TableRow", back_populates="table", cascade="all, delete-orphan")
+    # passive_deletes: rows are removed set-based by delete_table_data, never loaded
+    rows = relationship("TableRow", back_populates="table", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class TableRow(Base):
@@ -303,12 +309,88 @@ class TableRow(Base):
     id = Column(Integer, primary_key=True, index=True)
     table_id = Column(Integer, ForeignKey("table_definitions.id", ondelete="CASCADE"), nullable=False, index=True)
     data = Column(JSON, nullable=False, default=dict)  # {column_id: value, ...}
+    version = Column(Integer, nullable=False, default=0)  # Table version of the last write to this row
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     table = relationship("TableDefinition", back_populates="rows")
 
+    __table_args__ = (
+        # Default listing order (newest first) and keyset cursor seeks
+        Index("ix_table_rows_table_created", "table_id", "created_at", "id"),
+        # Delta sync: rows written since a table version
+        Index("ix_table_rows_table_version", "table_id", "version", "id"),
+    )
+
+
+class TableRowTombstone(Base):
+    """
+    Record of a deleted row, so delta sync clients can drop it.
+
+    Written in the same transaction as the delete, stamped with the table
+    version of that write (see RowService.changes). Kept for
+    TOMBSTONE_RETENTION_DAYS; pruning records the newest pruned version on
+    the table, and syncs from before it are told to resync from 0.
+    """
+    __tablename__ = "table_row_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    table_id = Column(Integer, ForeignKey("table_definitions.id", ondelete="CASCADE"), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_row_tombstones_table_version", "table_id", "version"),
+        # Retention pruning (RowService._prune_tombstones)
+        Index("ix_row_tombstones_table_deleted", "table_id", "deleted_at", "version"),
+    )
+
+
+class TableRowValue(Base):
+    """
+    Typed side index of row values, one entry per (row, column).
+
+    TableRow.data is a JSON blob, so sorting or filtering on a column through
+    JSON_EXTRACT can't use an index. Every row write also writes one entry per
+    declared column here (see services/row_index.py), typed by the column:
+    numbers and booleans go to value_num, everything else to value_text
+    (truncated to the indexed prefix). Empty values get no entry.
+    """
+    __tablename__ = "table_row_values"
+
+    row_id = Column(Integer, ForeignKey("table_rows.id", ondelete="CASCADE"), primary_key=True)
+    column_id = Column(String(64), primary_key=True)
+    table_id = Column(Integer, ForeignKey("table_definitions.id", ondelete="CASCADE"), nullable=False)
+    value_num = Column(Double, nullable=True)
+    value_text = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("ix_row_values_num", "table_id", "column_id", "value_num"),
+        Index("ix_row_values_text", "table_id", "column_id", "value_text"),
+    )
+
+
+class TableRowSearch(Base):
+    """
+    Full-text search document for a table row.
+
+    Holds the row's text/select values joined into one string under a
+    FULLTEXT index, so RowService.search can MATCH ... AGAINST instead of
+    running LIKE over JSON_EXTRACT for every column of every row. Rewritten
+    by services/row_index.py alongside TableRowValue.
+    """
+    __tablename__ = "table_row_search"
+
+    row_id = Column(Integer, ForeignKey("table_rows.id", ondelete="CASCADE"), primary_key=True)
+    table_id = Column(Integer, ForeignKey("table_definitions.id", ondelete="CASCADE"), nullable=False, index=True)
+    content = Column(Text, nullable=False, default="")  # 64KB; longer documents are truncated
+
+    __table_args__ = (
+        Index("ft_row_search_content", "content", mysql_prefix="FULLTEXT"),
+    )
+
 
 # Add relationships to User model
 User.conversations = relationship("Conversation", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""Rebuild the row indexes (table_row_values, table_row_search) for existing tables."""
+
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import TableDefinition
+from services import row_index
+
+
+async def reindex_tables(table_ids=None):
+    """Rebuild index entries for the given tables, or all tables."""
+    async with AsyncSessionLocal() as db:
+        stmt = select(TableDefinition.id, TableDefinition.columns).order_by(TableDefinition.id)
+        if table_ids:
+            stmt = stmt.where(TableDefinition.id.in_(table_ids))
+        tables = (await db.execute(stmt)).all()
+
+        print(f"Reindexing {len(tables)} table(s)")
+        for table_id, columns in tables:
+            visited = await row_index.reindex_columns(db, table_id, columns or [])
+            await db.commit()
+            print(f"  table {table_id}: {visited} rows")
+
+    print("\nReindex complete!")
+
+
+if __name__ == "__main__":
+    ids = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(reindex_tables(ids or None))
@@ -13,10 +13,12 @@ from sqlalchemy import select
 
 from models import User, UserRole, ChatConfig
 from services import auth_service
-from database import get_async_db
-from services.organization_service import OrganizationService, get_organization_service
-from services.user_service import UserService, get_user_service
+from database import get_async_db, pool_statuses
+from services.organization_service import OrganizationService, get_organization_service, get_organization_read_service
+from services.user_service import UserService, get_user_service, get_user_read_service
 from services.invitation_service import InvitationService, get_invitation_service
+from services.table_service import TableService, get_table_service, row_limit
+from config import settings
 from schemas.organization import (
     Organization as OrgSchema,
     OrganizationUpdate,
@@ -51,7 +53,7 @@ def require_platform_admin(
 )
 async def list_all_organizations(
     current_user: User = Depends(require_platform_admin),
-    org_service: OrganizationService = Depends(get_organization_service),
+    org_service: OrganizationService = Depends(get_organization_read_service),
 ):
     """Get all organizations with member counts. Platform admin only."""
     logger.info(f"list_all_organizations - admin_user_id={current_user.user_id}")
@@ -112,7 +114,7 @@ async def create_organization(
 async def get_organization(
     org_id: int,
     current_user: User = Depends(require_platform_admin),
-    org_service: OrganizationService = Depends(get_organization_service),
+    org_service: OrganizationService = Depends(get_organization_read_service),
 ):
     """Get organization details by ID. Platform admin only."""
     logger.info(
@@ -241,7 +243,7 @@ async def list_all_users(
     limit: int = 100,
     offset: int = 0,
     current_user: User = Depends(require_platform_admin),
-    user_service: UserService = Depends(get_user_service),
+    user_service: UserService = Depends(get_user_read_service),
 ):
     """Get all users with optional filters. Platform admin only."""
     logger.info(
@@ -348,6 +350,55 @@ async def bulk_delete_users(
     return result
 
 
+# ==================== Database Pools ====================
+
+
+@router.get("/db/pools", summary="Database connection pool metrics")
+async def get_db_pools(
+    current_user: User = Depends(require_platform_admin),
+):
+    """
+    Occupancy and checkout metrics for each connection pool. Platform admin only.
+
+    checked_out near size + max_overflow, a rising max_wait_ms or any
+    timeouts mean requests are queueing for connections; held_ms lists the
+    longest-held current checkouts (typically SSE streams).
+    """
+    return {"pools": pool_statuses()}
+
+
+# ==================== Table Limits ====================
+
+
+class TableRowLimit(BaseModel):
+    """Request schema for a table's row limit."""
+
+    max_rows: Optional[int] = Field(
+        default=None, ge=1,
+        description="Row cap for the table; null restores the default (MAX_ROWS_PER_TABLE)",
+    )
+
+
+@router.put("/tables/{table_id}/row-limit", summary="Set a table's row limit")
+async def set_table_row_limit(
+    table_id: int,
+    body: TableRowLimit,
+    current_user: User = Depends(require_platform_admin),
+    table_service: TableService = Depends(get_table_service),
+):
+    """Raise or lower one table's row limit. Platform admin only."""
+    logger.info(
+        f"set_table_row_limit - admin_user_id={current_user.user_id}, table_id={table_id}, max_rows={body.max_rows}"
+    )
+    if body.max_rows is not None and body.max_rows > settings.MAX_ROWS_PER_TABLE_CEILING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"max_rows cannot exceed {settings.MAX_ROWS_PER_TABLE_CEILING}",
+        )
+    table = await table_service.set_row_limit(table_id, body.max_rows)
+    return {"table_id": table.id, "max_rows": row_limit(table), "custom": table.max_rows is not None}
+
+
 # ==================== Invitation Management ====================
 
 
@@ -14,6 +14,7 @@ from services import auth_service
 from services.chat_service import (
     ChatService,
     get_chat_service,
+    get_chat_read_service,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ async def get_chat_by_context(
     current_page: str = Query(..., description="Page identifier: tables_list, table_view, table_edit"),
     table_id: Optional[int] = Query(None, description="Table ID (required for table_view/table_edit)"),
     app: str = Query("table_that", description="App identifier"),
-    service: ChatService = Depends(get_chat_service),
+    service: ChatService = Depends(get_chat_read_service),
     current_user: User = Depends(auth_service.validate_token)
 ):
     """Get or create a conversation for the given page context."""
@@ -181,7 +182,7 @@ async def admin_list_chats(
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     limit: int = Query(50, le=200),
     offset: int = Query(0, ge=0),
-    service: ChatService = Depends(get_chat_service),
+    service: ChatService = Depends(get_chat_read_service),
     current_user: User = Depends(auth_service.validate_token)
 ):
     """List all chats (platform admin only, async)."""
@@ -219,7 +220,7 @@ async def admin_list_chats(
 @router.get("/admin/{chat_id}", response_model=AdminChatDetailResponse)
 async def admin_get_chat(
     chat_id: int,
-    service: ChatService = Depends(get_chat_service),
+    service: ChatService = Depends(get_chat_read_service),
     current_user: User = Depends(auth_service.validate_token)
 ):
     """Get full chat with messages (platform admin only, async)."""
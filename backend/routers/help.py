@@ -17,7 +17,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from database import get_async_db
+from database import get_async_db, get_async_read_db
 from models import User, HelpContentOverride, ChatConfig
 from routers.auth import get_current_user
 from services.help_registry import (
@@ -222,7 +222,7 @@ async def delete_override(db: AsyncSession, category: str, topic: str) -> bool:
 @router.get("/categories", response_model=HelpCategoriesResponse)
 async def list_help_categories(
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> HelpCategoriesResponse:
     """
     List all help categories with topic counts.
@@ -261,7 +261,7 @@ async def list_help_categories(
 async def get_help_category(
     category: str,
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> HelpCategoryDetail:
     """
     Get all topics in a help category with full content.
@@ -307,7 +307,7 @@ async def get_help_topic(
     category: str,
     topic: str,
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> HelpTopicContent:
     """
     Get a single help topic by category and topic name.
@@ -466,7 +466,7 @@ async def reset_help_topic(
 @router.get("/toc-preview", response_model=List[HelpTOCPreview])
 async def preview_help_toc(
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> List[HelpTOCPreview]:
     """
     Preview the help TOC as seen by each role (platform admin only).
@@ -513,7 +513,7 @@ async def reload_help(
 @router.get("/summaries", response_model=TopicSummariesResponse)
 async def get_topic_summaries(
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> TopicSummariesResponse:
     """
     Get all topic summaries for editing (platform admin only).
@@ -645,7 +645,7 @@ async def get_toc_config_from_db(db: AsyncSession) -> Dict[str, Any]:
 @router.get("/toc-config", response_model=HelpTOCConfig)
 async def get_help_toc_config(
     current_user: User = Depends(require_platform_admin),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> HelpTOCConfig:
     """
     Get the current TOC configuration (platform admin only).
@@ -2,59 +2,58 @@
 Tables Router - REST endpoints for table and row CRUD, import/export.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from fastapi.responses import StreamingResponse
+from sse_starlette.sse import EventSourceResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-import io
+import csv
+import hashlib
+import json
 import logging
 
-from database import get_async_db
+from database import get_async_db, writer_session
 from models import User
 from services import auth_service
-from services.table_service import TableService, get_table_service
-from services.row_service import RowService, get_row_service
+from services.table_service import TableService, get_table_service, get_table_read_service
+from services.row_service import RowService, get_row_service, get_row_read_service, remap_column_keys
+from services.column_stats_service import ColumnStatsService, get_column_stats_service
 from services.import_export_service import (
-    detect_schema, parse_csv_rows, import_csv_to_table, export_csv,
+    CsvStream, detect_schema, gzip_stream, import_csv_stream, import_csv_to_table,
+    import_row_batches, stream_csv,
 )
+from services.columnar_service import FORMATS, ColumnarUpload, require_format, stream_export
 from schemas.table import (
-    TableCreate, TableUpdate, TableSchema, TableListItem,
+    TableCreate, TableUpdate, TableDuplicate, TableSchema, TableListItem,
     RowCreate, RowUpdate, TableRowSchema, RowsListResponse,
     BulkDeleteRequest, SearchRequest, ColumnDefinition,
+    BulkRowsRequest, BulkRowsResponse,
+    ColumnStatsSchema, TableStatsResponse, RowChangesResponse,
+    AggregateRequest, AggregateResponse, AggregateGroup,
 )
-from tools.builtin.table_data import MAX_ROWS_PER_TABLE
 
 logger = logging.getLogger(__name__)
 
 
-def _remap_column_keys(data: dict, columns: list) -> dict:
-    """Remap column names to column IDs in row data.
+def _etag(*parts) -> str:
+    """Strong ETag over a table's write version and the request parameters that shape the response."""
+    return '"' + hashlib.sha1(repr(parts).encode()).hexdigest()[:20] + '"'
 
-    The LLM sometimes uses column names (or fabricated col_<name> patterns)
-    instead of actual column IDs. This maps them back to real IDs so data
-    is stored correctly.
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the ETag on the response, or return a 304 if the client already has it.
+
+    Cache-Control: no-cache makes browsers revalidate with If-None-Match on
+    every fetch, so clients get the 304s without any code of their own.
     """
-    valid_ids = {col["id"] for col in columns}
-    # Build name → id lookup (case-insensitive)
-    name_to_id = {}
-    for col in columns:
-        name_to_id[col["name"].lower()] = col["id"]
-        # Also handle "col_<name>" fabrication pattern
-        name_to_id[f"col_{col['name'].lower()}"] = col["id"]
-        # Handle underscore-separated lowercase: "col_license_type" for "License Type"
-        slug = col["name"].lower().replace(" ", "_")
-        name_to_id[f"col_{slug}"] = col["id"]
-
-    remapped = {}
-    for key, val in data.items():
-        if key in valid_ids:
-            remapped[key] = val
-        elif key.lower() in name_to_id:
-            remapped[name_to_id[key.lower()]] = val
-        else:
-            # Unknown key — keep as-is rather than silently dropping
-            remapped[key] = val
-    return remapped
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    candidates = [tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 
 router = APIRouter(prefix="/api/tables", tags=["tables"])
 
@@ -66,7 +65,7 @@ router = APIRouter(prefix="/api/tables", tags=["tables"])
 @router.get("", response_model=List[TableListItem])
 async def list_tables(
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
+    table_service: TableService = Depends(get_table_read_service),
 ):
     """List all tables for the current user."""
     return await table_service.list(current_user.user_id)
@@ -80,14 +79,14 @@ async def create_table(
 ):
     """Create a new table."""
     table = await table_service.create(current_user.user_id, data)
-    row_count = await table_service.get_row_count(table.id)
     return TableSchema(
         id=table.id,
         user_id=table.user_id,
         name=table.name,
         description=table.description,
         columns=[ColumnDefinition(**c) for c in table.columns],
-        row_count=row_count,
+        row_count=table.row_count,
+        max_rows=table.max_rows,
         created_at=table.created_at,
         updated_at=table.updated_at,
     )
@@ -96,19 +95,26 @@ async def create_table(
 @router.get("/{table_id}", response_model=TableSchema)
 async def get_table(
     table_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
+    table_service: TableService = Depends(get_table_read_service),
 ):
-    """Get a table definition by ID."""
+    """Get a table definition by ID (conditional on If-None-Match)."""
+    version = await table_service.get_version(table_id, current_user.user_id)
+    not_modified = _not_modified(request, response, _etag("table", table_id, version))
+    if not_modified:
+        return not_modified
+
     table = await table_service.get(table_id, current_user.user_id)
-    row_count = await table_service.get_row_count(table.id)
     return TableSchema(
         id=table.id,
         user_id=table.user_id,
         name=table.name,
         description=table.description,
         columns=[ColumnDefinition(**c) for c in table.columns],
-        row_count=row_count,
+        row_count=table.row_count,
+        max_rows=table.max_rows,
         created_at=table.created_at,
         updated_at=table.updated_at,
     )
@@ -118,24 +124,101 @@ async def get_table(
 async def update_table(
     table_id: int,
     data: TableUpdate,
+    stream: bool = Query(False, description="Stream row migration progress as server-sent events"),
     current_user: User = Depends(auth_service.validate_token),
     table_service: TableService = Depends(get_table_service),
 ):
-    """Update a table definition."""
+    """Update a table definition; rows are migrated when columns are removed or retyped."""
+    if stream:
+        # Verify ownership up front so a missing table is a plain 404
+        await table_service.get(table_id, current_user.user_id)
+        return EventSourceResponse(_update_events(table_id, current_user.user_id, data))
+
     table = await table_service.update(table_id, current_user.user_id, data)
-    row_count = await table_service.get_row_count(table.id)
     return TableSchema(
         id=table.id,
         user_id=table.user_id,
         name=table.name,
         description=table.description,
         columns=[ColumnDefinition(**c) for c in table.columns],
-        row_count=row_count,
+        row_count=table.row_count,
+        max_rows=table.max_rows,
         created_at=table.created_at,
         updated_at=table.updated_at,
     )
 
 
+@router.post("/{table_id}/duplicate", response_model=TableSchema, status_code=201)
+async def duplicate_table(
+    table_id: int,
+    data: TableDuplicate = TableDuplicate(),
+    current_user: User = Depends(auth_service.validate_token),
+    table_service: TableService = Depends(get_table_service),
+):
+    """Copy a table with all its rows, inside the database."""
+    table = await table_service.duplicate(
+        table_id, current_user.user_id, name=data.name, remap_column_ids=data.remap_column_ids
+    )
+    return TableSchema(
+        id=table.id,
+        user_id=table.user_id,
+        name=table.name,
+        description=table.description,
+        columns=[ColumnDefinition(**c) for c in table.columns],
+        row_count=table.row_count,
+        max_rows=table.max_rows,
+        created_at=table.created_at,
+        updated_at=table.updated_at,
+    )
+
+
+async def _update_events(table_id: int, user_id: int, data: TableUpdate):
+    """SSE events for a schema change: progress per chunk of migrated rows, then complete or error."""
+    # Runs after the endpoint returns, so it uses its own session
+    async with writer_session(user_id) as session:
+        try:
+            async for update in TableService(session).update_stream(table_id, user_id, data):
+                yield {
+                    "event": "complete" if update.done else "progress",
+                    "data": json.dumps({
+                        "rows_done": update.rows_done,
+                        "rows_changed": update.rows_changed,
+                        "total_rows": update.total_rows,
+                        "progress": update.progress,
+                    }),
+                }
+        except HTTPException as e:
+            yield {"event": "error", "data": json.dumps({"detail": e.detail})}
+
+
+@router.get("/{table_id}/stats", response_model=TableStatsResponse)
+async def get_table_stats(
+    table_id: int,
+    current_user: User = Depends(auth_service.validate_token),
+    table_service: TableService = Depends(get_table_service),
+    stats_service: ColumnStatsService = Depends(get_column_stats_service),
+):
+    """Get per-column statistics (distinct/empty counts, range, top values)."""
+    table = await table_service.get(table_id, current_user.user_id)
+    stats = await stats_service.get_stats(table.id, table.columns, table.row_count, table.version)
+    return TableStatsResponse(
+        table_id=table.id,
+        row_count=stats.row_count,
+        columns=[
+            ColumnStatsSchema(
+                column_id=col_id,
+                non_empty=col.non_empty,
+                empty=stats.null_count(col_id),
+                distinct_count=col.distinct_count,
+                min_value=col.min_value,
+                max_value=col.max_value,
+                top_values=[[value, n] for value, n in col.top_values],
+            )
+            for col_id, col in stats.columns.items()
+        ],
+    )
+
+
 @router.delete("/{table_id}")
 async def delete_table(
     table_id: int,
@@ -154,30 +237,67 @@ async def delete_table(
 @router.get("/{table_id}/rows", response_model=RowsListResponse)
 async def list_rows(
     table_id: int,
+    request: Request,
+    response: Response,
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     sort_column: Optional[str] = None,
     sort_direction: str = Query("asc", pattern="^(asc|desc)$"),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (offset is ignored)"),
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
-    row_service: RowService = Depends(get_row_service),
+    table_service: TableService = Depends(get_table_read_service),
+    row_service: RowService = Depends(get_row_read_service),
 ):
-    """List rows with optional sorting and pagination."""
-    # Verify table ownership
-    await table_service.get(table_id, current_user.user_id)
-
-    rows, total = await row_service.list(
+    """List rows with optional sorting and offset or cursor pagination (conditional on If-None-Match)."""
+    # Verify table ownership; an unchanged version answers 304 before any row query
+    version = await table_service.get_version(table_id, current_user.user_id)
+    etag = _etag("rows", table_id, version, offset, limit, sort_column, sort_direction, after)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    rows, total, next_cursor = await row_service.list_page(
         table_id=table_id,
         offset=offset,
         limit=limit,
         sort_column=sort_column,
         sort_direction=sort_direction,
+        after=after,
     )
     return RowsListResponse(
         rows=[TableRowSchema.model_validate(r) for r in rows],
         total=total,
         offset=offset,
         limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/{table_id}/rows/changes", response_model=RowChangesResponse)
+async def list_row_changes(
+    table_id: int,
+    since: int = Query(..., ge=0, description="Table version from the previous sync (0 for everything; 410 once its deletions are pruned)"),
+    limit: int = Query(500, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    current_user: User = Depends(auth_service.validate_token),
+    table_service: TableService = Depends(get_table_read_service),
+    row_service: RowService = Depends(get_row_read_service),
+):
+    """Rows created or updated, and IDs of rows deleted, since a table version."""
+    # Verify table ownership
+    await table_service.get_version(table_id, current_user.user_id)
+
+    version, rows, deleted, next_cursor = await row_service.changes(
+        table_id=table_id,
+        since=since,
+        limit=limit,
+        after=after,
+    )
+    return RowChangesResponse(
+        version=version,
+        rows=[TableRowSchema.model_validate(r) for r in rows],
+        deleted=deleted,
+        next_cursor=next_cursor,
     )
 
 
@@ -186,24 +306,11 @@ async def create_row(
     table_id: int,
     data: RowCreate,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
     row_service: RowService = Depends(get_row_service),
 ):
-    """Create a new row in a table."""
-    table = await table_service.get(table_id, current_user.user_id)
-
-    # Enforce row limit
-    current_count = await table_service.get_row_count(table_id)
-    if current_count >= MAX_ROWS_PER_TABLE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Table has reached the maximum of {MAX_ROWS_PER_TABLE} rows.",
-        )
-
+    """Create a new row in a table (enforces the table's row limit)."""
     # Defensive: remap column names to IDs in case LLM used names
-    data.data = _remap_column_keys(data.data, table.columns)
-
-    row = await row_service.create(table_id, data)
+    row = await row_service.create_owned(table_id, current_user.user_id, data.data, remap_keys=True)
     return TableRowSchema.model_validate(row)
 
 
@@ -212,12 +319,10 @@ async def get_row(
     table_id: int,
     row_id: int,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
-    row_service: RowService = Depends(get_row_service),
+    row_service: RowService = Depends(get_row_read_service),
 ):
     """Get a single row by ID."""
-    await table_service.get(table_id, current_user.user_id)
-    row = await row_service.get(table_id, row_id)
+    row = await row_service.get_owned(table_id, current_user.user_id, row_id)
     return TableRowSchema.model_validate(row)
 
 
@@ -227,14 +332,11 @@ async def update_row(
     row_id: int,
     data: RowUpdate,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
     row_service: RowService = Depends(get_row_service),
 ):
     """Update a row's data."""
-    table = await table_service.get(table_id, current_user.user_id)
     # Defensive: remap column names to IDs in case LLM used names
-    data.data = _remap_column_keys(data.data, table.columns)
-    row = await row_service.update(table_id, row_id, data)
+    row = await row_service.update_owned(table_id, current_user.user_id, row_id, data.data, remap_keys=True)
     return TableRowSchema.model_validate(row)
 
 
@@ -243,12 +345,10 @@ async def delete_row(
     table_id: int,
     row_id: int,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
     row_service: RowService = Depends(get_row_service),
 ):
     """Delete a single row."""
-    await table_service.get(table_id, current_user.user_id)
-    await row_service.delete(table_id, row_id)
+    await row_service.delete_owned(table_id, current_user.user_id, [row_id], require_all=True)
     return {"ok": True}
 
 
@@ -257,15 +357,35 @@ async def bulk_delete_rows(
     table_id: int,
     data: BulkDeleteRequest,
     current_user: User = Depends(auth_service.validate_token),
-    table_service: TableService = Depends(get_table_service),
     row_service: RowService = Depends(get_row_service),
 ):
     """Delete multiple rows at once."""
-    await table_service.get(table_id, current_user.user_id)
-    deleted = await row_service.bulk_delete(table_id, data.row_ids)
+    deleted = await row_service.delete_owned(table_id, current_user.user_id, data.row_ids)
     return {"ok": True, "deleted": deleted}
 
 
+@router.post("/{table_id}/rows/bulk", response_model=BulkRowsResponse)
+async def bulk_rows(
+    table_id: int,
+    data: BulkRowsRequest,
+    current_user: User = Depends(auth_service.validate_token),
+    table_service: TableService = Depends(get_table_service),
+    row_service: RowService = Depends(get_row_service),
+):
+    """Apply mixed create/update/delete row operations in one transaction."""
+    table = await table_service.get(table_id, current_user.user_id)
+
+    # Defensive: remap column names to IDs in case LLM used names
+    for op in data.operations:
+        if op.data is not None:
+            op.data = remap_column_keys(op.data, table.columns)
+
+    created_ids, updated, deleted = await row_service.bulk_apply(
+        table_id, data.operations, table.columns
+    )
+    return BulkRowsResponse(created_ids=created_ids, updated=updated, deleted=deleted)
+
+
 @router.post("/{table_id}/rows/search", response_model=List[TableRowSchema])
 async def search_rows(
     table_id: int,
@@ -285,31 +405,113 @@ async def search_rows(
     return [TableRowSchema.model_validate(r) for r in rows]
 
 
+@router.post("/{table_id}/aggregate", response_model=AggregateResponse)
+async def aggregate_rows(
+    table_id: int,
+    data: AggregateRequest,
+    current_user: User = Depends(auth_service.validate_token),
+    table_service: TableService = Depends(get_table_service),
+    row_service: RowService = Depends(get_row_service),
+):
+    """Group rows by column values and compute count/sum/avg/min/max/distinct."""
+    table = await table_service.get(table_id, current_user.user_id)
+    groups, truncated = await row_service.aggregate(
+        table_id=table_id,
+        columns=table.columns,
+        group_by=data.group_by,
+        metrics=data.metrics,
+        filters=data.filters,
+        sort_by=data.sort_by,
+        sort_direction=data.sort_direction,
+        limit=data.limit,
+    )
+    return AggregateResponse(
+        groups=[AggregateGroup(**g) for g in groups],
+        truncated=truncated,
+    )
+
+
 # =============================================================================
 # Import / Export
 # =============================================================================
 
+FORMAT_PATTERN = "^(csv|parquet|arrow|ndjson)$"
+
+
+def _import_error(e: Exception, imported: int = 0) -> str:
+    """
+    User-facing message for a failed import.
+
+    Imports commit per batch, so rows from batches before the failure stay
+    in the table; the message says how many.
+    """
+    if isinstance(e, UnicodeDecodeError):
+        message = "File must be UTF-8 encoded."
+    elif isinstance(e, csv.Error):
+        message = f"Malformed CSV: {e}"
+    else:
+        message = str(e)
+    if imported:
+        message += f" {imported} rows imported before the error were kept."
+    return message
+
+
 @router.post("/{table_id}/import")
 async def import_csv(
     table_id: int,
     file: UploadFile = File(...),
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description="Upload format"),
+    stream: bool = Query(False, description="Stream import progress as server-sent events"),
     current_user: User = Depends(auth_service.validate_token),
     table_service: TableService = Depends(get_table_service),
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Import CSV data into an existing table."""
+    """Import CSV, Parquet, Arrow or NDJSON data into an existing table."""
     table = await table_service.get(table_id, current_user.user_id)
+    if format != "csv":
+        require_format(format)
+
+    def run_import(session: AsyncSession):
+        if format == "csv":
+            return import_csv_stream(session, table, CsvStream(file.file, file.size))
+        upload = ColumnarUpload(file.file, format, table.columns, file.size)
+        return import_row_batches(
+            session, table, upload.batches(), lambda: upload.bytes_read, upload.total_bytes
+        )
 
-    content = await file.read()
-    csv_text = content.decode("utf-8-sig")  # Handle BOM
+    if stream:
+        return EventSourceResponse(_import_events(run_import, current_user.user_id))
 
+    count = 0
     try:
-        count = await import_csv_to_table(db, table, csv_text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        async for update in run_import(db):
+            count = update.imported
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=_import_error(e, count))
     return {"ok": True, "imported": count}
 
 
+async def _import_events(run_import, user_id: int):
+    """SSE events for a streaming import: progress per batch, then complete or error."""
+    # Runs after the endpoint returns, so it uses its own session
+    async with writer_session(user_id) as session:
+        imported = 0
+        try:
+            async for update in run_import(session):
+                imported = update.imported
+                yield {
+                    "event": "complete" if update.done else "progress",
+                    "data": json.dumps({
+                        "imported": update.imported,
+                        "bytes_read": update.bytes_read,
+                        "total_bytes": update.total_bytes,
+                        "progress": update.progress,
+                    }),
+                }
+        except (ValueError, csv.Error) as e:
+            yield {"event": "error", "data": json.dumps({"detail": _import_error(e, imported), "imported": imported})}
+
+
 @router.post("/import-with-schema", response_model=TableSchema)
 async def import_with_schema(
     file: UploadFile = File(...),
@@ -319,12 +521,14 @@ async def import_with_schema(
     table_service: TableService = Depends(get_table_service),
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Create a new table from a CSV file with auto-detected schema."""
-    content = await file.read()
-    csv_text = content.decode("utf-8-sig")
+    """Create a new table from a CSV file with auto-detected schema (deleted again if the import fails)."""
+    csv_stream = CsvStream(file.file, file.size)
 
-    # Detect schema
-    columns, header_names = detect_schema(csv_text)
+    # Detect schema from a bounded prefix (kept buffered for the import)
+    try:
+        columns, header_names = await detect_schema(csv_stream)
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=_import_error(e))
     if not columns:
         raise HTTPException(status_code=400, detail="Could not detect columns from CSV")
 
@@ -336,11 +540,13 @@ async def import_with_schema(
     )
     table = await table_service.create(current_user.user_id, table_data)
 
-    # Import rows
+    # Import rows; a failed import drops the new table rather than leave it half-filled
     try:
-        count = await import_csv_to_table(db, table, csv_text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        count = await import_csv_to_table(db, table, csv_stream)
+    except (ValueError, csv.Error) as e:
+        await db.rollback()
+        await table_service.delete(table.id, current_user.user_id)
+        raise HTTPException(status_code=400, detail=_import_error(e))
 
     row_count = await table_service.get_row_count(table.id)
     return TableSchema(
@@ -350,32 +556,38 @@ async def import_with_schema(
         description=table.description,
         columns=[ColumnDefinition(**c) for c in table.columns],
         row_count=row_count,
+        max_rows=table.max_rows,
         created_at=table.created_at,
         updated_at=table.updated_at,
     )
 
 
 @router.get("/{table_id}/export")
-async def export_table_csv(
+async def export_table(
     table_id: int,
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description="Export format"),
+    gzip: bool = Query(False, description="Gzip-compress the output"),
     current_user: User = Depends(auth_service.validate_token),
     table_service: TableService = Depends(get_table_service),
-    row_service: RowService = Depends(get_row_service),
 ):
-    """Export a table's data as CSV."""
+    """Export a table's data as CSV, Parquet, Arrow IPC or NDJSON, streamed in row batches."""
     table = await table_service.get(table_id, current_user.user_id)
-
-    # Fetch all rows (up to 10k for safety)
-    rows, _ = await row_service.list(table_id=table_id, limit=10000)
-
-    csv_content = export_csv(table.columns, rows)
-
-    # Return as downloadable CSV file
+    if format == "csv":
+        body, media_type, extension = stream_csv(table.id, table.columns), "text/csv", "csv"
+    else:
+        require_format(format)
+        media_type, extension = FORMATS[format]
+        body = stream_export(table.id, table.columns, format)
+
+    # Return as downloadable file
     safe_name = table.name.replace('"', '').replace("'", "")[:100]
+    filename = f"{safe_name}.{extension}"
+    if gzip:
+        body, media_type, filename = gzip_stream(body), "application/gzip", f"{filename}.gz"
     return StreamingResponse(
-        io.StringIO(csv_content),
-        media_type="text/csv",
+        body,
+        media_type=media_type,
         headers={
-            "Content-Disposition": f'attachment; filename="{safe_name}.csv"'
+            "Content-Disposition": f'attachment; filename="{filename}"'
         },
     )
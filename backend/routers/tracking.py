@@ -3,8 +3,9 @@ Tracking Router - accepts frontend tracking events and provides admin queries.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 import logging
 
 from models import User, UserRole, EventSource
@@ -15,16 +16,30 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/tracking", tags=["tracking"])
 
+MAX_BATCH_EVENTS = 500
+# Client timestamps further off than this (clock skew, replayed queues) use server time
+CLIENT_TS_MAX_AGE = timedelta(hours=24)
+CLIENT_TS_MAX_AHEAD = timedelta(minutes=5)
+
 
 # ---------------------------------------------------------------------------
 # Schemas
 # ---------------------------------------------------------------------------
 
 class TrackEventRequest(BaseModel):
-    event_type: str
+    # Bounded to the column so one bad event can't fail a whole batched insert
+    event_type: str = Field(..., min_length=1, max_length=50)
     event_data: Optional[Dict[str, Any]] = None
 
 
+class BatchTrackEvent(TrackEventRequest):
+    client_ts: Optional[datetime] = None  # When the event happened in the browser
+
+
+class TrackEventBatchRequest(BaseModel):
+    events: List[BatchTrackEvent] = Field(..., max_length=MAX_BATCH_EVENTS)
+
+
 class UserEventResponse(BaseModel):
     id: int
     user_id: int
@@ -81,6 +96,36 @@ async def track_event(
     return {"ok": True}
 
 
+def _event_time(client_ts: Optional[datetime], now: datetime) -> datetime:
+    """A client timestamp as naive UTC, or now when missing or implausible."""
+    if client_ts is None:
+        return now
+    if client_ts.tzinfo is not None:
+        client_ts = client_ts.astimezone(timezone.utc).replace(tzinfo=None)
+    if not now - CLIENT_TS_MAX_AGE <= client_ts <= now + CLIENT_TS_MAX_AHEAD:
+        return now
+    return min(client_ts, now)
+
+
+@router.post("/events/batch")
+async def track_events_batch(
+    body: TrackEventBatchRequest,
+    current_user: User = Depends(auth_service.validate_token),
+    service: EventTrackingService = Depends(get_event_tracking_service),
+):
+    """Persist a batch of buffered frontend events, stamped with their client times."""
+    logger.info(f"track_events_batch - user_id={current_user.user_id}, count={len(body.events)}")
+
+    now = datetime.utcnow()
+    accepted = await service.track_many(
+        user_id=current_user.user_id,
+        event_source=EventSource.FRONTEND,
+        events=[(e.event_type, e.event_data, _event_time(e.client_ts, now)) for e in body.events],
+    )
+
+    return {"ok": True, "accepted": accepted}
+
+
 # ---------------------------------------------------------------------------
 # Admin endpoints
 # ---------------------------------------------------------------------------
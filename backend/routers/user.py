@@ -97,8 +97,11 @@ async def change_password(
     - current_password: The user's current password for verification
     - new_password: The new password (minimum 8 characters)
     """
+    # current_user may come from the auth cache (no password hash, not in this session)
+    user = await UserService(db).get_user_by_id(current_user.user_id)
+
     # Verify current password
-    if not auth_service.verify_password(password_data.current_password, current_user.password):
+    if not auth_service.verify_password(password_data.current_password, user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -106,7 +109,7 @@ async def change_password(
 
     # Hash and save new password
     new_hashed_password = auth_service.get_password_hash(password_data.new_password)
-    current_user.password = new_hashed_password
+    user.password = new_hashed_password
     await db.commit()
 
     logger.info(f"Password changed for user {current_user.user_id}")
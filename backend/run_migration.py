@@ -1,11 +1,12 @@
 #!/usr/bin/env python
 """Run a SQL migration file against the database."""
 
+import asyncio
 import sys
 from sqlalchemy import text
-from database import engine
+from database import async_engine
 
-def run_migration(migration_file: str):
+async def run_migration(migration_file: str):
     """Execute SQL statements from a migration file."""
     print(f"Running migration: {migration_file}")
 
@@ -27,7 +28,7 @@ def run_migration(migration_file: str):
 
     print(f"Found {len(statements)} SQL statements to execute")
 
-    with engine.connect() as conn:
+    async with async_engine.connect() as conn:
         for i, stmt in enumerate(statements, 1):
             # Remove trailing semicolon for execution
             stmt_clean = stmt.rstrip(';').strip()
@@ -35,13 +36,14 @@ def run_migration(migration_file: str):
                 continue
             try:
                 print(f"\n[{i}] Executing: {stmt_clean[:80]}...")
-                conn.execute(text(stmt_clean))
-                conn.commit()
+                await conn.execute(text(stmt_clean))
+                await conn.commit()
                 print(f"    Success!")
             except Exception as e:
                 print(f"    Error: {e}")
                 # Continue with other statements even if one fails
 
+    await async_engine.dispose()
     print("\nMigration complete!")
 
 if __name__ == "__main__":
@@ -49,4 +51,4 @@ if __name__ == "__main__":
         print("Usage: python run_migration.py <migration_file.sql>")
         sys.exit(1)
 
-    run_migration(sys.argv[1])
+    asyncio.run(run_migration(sys.argv[1]))
@@ -42,6 +42,12 @@ class TableUpdate(BaseModel):
     columns: Optional[List[ColumnDefinition]] = None
 
 
+class TableDuplicate(BaseModel):
+    """Request schema for duplicating a table."""
+    name: Optional[str] = Field(default=None, min_length=1, max_length=255, description="Name for the copy (default: '<name> (copy)')")
+    remap_column_ids: bool = Field(default=False, description="Give the copy fresh column IDs")
+
+
 class TableSchema(BaseModel):
     """Response schema for a table definition."""
     id: int
@@ -50,6 +56,7 @@ class TableSchema(BaseModel):
     description: Optional[str] = None
     columns: List[ColumnDefinition]
     row_count: Optional[int] = None
+    max_rows: Optional[int] = None  # Per-table row cap; None = MAX_ROWS_PER_TABLE
     created_at: datetime
     updated_at: datetime
 
@@ -94,6 +101,15 @@ class RowsListResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `after` to fetch the next page; null on the last page")
+
+
+class RowChangesResponse(BaseModel):
+    """Response schema for delta sync: rows written and rows deleted since a version."""
+    version: int = Field(description="Table version this response is current to; pass as `since` on the next sync")
+    rows: List[TableRowSchema]
+    deleted: List[int] = Field(default_factory=list, description="IDs of rows deleted since `since`, paged after the changed rows (none when since=0)")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `after` (same `since`) to fetch more changed rows or deletions")
 
 
 class BulkDeleteRequest(BaseModel):
@@ -101,6 +117,87 @@ class BulkDeleteRequest(BaseModel):
     row_ids: List[int] = Field(min_length=1, description="IDs of rows to delete")
 
 
+class RowOperationAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class RowOperation(BaseModel):
+    """A single create/update/delete within a bulk row request."""
+    action: RowOperationAction = Field(description="Operation to apply")
+    row_id: Optional[int] = Field(default=None, description="Target row (required for update and delete)")
+    data: Optional[Dict[str, Any]] = Field(default=None, description="Column values keyed by column ID (required for create and update)")
+
+
+class BulkRowsRequest(BaseModel):
+    """Request schema for applying mixed row operations in one transaction."""
+    operations: List[RowOperation] = Field(min_length=1, max_length=5000, description="Operations, applied in one transaction")
+
+
+class BulkRowsResponse(BaseModel):
+    """Response schema for bulk row operations."""
+    created_ids: List[int] = Field(description="IDs of created rows, in request order")
+    updated: int
+    deleted: int
+
+
+class ColumnStatsSchema(BaseModel):
+    """Statistics for a single column."""
+    column_id: str
+    non_empty: int
+    empty: int
+    distinct_count: int
+    min_value: Optional[Any] = None
+    max_value: Optional[Any] = None
+    top_values: List[List[Any]] = Field(default_factory=list, description="[value, count] pairs, most frequent first")
+
+
+class TableStatsResponse(BaseModel):
+    """Response schema for per-column table statistics."""
+    table_id: int
+    row_count: int
+    columns: List[ColumnStatsSchema]
+
+
+class AggregateOp(str, Enum):
+    COUNT = "count"
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+    DISTINCT = "distinct"
+
+
+class AggregateMetric(BaseModel):
+    """One aggregate to compute per group."""
+    op: AggregateOp = Field(description="Aggregate function")
+    column_id: Optional[str] = Field(default=None, description="Column to aggregate (optional for count, which then counts rows)")
+    alias: Optional[str] = Field(default=None, min_length=1, max_length=64, description="Result name (default: op_columnid, or 'count')")
+
+
+class AggregateRequest(BaseModel):
+    """Request schema for grouped aggregation over a table's rows."""
+    group_by: List[str] = Field(default_factory=list, max_length=5, description="Column IDs to group by (none = one group for the whole table)")
+    metrics: List[AggregateMetric] = Field(min_length=1, max_length=20)
+    filters: Optional[Dict[str, Dict[str, Any]]] = Field(default=None, description="Row filters keyed by column ID: {operator, value}")
+    sort_by: Optional[str] = Field(default=None, description="Metric name to order groups by (default: group values)")
+    sort_direction: str = Field(default="asc", pattern="^(asc|desc)$")
+    limit: int = Field(default=100, ge=1, le=1000, description="Maximum number of groups")
+
+
+class AggregateGroup(BaseModel):
+    """One result group."""
+    key: Dict[str, Any] = Field(description="Group values keyed by column ID (null = empty)")
+    values: Dict[str, Any] = Field(description="Metric results keyed by metric name")
+
+
+class AggregateResponse(BaseModel):
+    """Response schema for grouped aggregation."""
+    groups: List[AggregateGroup]
+    truncated: bool = Field(description="True if more groups exist beyond the limit")
+
+
 class SearchRequest(BaseModel):
     """Request schema for full-text search across rows."""
     query: str = Field(min_length=1, description="Search query")
@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from models import User
 from schemas.user import Token
 from services.user_service import UserService
+from services import user_cache
 from config.settings import settings
 from database import get_async_db
 import logging
@@ -180,10 +181,13 @@ async def convert_guest_to_user(
             detail="Email already registered"
         )
 
+    # The caller's user may be a cached, session-less copy; update the stored row
+    user = await UserService(db).get_user_by_id(user.user_id)
     user.email = email
     user.password = get_password_hash(password)
     user.is_guest = False
     await db.commit()
+    user_cache.invalidate(user.user_id)
     await db.refresh(user)
 
     logger.info(f"Converted guest user_id={user.user_id} to {email}")
@@ -361,9 +365,13 @@ async def validate_token(
                 detail="Invalid token payload"
             )
 
-        # Get user from database (async)
-        user_service = UserService(db)
-        user = await user_service.get_user_by_email(email)
+        # Cached fields by user_id (must still match the token's email), else the database
+        user = user_cache.get(user_id) if user_id is not None else None
+        cache_hit = user is not None and user.email == email
+        if not cache_hit:
+            user = await UserService(db).get_user_by_email(email)
+            if user is not None:
+                user_cache.put(user)
         t_user = time.perf_counter()
         if user is None:
             logger.error(f"Token user not found: {email}")
@@ -431,9 +439,10 @@ async def validate_token(
             logger.debug(f"Generated refresh token for {email}")
 
         t_end = time.perf_counter()
-        logger.info(
-            f"validate_token - email={email}, jwt={t_jwt - t_start:.3f}s, "
-            f"user_lookup={t_user - t_jwt:.3f}s, total={t_end - t_start:.3f}s"
+        logger.log(
+            logging.DEBUG if cache_hit else logging.INFO,
+            f"validate_token - email={email}, cache={'hit' if cache_hit else 'miss'}, "
+            f"jwt={t_jwt - t_start:.3f}s, user_lookup={t_user - t_jwt:.3f}s, total={t_end - t_start:.3f}s"
         )
         return user
 
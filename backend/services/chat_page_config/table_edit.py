@@ -94,7 +94,7 @@ Be helpful but concise. Explain your suggestions briefly. If the user describes
 register_page(
     page="table_edit",
     context_builder=table_edit_context_builder,
-    tools=["describe_table", "get_rows"],
+    tools=["describe_table", "get_rows", "aggregate_rows"],
     payloads=["schema_proposal"],
     persona=TABLE_EDIT_PERSONA,
 )
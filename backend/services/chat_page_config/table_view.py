@@ -59,6 +59,28 @@ def table_view_context_builder(context: Dict[str, Any]) -> str:
     if row_count is not None:
         parts.append(f"Total rows: {row_count}")
 
+    # Column statistics (computed in the database, so they cover every row)
+    column_stats = context.get("column_stats")
+    if column_stats and columns and row_count:
+        stat_lines = []
+        for col in columns:
+            stats = column_stats.get(col.get("id", ""))
+            if not stats:
+                continue
+            line = f"  - {col.get('name', 'unnamed')}: {stats['distinct']} distinct, {stats['empty']} empty"
+            col_type = col.get("type", "text")
+            if col_type in ("number", "date") and stats["min"] is not None:
+                line += f", range {stats['min']} to {stats['max']}"
+            elif col_type in ("select", "boolean") and stats["top_values"]:
+                top = ", ".join(
+                    f"{({1: 'Yes', 0: 'No'}.get(value, value) if col_type == 'boolean' else value)}: {n}"
+                    for value, n in stats["top_values"]
+                )
+                line += f", top values: {top}"
+            stat_lines.append(line)
+        if stat_lines:
+            parts.append("Column statistics:\n" + "\n".join(stat_lines))
+
     # Sample data (first few rows for context)
     # Keys use column IDs so the LLM sees the same IDs it must use in DATA_PROPOSAL
     sample_rows = context.get("sample_rows", [])
@@ -130,7 +152,7 @@ You can help users with:
 Note: You can only modify THIS table. You cannot create new tables from this page — for that, the user should go to the Tables list page.
 
 ## Current Limits
-Tables are limited to """ + str(MAX_ROWS_PER_TABLE) + """ rows. The enrich_column tool processes up to """ + str(MAX_ROWS_PER_ENRICH) + """ rows per call. If the user hits these limits, let them know matter-of-factly. Don't apologize — just state the limit.
+Tables are limited to """ + str(MAX_ROWS_PER_TABLE) + """ rows by default (a platform admin can raise the limit for a table; a rejected write reports the table's actual limit). The enrich_column tool processes up to """ + str(MAX_ROWS_PER_ENRICH) + """ rows per call. If the user hits these limits, let them know matter-of-factly. Don't apologize — just state the limit.
 
 ## How Data Changes Work — Proposals Only
 ALL data and schema changes go through proposals. You never write directly to the table. Instead, you emit a DATA_PROPOSAL or SCHEMA_PROPOSAL, the changes appear highlighted in the table for the user to review, and the user clicks **Accept** or **Dismiss**. This applies whether the user asks to add one row or fifty.
@@ -206,6 +228,7 @@ When adding rows, check the existing data (sample rows in context) for potential
 - You see the first 20 rows in your context automatically
 - Use get_rows with offset/limit to access more data (up to 200 per call)
 - Use describe_table for row counts and value distributions for select/boolean columns
+- Use aggregate_rows for totals, averages, min/max and counts (optionally grouped by columns) — it covers every row without paging
 - For tables with many rows, paginate through data with get_rows
 
 ## Selected Rows
@@ -226,7 +249,7 @@ Be concise and helpful. When proposing changes, briefly explain what you're doin
 register_page(
     page="table_view",
     context_builder=table_view_context_builder,
-    tools=["search_rows", "describe_table", "get_rows", "enrich_column", "search_web", "fetch_webpage", "research_web"],
+    tools=["search_rows", "describe_table", "get_rows", "aggregate_rows", "enrich_column", "search_web", "fetch_webpage", "research_web"],
     payloads=["schema_proposal", "data_proposal"],
     persona=TABLE_VIEW_PERSONA,
 )
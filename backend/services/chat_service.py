@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Conversation, Message, User
 from fastapi import Depends
-from database import get_async_db
+from database import get_async_db, get_async_read_db
 
 logger = logging.getLogger(__name__)
 
@@ -689,3 +689,10 @@ async def get_chat_service(
 ) -> ChatService:
     """Get a ChatService instance with async database session."""
     return ChatService(db)
+
+
+async def get_chat_read_service(
+    db: AsyncSession = Depends(get_async_read_db)
+) -> ChatService:
+    """Get a ChatService instance for read-only endpoints (replica when configured)."""
+    return ChatService(db)
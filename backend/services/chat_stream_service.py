@@ -56,6 +56,7 @@ from agents.agent_loop import (
     AgentError,
 )
 from services.chat_service import ChatService, derive_scope
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -291,11 +292,11 @@ class ChatStreamService:
             if turn.committed:
                 return (turn.history.chat_id or 0, turn.response.message_id)
 
-            from database import AsyncSessionLocal
+            from database import writer_session
 
             chat_id = turn.history.chat_id
 
-            async with AsyncSessionLocal() as db:
+            async with writer_session(self.user_id) as db:
                 chat_service = ChatService(db)
 
                 if not chat_id:
@@ -842,7 +843,7 @@ TableThat helps users build and manage structured data tables:
 - Import and export data via CSV
 - Get AI-powered assistance for data management
 
-Note: Tables are currently limited to 100 rows each.
+Note: Tables are currently limited to """ + str(settings.MAX_ROWS_PER_TABLE) + """ rows each by default.
 
 ## User Journey — Four Phases
 Every table goes through four phases. Users don't think in these terms — you do. Read the signals and guide them forward.
@@ -1086,6 +1087,9 @@ To offer clickable buttons that trigger UI actions. You may ONLY use actions exp
         """Build page-specific context section of the prompt (async)."""
         context_builder = get_context_builder(current_page)
 
+        if current_page == "table_view" and context.get("table_id"):
+            context = {**context, "column_stats": await self._load_column_stats(context)}
+
         if context_builder:
             base_context = context_builder(context)
         else:
@@ -1098,6 +1102,29 @@ To offer clickable buttons that trigger UI actions. You may ONLY use actions exp
 
         return base_context
 
+    async def _load_column_stats(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load cached column statistics for the table being viewed, keyed by column ID."""
+        from fastapi import HTTPException
+        from services.table_service import TableService
+        from services.column_stats_service import ColumnStatsService
+
+        try:
+            table = await TableService(self.db).get(int(context["table_id"]), self.user_id)
+        except (HTTPException, ValueError, TypeError):
+            return None
+
+        stats = await ColumnStatsService(self.db).get_stats(table.id, table.columns, table.row_count, table.version)
+        return {
+            col_id: {
+                "distinct": col.distinct_count,
+                "empty": stats.null_count(col_id),
+                "min": col.min_value,
+                "max": col.max_value,
+                "top_values": col.top_values,
+            }
+            for col_id, col in stats.columns.items()
+        }
+
     async def _load_stream_instructions(self, context: Dict[str, Any]) -> Optional[str]:
         """Load context-specific chat instructions (async).
 
@@ -0,0 +1,183 @@
+"""
+Column Stats Service - per-column statistics computed in the database.
+
+Distinct counts, null counts, min/max and top-k values are aggregated with
+GROUP BY over the typed row index (table_row_values), so no row JSON is loaded
+into Python. Results are cached in-process per (table, column) together with
+the table version they were computed at. Every row or schema write bumps
+that version (table_service.bump_version), so an entry is reused only while
+the table is unchanged — including by writes on other workers — and no write
+path has to invalidate anything. The cache is bounded LRU.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends
+
+from models import TableDefinition, TableRowValue
+from database import get_async_db
+from services import row_index
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10                  # Most frequent values kept per column
+STATS_CACHE_SIZE = 10000    # Cached (table, column) entries per process
+
+
+@dataclass
+class ColumnStats:
+    """Statistics for one column. Values are the typed index values."""
+    column_id: str
+    non_empty: int = 0
+    distinct_count: int = 0
+    min_value: Optional[Any] = None
+    max_value: Optional[Any] = None
+    top_values: List[Tuple[Any, int]] = field(default_factory=list)
+
+
+@dataclass
+class TableStats:
+    """Statistics for a table's columns."""
+    table_id: int
+    row_count: int
+    columns: Dict[str, ColumnStats]
+
+    def null_count(self, column_id: str) -> int:
+        """Rows with no value in the column."""
+        stats = self.columns.get(column_id)
+        return self.row_count - (stats.non_empty if stats else 0)
+
+
+# (table_id, column_id) -> (table version, stats), least recently used first
+_cache: "OrderedDict[Tuple[int, str], Tuple[int, ColumnStats]]" = OrderedDict()
+
+
+def _cached(table_id: int, column_id: str, version: int) -> Optional[ColumnStats]:
+    entry = _cache.get((table_id, column_id))
+    if entry is None or entry[0] != version:
+        return None
+    _cache.move_to_end((table_id, column_id))
+    return entry[1]
+
+
+def _store(table_id: int, stats: ColumnStats, version: int) -> None:
+    _cache[(table_id, stats.column_id)] = (version, stats)
+    _cache.move_to_end((table_id, stats.column_id))
+    while len(_cache) > STATS_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+class ColumnStatsService:
+    """Service for computing and caching per-column statistics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_stats(
+        self,
+        table_id: int,
+        columns: List[Dict[str, Any]],
+        row_count: Optional[int] = None,
+        version: Optional[int] = None,
+    ) -> TableStats:
+        """
+        Get statistics for a table's declared columns.
+
+        Only columns not cached at the table's current version are
+        recomputed, with two aggregate queries covering all of them. Pass
+        row_count and version from an already loaded TableDefinition to save
+        the lookup.
+        """
+        if row_count is None or version is None:
+            result = await self.db.execute(
+                select(TableDefinition.row_count, TableDefinition.version).where(TableDefinition.id == table_id)
+            )
+            table = result.one_or_none()
+            row_count, version = (table.row_count, table.version) if table else (0, 0)
+
+        found: Dict[str, ColumnStats] = {}
+        stale = []
+        for col in columns:
+            stats = _cached(table_id, col["id"], version)
+            if stats is None:
+                stale.append(col["id"])
+            else:
+                found[col["id"]] = stats
+        if stale:
+            for stats in await self._compute(table_id, stale):
+                _store(table_id, stats, version)
+                found[stats.column_id] = stats
+
+        return TableStats(
+            table_id=table_id,
+            row_count=row_count,
+            columns={col["id"]: found.get(col["id"], ColumnStats(col["id"])) for col in columns},
+        )
+
+    async def _compute(self, table_id: int, column_ids: List[str]) -> List[ColumnStats]:
+        """Aggregate stats for the given columns in the database."""
+        stats = {col_id: ColumnStats(col_id) for col_id in column_ids}
+
+        # Counts and ranges per column — resolved from the (table_id, column_id, value) indexes
+        result = await self.db.execute(
+            select(
+                TableRowValue.column_id,
+                func.count(),
+                func.count(func.distinct(TableRowValue.value_num)),
+                func.count(func.distinct(TableRowValue.value_text)),
+                func.min(TableRowValue.value_num),
+                func.max(TableRowValue.value_num),
+                func.min(TableRowValue.value_text),
+                func.max(TableRowValue.value_text),
+            )
+            .where(
+                TableRowValue.table_id == table_id,
+                TableRowValue.column_id.in_(column_ids),
+            )
+            .group_by(TableRowValue.column_id)
+        )
+        for col_id, non_empty, distinct_num, distinct_text, min_num, max_num, min_text, max_text in result.all():
+            col = stats[col_id]
+            col.non_empty = non_empty
+            col.distinct_count = distinct_num + distinct_text
+            col.min_value = row_index.typed_value(min_num, None) if min_num is not None else min_text
+            col.max_value = row_index.typed_value(max_num, None) if max_num is not None else max_text
+
+        # Top-k values per column in one pass, ranked with a window function
+        value_counts = (
+            select(
+                TableRowValue.column_id,
+                TableRowValue.value_num,
+                TableRowValue.value_text,
+                func.count().label("n"),
+                func.row_number().over(
+                    partition_by=TableRowValue.column_id,
+                    order_by=func.count().desc(),
+                ).label("rank"),
+            )
+            .where(
+                TableRowValue.table_id == table_id,
+                TableRowValue.column_id.in_(column_ids),
+            )
+            .group_by(TableRowValue.column_id, TableRowValue.value_num, TableRowValue.value_text)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(value_counts.c.column_id, value_counts.c.value_num, value_counts.c.value_text, value_counts.c.n)
+            .where(value_counts.c.rank <= TOP_K)
+            .order_by(value_counts.c.column_id, value_counts.c.rank)
+        )
+        for col_id, value_num, value_text, n in result.all():
+            stats[col_id].top_values.append((row_index.typed_value(value_num, value_text), n))
+
+        return list(stats.values())
+
+
+async def get_column_stats_service(db: AsyncSession = Depends(get_async_db)) -> ColumnStatsService:
+    """Dependency injection provider."""
+    return ColumnStatsService(db)
@@ -0,0 +1,373 @@
+"""
+Columnar Service - Parquet, Arrow IPC and NDJSON import/export for table data.
+
+Exports build one Arrow record batch per EXPORT_BATCH_SIZE rows, with a
+schema derived from the table's column definitions (number → float64,
+date → date32, boolean → bool, select → dictionary-encoded string,
+text/url → string), and write it to the output as it goes. Imports read the
+upload batch by batch and convert whole typed columns, so typed sources skip
+the per-cell string coercion that CSV needs. NDJSON needs no extra packages;
+Parquet and Arrow require the optional pyarrow dependency.
+"""
+
+import asyncio
+import io
+import json
+import math
+import logging
+from itertools import islice
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from services import row_index
+from services.import_export_service import (
+    IMPORT_BATCH_SIZE, ColumnFormat, compile_coercer, iter_table_data,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow formats are disabled without pyarrow
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# format -> (media type, file extension)
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+_TRUE_WORDS = {"true", "yes", "1", "y"}
+
+
+def require_format(fmt: str) -> None:
+    """Raise if the format is unknown or needs pyarrow and it isn't installed."""
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format: {fmt}",
+        )
+    if fmt != "ndjson" and pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{fmt} support requires pyarrow, which is not installed on this server",
+        )
+
+
+# =============================================================================
+# Schema
+# =============================================================================
+
+def arrow_schema(columns: List[Dict[str, Any]]) -> "pa.Schema":
+    """Arrow schema for a table's columns; field metadata keeps the column ID and type."""
+    types = {
+        "number": pa.float64(),
+        "date": pa.date32(),
+        "boolean": pa.bool_(),
+        "select": pa.dictionary(pa.int32(), pa.string()),
+    }
+    return pa.schema([
+        pa.field(
+            col["name"],
+            types.get(col.get("type"), pa.string()),
+            metadata={"column_id": col["id"], "column_type": col.get("type", "text")},
+        )
+        for col in columns
+    ])
+
+
+def _export_value(value: Any, col_type: str) -> Any:
+    """Convert a stored JSON value to the Python value for its Arrow column (None if it doesn't fit)."""
+    if value is None or value == "":
+        return None
+    if col_type == "number":
+        return row_index.as_number(value)
+    if col_type == "boolean":
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in _TRUE_WORDS
+    if col_type == "date":
+        try:
+            return date.fromisoformat(str(value)[:10])
+        except ValueError:
+            return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _record_batch(schema: "pa.Schema", columns: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> "pa.RecordBatch":
+    """Build one record batch, column by column."""
+    arrays = []
+    for field, col in zip(schema, columns):
+        col_type = col.get("type", "text")
+        values = [_export_value(row.get(col["id"]), col_type) for row in rows]
+        if col_type == "select":
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Write-only sink whose buffered bytes can be drained between batches.
+
+    Keeps an absolute position for tell(), which the Parquet writer uses to
+    record column chunk offsets in the footer.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_export(
+    table_id: int,
+    columns: List[Dict[str, Any]],
+    fmt: str,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a table's rows in a columnar (or NDJSON) format.
+
+    Args:
+        table_id: Table to export (ownership must already be verified)
+        columns: Column definitions (field order)
+        fmt: One of FORMATS (check with require_format first)
+
+    Yields:
+        Output chunks, one per batch of rows (plus the Parquet footer)
+    """
+    if fmt == "ndjson":
+        async for batch in iter_table_data(table_id):
+            lines = []
+            for data in batch:
+                record = {col["name"]: data.get(col["id"]) for col in columns}
+                lines.append(json.dumps(record, default=str))
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+        return
+
+    schema = arrow_schema(columns)
+    sink = _DrainableSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa_ipc.new_stream(sink, schema)
+
+    try:
+        async for batch in iter_table_data(table_id):
+            writer.write_batch(_record_batch(schema, columns, batch))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# =============================================================================
+# Import
+# =============================================================================
+
+def _import_value(value: Any, col_type: str, coerce_text) -> Any:
+    """Convert one typed source value to the stored JSON value (None = omit)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Untyped source values still go through the CSV coercer
+        return coerce_text(value)
+    if isinstance(value, float) and not math.isfinite(value):  # NaN/inf: JSON columns can't store them
+        return None
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    if col_type == "boolean" and isinstance(value, (int, float)):
+        return bool(value)
+    if col_type == "number" and isinstance(value, bool):
+        return int(value)
+    if col_type == "number" and isinstance(value, float) and value.is_integer():
+        return int(value)  # float64 columns round-trip whole numbers as ints
+    if col_type in ("text", "select", "url") and not isinstance(value, (dict, list)):
+        return str(value)
+    return value
+
+
+def _match_columns(names: List[str], columns: List[Dict[str, Any]], ids: Optional[List[Optional[str]]] = None) -> Dict[int, Dict[str, Any]]:
+    """Map source field positions to columns: by column ID metadata, then name, then ID."""
+    by_id = {col["id"]: col for col in columns}
+    by_name = {col["name"].lower(): col for col in columns}
+    mapping = {}
+    for idx, name in enumerate(names):
+        col = (ids and ids[idx] and by_id.get(ids[idx])) or by_name.get(name.lower()) or by_id.get(name)
+        if col:
+            mapping[idx] = col
+    return mapping
+
+
+def _rows_from_columns(
+    column_values: Dict[int, List[Any]],
+    mapping: Dict[int, Dict[str, Any]],
+    num_rows: int,
+) -> List[Dict[str, Any]]:
+    """Transpose converted columns into row dicts, skipping empty rows."""
+    converted = {}
+    for idx, col in mapping.items():
+        col_type = col.get("type", "text")
+        coerce_text = compile_coercer(ColumnFormat(col_type))
+        converted[col["id"]] = [_import_value(v, col_type, coerce_text) for v in column_values[idx]]
+
+    rows = []
+    for i in range(num_rows):
+        data = {col_id: values[i] for col_id, values in converted.items() if values[i] is not None}
+        if data:
+            rows.append(data)
+    return rows
+
+
+class ColumnarUpload:
+    """
+    A Parquet, Arrow or NDJSON upload read as batches of row data dicts.
+
+    Source fields are matched to the table's columns by the column_id field
+    metadata written on export, then by name (case-insensitive), then by
+    column ID. Unmatched fields are ignored. Blocking reads run in a worker
+    thread, like CsvStream.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        fmt: str,
+        columns: List[Dict[str, Any]],
+        total_bytes: Optional[int] = None,
+    ):
+        self._file = file
+        self._fmt = fmt
+        self._columns = columns
+        self.total_bytes = total_bytes
+        self._rows_read = 0
+        self._total_rows: Optional[int] = None
+
+    @property
+    def bytes_read(self) -> int:
+        """Upload bytes consumed so far (estimated from rows for Parquet, which reads its footer first)."""
+        if self._total_rows:
+            return int((self.total_bytes or 0) * self._rows_read / self._total_rows)
+        try:
+            return self._file.tell()
+        except (OSError, ValueError):
+            return 0
+
+    async def batches(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield batches of {column_id: value} dicts.
+
+        Raises:
+            ValueError: The upload isn't valid for the format
+        """
+        if self._fmt == "ndjson":
+            async for rows in self._ndjson_batches():
+                yield rows
+            return
+
+        batches = self._arrow_batches()
+        while True:
+            try:
+                item = await asyncio.to_thread(next, batches, None)
+            except pa.ArrowException as e:
+                raise ValueError(f"Invalid {self._fmt} file: {e}")
+            if item is None:
+                return
+            names, ids, batch = item
+            self._rows_read += batch.num_rows
+            mapping = _match_columns(names, self._columns, ids)
+            values = {}
+            for idx in mapping:
+                array = batch.column(idx)
+                if pa.types.is_dictionary(array.type):
+                    array = array.dictionary_decode()
+                values[idx] = array.to_pylist()
+            yield _rows_from_columns(values, mapping, batch.num_rows)
+
+    async def _ndjson_batches(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        text = io.TextIOWrapper(self._file, encoding="utf-8-sig")
+        try:
+            while True:
+                lines = await asyncio.to_thread(_read_lines, text, IMPORT_BATCH_SIZE)
+                if not lines:
+                    return
+                records = []
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Invalid JSON line: {e}")
+                    if isinstance(record, dict):
+                        records.append(record)
+                names = list({key: None for record in records for key in record})
+                mapping = _match_columns(names, self._columns)
+                values = {idx: [record.get(names[idx]) for record in records] for idx in mapping}
+                yield _rows_from_columns(values, mapping, len(records))
+        finally:
+            # A collected wrapper closes the file under it; bytes_read still needs it
+            text.detach()
+
+    def _arrow_batches(self):
+        """Sync iterator of (field names, column IDs, record batch)."""
+        if self._fmt == "parquet":
+            parquet = pq.ParquetFile(self._file)
+            self._total_rows = parquet.metadata.num_rows
+            schema = parquet.schema_arrow
+            batches = parquet.iter_batches(batch_size=IMPORT_BATCH_SIZE)
+        else:
+            try:
+                reader = pa_ipc.open_stream(self._file)
+                schema = reader.schema
+                batches = reader
+            except pa.ArrowInvalid:
+                # Not a stream — try the random-access IPC file format
+                self._file.seek(0)
+                reader = pa_ipc.open_file(self._file)
+                schema = reader.schema
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+        ids = [(field.metadata or {}).get(b"column_id", b"").decode() or None for field in schema]
+        for batch in batches:
+            yield schema.names, ids, batch
+
+
+def _read_lines(text: io.TextIOBase, count: int) -> List[str]:
+    """Read up to count lines."""
+    return list(islice(text, count))
@@ -3,23 +3,122 @@ Event Tracking Service
 
 Owns the user_events table. Handles persisting tracking events
 and querying them for admin views.
+
+Events are not written in the request that reports them: track() queues
+them on event_buffer, which writes them in multi-row INSERTs every
+EVENT_BUFFER_BATCH_SIZE events or EVENT_BUFFER_FLUSH_MS, on its own session.
+The app starts the buffer at startup and flushes what's left at shutdown.
 """
 
+import asyncio
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import insert, select, func, and_, desc
 from fastapi import Depends
 
 from models import User, UserEvent, EventSource
-from database import get_async_db
+from config.settings import settings
+from database import AsyncSessionLocal, get_async_db, record_write
+from utils.metrics import TRACKING_EVENTS
 
 logger = logging.getLogger(__name__)
 
 
+class EventBuffer:
+    """
+    In-process queue of pending user_events rows with a background flusher.
+
+    Bounded: once EVENT_BUFFER_MAX_PENDING events are waiting (database slow
+    or down), new events are dropped and counted rather than growing memory
+    or blocking requests. A failed insert drops its batch; tracking is
+    best-effort.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._dropped_since_warning = 0
+
+    def enqueue(self, rows: List[Dict[str, Any]]) -> int:
+        """Queue user_events rows without waiting; returns how many were accepted."""
+        accepted = rows[:max(self.max_pending - len(self._pending), 0)]
+        self._pending.extend(accepted)
+        dropped = len(rows) - len(accepted)
+        if dropped:
+            TRACKING_EVENTS.inc(dropped, outcome="dropped")
+            if not self._dropped_since_warning:
+                logger.warning(f"Event buffer full ({self.max_pending} pending), dropping tracking events")
+            self._dropped_since_warning += dropped
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return len(accepted)
+
+    async def flush(self) -> int:
+        """Write everything pending in batches; returns the number of events written."""
+        if self._dropped_since_warning:
+            logger.warning(f"Dropped {self._dropped_since_warning} tracking events while the buffer was full")
+            self._dropped_since_warning = 0
+
+        written = 0
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(UserEvent).values(batch))
+                    await db.commit()
+                # A batch spans users, so the session can't carry a single writer key
+                for user_id in {row["user_id"] for row in batch}:
+                    record_write(user_id)
+                written += len(batch)
+            except Exception as e:
+                TRACKING_EVENTS.inc(len(batch), outcome="failed")
+                logger.error(f"Failed to persist {len(batch)} tracking events: {e}")
+        if written:
+            TRACKING_EVENTS.inc(written, outcome="written")
+        return written
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop."""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher after its current flush, then write what's left."""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+event_buffer = EventBuffer(
+    batch_size=settings.EVENT_BUFFER_BATCH_SIZE,
+    flush_interval_ms=settings.EVENT_BUFFER_FLUSH_MS,
+    max_pending=settings.EVENT_BUFFER_MAX_PENDING,
+)
+
+
 @dataclass
 class EventWithUser:
     """A UserEvent joined with user info for admin display."""
@@ -42,20 +141,39 @@ class EventTrackingService:
         event_data: Optional[dict] = None,
     ) -> None:
         """
-        Persist a tracking event. Best-effort — logs errors but does not raise.
+        Queue a tracking event for the next buffered write. Best-effort — never
+        touches this request's session; the event may be dropped under overload.
+        """
+        event_buffer.enqueue([{
+            "user_id": user_id,
+            "event_source": event_source,
+            "event_type": event_type,
+            "event_data": event_data,
+            "created_at": datetime.utcnow(),
+        }])
+
+    async def track_many(
+        self,
+        user_id: int,
+        event_source: EventSource,
+        events: List[Tuple[str, Optional[dict], Optional[datetime]]],
+    ) -> int:
+        """
+        Queue several events for one user — (event_type, event_data, occurred_at)
+        tuples, written together. occurred_at (naive UTC) defaults to now.
+        Returns how many were accepted; the rest were dropped under overload.
         """
-        try:
-            event = UserEvent(
-                user_id=user_id,
-                event_source=event_source,
-                event_type=event_type,
-                event_data=event_data,
-            )
-            self.db.add(event)
-            await self.db.commit()
-        except Exception as e:
-            logger.error(f"Failed to persist tracking event: {e}")
-            await self.db.rollback()
+        now = datetime.utcnow()
+        return event_buffer.enqueue([
+            {
+                "user_id": user_id,
+                "event_source": event_source,
+                "event_type": event_type,
+                "event_data": event_data,
+                "created_at": occurred_at or now,
+            }
+            for event_type, event_data, occurred_at in events
+        ])
 
     async def list_events(
         self,
@@ -2,65 +2,103 @@
 Import/Export Service - CSV import and export for table data.
 """
 
+import asyncio
 import csv
 import io
-import uuid
+import itertools
+import re
+import zlib
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import AsyncIterator, BinaryIO, Callable, List, Dict, Any, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from fastapi import Depends
 
 from models import TableDefinition, TableRow
-from database import get_async_db
+from database import get_async_db, AsyncSessionLocal
+from services import row_index
+from services.table_service import bump_version, generate_column_id, record_row_changes, row_limit
 
 logger = logging.getLogger(__name__)
 
+IMPORT_BATCH_SIZE = 1000  # CSV records coerced and inserted per batch
+SCHEMA_SAMPLE_SIZE = 100  # Records sampled for column type detection
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per server-side cursor partition
 
-def _generate_column_id() -> str:
-    """Generate a stable column ID."""
-    return f"col_{uuid.uuid4().hex[:8]}"
 
-
-def detect_schema(
-    csv_content: str,
-    has_header: bool = True,
-    sample_size: int = 100,
-) -> Tuple[List[Dict[str, Any]], List[str]]:
+class CsvStream:
     """
-    Auto-detect column types from CSV content.
+    Incremental CSV reader over a binary upload.
 
-    Returns:
-        Tuple of (column_definitions, header_names)
+    The upload is decoded through a TextIOWrapper and parsed in worker threads
+    in fixed-size record batches, so neither the raw file nor the parsed rows
+    are ever held in memory all at once. Records read by peek() (e.g. for
+    schema detection) are replayed by batches().
     """
-    reader = csv.reader(io.StringIO(csv_content))
 
-    if has_header:
-        try:
-            headers = next(reader)
-        except StopIteration:
-            return [], []
-    else:
-        # Peek at first row for column count
+    def __init__(self, file: BinaryIO, total_bytes: Optional[int] = None):
+        self._file = file
+        self._reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+        self._buffered: List[List[str]] = []
+        self.total_bytes = total_bytes
+
+    @classmethod
+    def from_text(cls, csv_content: str) -> "CsvStream":
+        """Wrap an in-memory CSV string."""
+        data = csv_content.encode("utf-8")
+        return cls(io.BytesIO(data), len(data))
+
+    @property
+    def bytes_read(self) -> int:
+        """Bytes consumed from the upload so far (includes read-ahead)."""
         try:
-            first_row = next(reader)
-        except StopIteration:
-            return [], []
-        headers = [f"Column {i + 1}" for i in range(len(first_row))]
-        # Re-read from beginning so sample includes first row
-        reader = csv.reader(io.StringIO(csv_content))
-
-    # Clean headers
-    headers = [h.strip() for h in headers]
-
-    # Sample rows for type detection
-    sample_rows: List[List[str]] = []
-    for i, row in enumerate(reader):
-        if i >= sample_size:
-            break
-        sample_rows.append(row)
+            return self._file.tell()
+        except (OSError, ValueError):
+            return 0
+
+    async def _read(self, count: int) -> List[List[str]]:
+        return await asyncio.to_thread(lambda: list(itertools.islice(self._reader, count)))
+
+    async def peek(self, count: int) -> List[List[str]]:
+        """Read up to `count` records without consuming them."""
+        if len(self._buffered) < count:
+            self._buffered.extend(await self._read(count - len(self._buffered)))
+        return self._buffered[:count]
+
+    async def next_record(self) -> Optional[List[str]]:
+        """Consume a single record (e.g. the header), or None at end of file."""
+        records = await self.peek(1)
+        if not records:
+            return None
+        self._buffered.pop(0)
+        return records[0]
+
+    async def batches(self, size: int = IMPORT_BATCH_SIZE) -> AsyncIterator[List[List[str]]]:
+        """Consume the remaining records in batches of up to `size`."""
+        while self._buffered:
+            batch, self._buffered = self._buffered[:size], self._buffered[size:]
+            yield batch
+        while True:
+            batch = await self._read(size)
+            if not batch:
+                return
+            yield batch
+
+
+def detect_columns(
+    headers: List[str],
+    sample_rows: List[List[str]],
+) -> List[Dict[str, Any]]:
+    """
+    Auto-detect column definitions from a header and a sample of records.
 
+    Returns:
+        Column definitions, one per header
+    """
     columns = []
     for col_idx, header in enumerate(headers):
         col_values = [
@@ -68,9 +106,9 @@ def detect_schema(
             if col_idx < len(row) and row[col_idx].strip()
         ]
 
-        col_type = _detect_column_type(col_values)
+        col_type = infer_format(col_values).col_type
         col_def = {
-            "id": _generate_column_id(),
+            "id": generate_column_id(),
             "name": header or f"Column {col_idx + 1}",
             "type": col_type,
             "required": False,
@@ -83,257 +121,507 @@ def detect_schema(
 
         columns.append(col_def)
 
-    return columns, headers
-
+    return columns
 
-def _detect_column_type(values: List[str]) -> str:
-    """Detect the most appropriate column type for a set of values."""
-    if not values:
-        return "text"
 
-    # Check if all values are boolean-like
-    bool_values = {"true", "false", "yes", "no", "1", "0", "y", "n"}
-    if all(v.lower() in bool_values for v in values):
-        return "boolean"
+async def detect_schema(
+    stream: CsvStream,
+    has_header: bool = True,
+    sample_size: int = SCHEMA_SAMPLE_SIZE,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Auto-detect column types from the first records of a CSV stream.
 
-    # Check if all values are numeric
-    numeric_count = 0
-    for v in values:
-        try:
-            float(v.replace(",", ""))
-            numeric_count += 1
-        except ValueError:
-            pass
-    if numeric_count == len(values):
-        return "number"
+    Only a bounded prefix is read; it stays buffered in the stream so the
+    import that follows still sees every record.
 
-    # Check if values look like URLs
-    import re as _re
-    url_count = sum(1 for v in values if _re.match(r'^https?://|^www\.', v, _re.IGNORECASE))
-    if url_count >= len(values) * 0.7:
-        return "url"
+    Returns:
+        Tuple of (column_definitions, header_names)
+    """
+    sample_rows = await stream.peek(sample_size + (1 if has_header else 0))
+    if not sample_rows:
+        return [], []
 
-    # Check if all values look like dates
-    date_patterns = _check_date_values(values)
-    if date_patterns:
-        return "date"
+    if has_header:
+        headers, sample_rows = sample_rows[0], sample_rows[1:]
+    else:
+        headers = [f"Column {i + 1}" for i in range(len(sample_rows[0]))]
 
-    # Check if values are a small set of options (select)
-    unique_count = len(set(values))
-    if unique_count <= 10 and len(values) >= 3 and unique_count < len(values) * 0.5:
-        return "select"
+    # Clean headers
+    headers = [h.strip() for h in headers]
+    return detect_columns(headers, sample_rows), headers
+
+
+# Date formats recognized on import, in order of preference
+DATE_FORMATS = (
+    "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y",
+    "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S",
+    "%Y/%m/%d", "%d-%m-%Y",
+)
+
+# Date-only formats parsed by splitting: (separator, positions of year, month, day)
+_DATE_SPLITS = {
+    "%Y-%m-%d": ("-", (0, 1, 2)),
+    "%m/%d/%Y": ("/", (2, 0, 1)),
+    "%d/%m/%Y": ("/", (2, 1, 0)),
+    "%Y/%m/%d": ("/", (0, 1, 2)),
+    "%d-%m-%Y": ("-", (2, 1, 0)),
+}
+
+_TRUE_WORDS = frozenset({"true", "yes", "1", "y"})
+_BOOL_WORDS = _TRUE_WORDS | {"false", "no", "0", "n"}
+_URL_RE = re.compile(r"^https?://|^www\.", re.IGNORECASE)
+
+# Number locales: (thousands separator, decimal separator). "mixed" columns
+# contradict themselves, so only values without a comma are converted.
+_NUMBER_LOCALES = {"en": (",", "."), "eu": (".", ","), "mixed": (None, ".")}
+# "1.234,5" or "3,25" — a comma that can only be a decimal separator
+_EU_DECIMAL_RE = re.compile(r"^[-+]?(\d{1,3}(\.\d{3})+|\d+),(\d{1,2}|\d{4,})$")
+# "1,234.5" or "2.75" — a period that can only be a decimal separator
+_EN_DECIMAL_RE = re.compile(r"^[-+]?(\d{1,3}(,\d{3})+\.\d+|\d+\.(\d{1,2}|\d{4,}))$")
+
+
+@dataclass(frozen=True)
+class ColumnFormat:
+    """Type and value formats settled for one CSV column."""
+    col_type: str
+    date_format: Optional[str] = None   # Dominant DATE_FORMATS entry (date columns)
+    number_locale: str = "en"           # Key of _NUMBER_LOCALES (number columns)
+
+
+def _match_date_format(value: str) -> Optional[str]:
+    """First DATE_FORMATS entry that parses the value."""
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
 
-    return "text"
 
+def infer_format(values: List[str], col_type: Optional[str] = None) -> ColumnFormat:
+    """
+    Settle a column's type (unless given) and value formats in one pass.
 
-def _check_date_values(values: List[str]) -> bool:
-    """Check if values appear to be dates."""
-    from datetime import datetime
+    Every sample value is classified once: boolean word, number (noting
+    which locale its separators imply), URL, and which date format parses it.
+    The dominant date format and the number locale are then fixed for the
+    whole column, so coercion never has to try alternatives per cell.
 
-    date_formats = [
-        "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y",
-        "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S",
-        "%Y/%m/%d", "%d-%m-%Y",
-    ]
+    Args:
+        values: Non-empty, stripped sample values
+        col_type: Known column type (existing tables); detected if None
+    """
+    if not values:
+        return ColumnFormat(col_type or "text")
 
-    date_count = 0
+    bool_count = numeric_count = url_count = date_count = 0
+    eu_hints = en_hints = 0
+    date_hits: Dict[str, int] = {}
     for v in values:
-        for fmt in date_formats:
-            try:
-                datetime.strptime(v, fmt)
-                date_count += 1
-                break
-            except ValueError:
-                continue
-
-    # At least 80% should parse as dates
-    return date_count >= len(values) * 0.8
+        if v.lower() in _BOOL_WORDS:
+            bool_count += 1
+        try:
+            if math.isfinite(float(v.replace(",", ""))):
+                numeric_count += 1
+        except (ValueError, OverflowError):
+            pass
+        if _EU_DECIMAL_RE.match(v):
+            eu_hints += 1
+        elif _EN_DECIMAL_RE.match(v):
+            en_hints += 1
+        if _URL_RE.match(v):
+            url_count += 1
+        fmt = _match_date_format(v)
+        if fmt:
+            date_count += 1
+            date_hits[fmt] = date_hits.get(fmt, 0) + 1
+
+    if col_type is None:
+        if bool_count == len(values):
+            col_type = "boolean"
+        elif numeric_count == len(values):
+            col_type = "number"
+        elif url_count >= len(values) * 0.7:
+            col_type = "url"
+        elif date_count >= len(values) * 0.8:  # At least 80% should parse as dates
+            col_type = "date"
+        else:
+            # A small set of repeated values is a select
+            unique_count = len(set(values))
+            if unique_count <= 10 and len(values) >= 3 and unique_count < len(values) * 0.5:
+                col_type = "select"
+            else:
+                col_type = "text"
 
+    return ColumnFormat(
+        col_type=col_type,
+        date_format=max(date_hits, key=date_hits.get) if date_hits else None,
+        number_locale=("mixed" if en_hints else "eu") if eu_hints else "en",
+    )
 
-def _coerce_value(raw: str, col_type: str) -> Any:
-    """Coerce a raw CSV string value to the target column type."""
-    raw = raw.strip()
-    if not raw:
-        return None
 
-    if col_type == "number":
-        try:
-            # Handle comma-formatted numbers
-            cleaned = raw.replace(",", "")
-            if "." in cleaned:
-                return float(cleaned)
-            return int(cleaned)
-        except ValueError:
-            return raw
-
-    if col_type == "boolean":
-        return raw.lower() in ("true", "yes", "1", "y")
-
-    if col_type == "date":
-        # Try to normalize to YYYY-MM-DD
-        from datetime import datetime
-        date_formats = [
-            "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y",
-            "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S",
-            "%Y/%m/%d", "%d-%m-%Y",
-        ]
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(raw, fmt).strftime("%Y-%m-%d")
-            except ValueError:
-                continue
+def _parse_date_any(raw: str) -> str:
+    """Normalize a date in any known format to YYYY-MM-DD (or return it unchanged)."""
+    fmt = _match_date_format(raw)
+    if fmt is None:
         return raw
+    return datetime.strptime(raw, fmt).strftime("%Y-%m-%d")
 
-    # text or select: return as-is
-    return raw
 
+def compile_coercer(fmt: ColumnFormat) -> Callable[[str], Any]:
+    """
+    Build the function that converts one raw CSV cell for a column.
 
-def parse_csv_rows(
-    csv_content: str,
+    Returns None for empty cells; values that don't fit the column's format
+    are kept as the stripped string.
+    """
+    if fmt.col_type == "number":
+        thousands, decimal = _NUMBER_LOCALES[fmt.number_locale]
+
+        def coerce_number(raw: str) -> Any:
+            raw = raw.strip()
+            if not raw:
+                return None
+            if thousands is None:
+                if "," in raw:
+                    return raw  # Can't tell a decimal comma from a thousands one
+                cleaned = raw
+            else:
+                cleaned = raw.replace(thousands, "")
+            if decimal != ".":
+                cleaned = cleaned.replace(decimal, ".")
+            try:
+                num = float(cleaned) if "." in cleaned else int(cleaned)
+            except ValueError:
+                return raw
+            # "9.9e999" overflows to inf, which JSON columns can't store
+            return num if math.isfinite(num) else raw
+
+        return coerce_number
+
+    if fmt.col_type == "boolean":
+        def coerce_boolean(raw: str) -> Any:
+            raw = raw.strip()
+            if not raw:
+                return None
+            return raw.lower() in _TRUE_WORDS
+
+        return coerce_boolean
+
+    if fmt.col_type == "date":
+        primary = fmt.date_format
+        split = _DATE_SPLITS.get(primary)
+
+        def coerce_date(raw: str) -> Any:
+            raw = raw.strip()
+            if not raw:
+                return None
+            if split:
+                # Plain y/m/d dates skip strptime: split, then let date() validate
+                sep, (y, m, d) = split
+                parts = raw.split(sep)
+                if len(parts) == 3 and len(parts[y]) == 4 and all(p.isdigit() for p in parts):
+                    try:
+                        return date(int(parts[y]), int(parts[m]), int(parts[d])).isoformat()
+                    except ValueError:
+                        pass
+            elif primary:
+                try:
+                    return datetime.strptime(raw, primary).strftime("%Y-%m-%d")
+                except ValueError:
+                    pass
+            # Outliers in another format still get normalized
+            return _parse_date_any(raw)
+
+        return coerce_date
+
+    # text, select, url: stripped string as-is
+    def coerce_text(raw: str) -> Any:
+        return raw.strip() or None
+
+    return coerce_text
+
+
+def _column_map(
+    csv_headers: Optional[List[str]],
     columns: List[Dict[str, Any]],
-    has_header: bool = True,
     header_names: Optional[List[str]] = None,
-) -> List[Dict[str, Any]]:
+) -> Dict[int, Dict[str, Any]]:
     """
-    Parse CSV content into row data dicts using the given column schema.
+    Map CSV column positions to column definitions.
 
     Args:
-        csv_content: Raw CSV string
+        csv_headers: The CSV header record, or None to map by position
         columns: Column definitions with id and type
-        has_header: Whether CSV has a header row
         header_names: Original header names for mapping (if different from column names)
-
-    Returns:
-        List of {column_id: typed_value} dicts
     """
-    reader = csv.reader(io.StringIO(csv_content))
+    if csv_headers is None:
+        return {i: col for i, col in enumerate(columns)}
 
-    if has_header:
-        try:
-            csv_headers = next(reader)
-        except StopIteration:
-            return []
-        csv_headers = [h.strip() for h in csv_headers]
-
-        # Build mapping: csv column index → column definition
-        col_map: Dict[int, Dict[str, Any]] = {}
-        for csv_idx, csv_header in enumerate(csv_headers):
-            for col in columns:
-                # Match by name (case-insensitive)
-                if col["name"].lower() == csv_header.lower():
-                    col_map[csv_idx] = col
-                    break
-            else:
-                # Try matching against original header names
-                if header_names:
-                    for orig_idx, orig_name in enumerate(header_names):
-                        if orig_name.lower() == csv_header.lower() and orig_idx < len(columns):
-                            col_map[csv_idx] = columns[orig_idx]
-                            break
-    else:
-        # Map by position
-        col_map = {i: col for i, col in enumerate(columns)}
+    csv_headers = [h.strip() for h in csv_headers]
+    col_map: Dict[int, Dict[str, Any]] = {}
+    for csv_idx, csv_header in enumerate(csv_headers):
+        for col in columns:
+            # Match by name (case-insensitive)
+            if col["name"].lower() == csv_header.lower():
+                col_map[csv_idx] = col
+                break
+        else:
+            # Try matching against original header names
+            if header_names:
+                for orig_idx, orig_name in enumerate(header_names):
+                    if orig_name.lower() == csv_header.lower() and orig_idx < len(columns):
+                        col_map[csv_idx] = columns[orig_idx]
+                        break
+    return col_map
+
+
+def _compile_coercers(
+    col_map: Dict[int, Dict[str, Any]],
+    sample_records: List[List[str]],
+) -> List[Tuple[int, str, Callable[[str], Any]]]:
+    """Infer each mapped column's formats from sample records and compile its coercer."""
+    coercers = []
+    for csv_idx, col in col_map.items():
+        values = [
+            row[csv_idx].strip() for row in sample_records
+            if csv_idx < len(row) and row[csv_idx].strip()
+        ]
+        fmt = infer_format(values, col.get("type", "text"))
+        coercers.append((csv_idx, col["id"], compile_coercer(fmt)))
+    return coercers
 
+
+def _coerce_records(
+    records: List[List[str]],
+    coercers: List[Tuple[int, str, Callable[[str], Any]]],
+) -> List[Dict[str, Any]]:
+    """Coerce CSV records into {column_id: typed_value} dicts, skipping empty rows."""
     rows = []
-    for row_data in reader:
+    for row_data in records:
+        width = len(row_data)
         data: Dict[str, Any] = {}
-        for csv_idx, col in col_map.items():
-            if csv_idx < len(row_data):
-                value = _coerce_value(row_data[csv_idx], col["type"])
+        for csv_idx, col_id, coerce in coercers:
+            if csv_idx < width:
+                value = coerce(row_data[csv_idx])
                 if value is not None:
-                    data[col["id"]] = value
+                    data[col_id] = value
         if data:  # Skip entirely empty rows
             rows.append(data)
-
     return rows
 
 
-async def import_csv_to_table(
+@dataclass
+class ImportProgress:
+    """Progress of a streaming import."""
+    imported: int                       # Rows inserted so far
+    bytes_read: int                     # Upload bytes consumed so far
+    total_bytes: Optional[int] = None   # Upload size, if known
+    done: bool = False                  # Set on the final update
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the upload consumed, 0.0 to 1.0."""
+        if self.done:
+            return 1.0
+        if not self.total_bytes:
+            return 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+
+async def import_row_batches(
+    db: AsyncSession,
+    table: TableDefinition,
+    batches: AsyncIterator[List[Dict[str, Any]]],
+    bytes_read: Callable[[], int],
+    total_bytes: Optional[int] = None,
+) -> AsyncIterator[ImportProgress]:
+    """
+    Insert batches of row data into an existing table, yielding progress.
+
+    Each batch is its own write: it bumps the table version, is inserted
+    with core multi-row INSERTs and indexed, and commits. The version bump
+    locks the table's definition row, so other writers to the table wait
+    for one batch at most rather than for the whole upload. The trade-off
+    is that an import failing part-way (a malformed record, a dropped
+    connection) keeps the batches committed before the failure; the
+    progress events report how many that was. The row limit is checked
+    under the same lock, and reading stops once it is reached.
+
+    Args:
+        db: Database session
+        table: Target table definition
+        batches: Lists of {column_id: typed_value} dicts
+        bytes_read: Returns how much of the upload has been consumed
+        total_bytes: Upload size, if known
+
+    Yields:
+        ImportProgress after each committed batch; the last one has done=True
+    """
+    from services.row_service import RowService
+
+    row_service = RowService(db)
+    imported = 0
+    async for rows_data in batches:
+        if not rows_data:
+            continue
+
+        version = await bump_version(db, table.id)
+        result = await db.execute(
+            select(TableDefinition.row_count, TableDefinition.max_rows).where(TableDefinition.id == table.id)
+        )
+        current = result.one()
+        limit = row_limit(current)
+        room = max(limit - current.row_count, 0)
+        if room == 0:
+            await db.rollback()
+            if imported:
+                break
+            raise ValueError(
+                f"Table already has {current.row_count} rows (limit: {limit}). "
+                f"Cannot import more rows."
+            )
+
+        rows_data = rows_data[:room]
+        row_ids = await row_service.insert_many(table.id, rows_data, version)
+        await row_index.index_rows(db, table.id, table.columns, zip(row_ids, rows_data))
+        await record_row_changes(db, table.id, len(row_ids))
+        await db.commit()
+        imported += len(row_ids)
+        yield ImportProgress(imported, bytes_read(), total_bytes)
+
+        if len(row_ids) >= room:
+            break
+
+    yield ImportProgress(imported, bytes_read(), total_bytes, done=True)
+
+
+async def import_csv_stream(
     db: AsyncSession,
     table: TableDefinition,
-    csv_content: str,
+    stream: CsvStream,
     has_header: bool = True,
-) -> int:
+    header_names: Optional[List[str]] = None,
+) -> AsyncIterator[ImportProgress]:
     """
-    Import CSV data into an existing table.
+    Import CSV records into an existing table, yielding progress per batch.
+
+    Column formats are inferred from the first records and each batch of
+    IMPORT_BATCH_SIZE records is coerced with the compiled coercers before
+    being handed to import_row_batches.
 
     Args:
         db: Database session
         table: Target table definition
-        csv_content: Raw CSV string
+        stream: CSV source
         has_header: Whether CSV has a header row
+        header_names: Original header names for mapping (if different from column names)
+    """
+    csv_headers = await stream.next_record() if has_header else None
+    col_map = _column_map(csv_headers, table.columns, header_names)
+    coercers = _compile_coercers(col_map, await stream.peek(SCHEMA_SAMPLE_SIZE))
+
+    async def row_batches() -> AsyncIterator[List[Dict[str, Any]]]:
+        async for records in stream.batches():
+            yield _coerce_records(records, coercers)
+
+    async for update in import_row_batches(
+        db, table, row_batches(), lambda: stream.bytes_read, stream.total_bytes
+    ):
+        yield update
+
+
+async def import_csv_to_table(
+    db: AsyncSession,
+    table: TableDefinition,
+    stream: CsvStream,
+    has_header: bool = True,
+    header_names: Optional[List[str]] = None,
+) -> int:
+    """
+    Import CSV data into an existing table.
 
     Returns:
         Number of rows imported
     """
-    from tools.builtin.table_data import MAX_ROWS_PER_TABLE
+    imported = 0
+    async for update in import_csv_stream(db, table, stream, has_header, header_names):
+        imported = update.imported
+    return imported
 
-    rows_data = parse_csv_rows(csv_content, table.columns, has_header)
 
-    if not rows_data:
-        return 0
+def _csv_cell(value: Any) -> str:
+    """Format one cell value for CSV output."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
 
-    # Enforce row limit: check existing rows and truncate if needed
-    existing_count_result = await db.execute(
-        select(func.count(TableRow.id)).where(TableRow.table_id == table.id)
-    )
-    existing_count = existing_count_result.scalar() or 0
-    room = max(MAX_ROWS_PER_TABLE - existing_count, 0)
 
-    if room == 0:
-        raise ValueError(
-            f"Table already has {existing_count} rows (limit: {MAX_ROWS_PER_TABLE}). "
-            f"Cannot import more rows."
-        )
+async def iter_table_data(table_id: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield a table's row data in batches of EXPORT_BATCH_SIZE, newest first.
 
-    if len(rows_data) > room:
-        rows_data = rows_data[:room]
+    Rows are read through a server-side cursor, so memory stays flat
+    regardless of table size. Opens its own session because exports run
+    after the endpoint has returned.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            select(TableRow.data)
+            .where(TableRow.table_id == table_id)
+            .order_by(TableRow.created_at.desc(), TableRow.id.desc())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield [data or {} for (data,) in partition]
 
-    # Batch create rows
-    new_rows = [
-        TableRow(table_id=table.id, data=data)
-        for data in rows_data
-    ]
-    db.add_all(new_rows)
-    await db.commit()
 
-    return len(new_rows)
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compress a byte stream incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # wbits=31 → gzip framing
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
 
-def export_csv(
+async def stream_csv(
+    table_id: int,
     columns: List[Dict[str, Any]],
-    rows: List[TableRow],
-) -> str:
+) -> AsyncIterator[bytes]:
     """
-    Export rows to CSV string.
+    Stream a table's rows as CSV, one chunk per batch of rows.
+
+    The first bytes go out before the whole table has been read.
 
     Args:
-        columns: Column definitions
-        rows: TableRow objects to export
+        table_id: Table to export (ownership must already be verified)
+        columns: Column definitions (header order)
 
-    Returns:
-        CSV string with header + data rows
+    Yields:
+        Encoded CSV chunks
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    headers = [col["name"] for col in columns]
-    writer.writerow(headers)
-
-    # Write data rows
-    for row in rows:
-        csv_row = []
-        for col in columns:
-            value = row.data.get(col["id"], "")
-            if value is None:
-                value = ""
-            elif isinstance(value, bool):
-                value = "true" if value else "false"
-            csv_row.append(str(value))
-        writer.writerow(csv_row)
-
-    return output.getvalue()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow([col["name"] for col in columns])
+    yield flush()
+
+    async for batch in iter_table_data(table_id):
+        for data in batch:
+            writer.writerow([_csv_cell(data.get(col["id"])) for col in columns])
+        yield flush()
 
 
 async def get_import_export_service(db: AsyncSession = Depends(get_async_db)):
@@ -19,8 +19,9 @@ from schemas.organization import (
     OrganizationWithStats, OrgMember, OrgMemberUpdate
 )
 from schemas.user import UserRole as UserRoleSchema, OrgMember as OrgMemberSchema
+from services import user_cache
 from services.user_service import UserService
-from database import get_async_db
+from database import get_async_db, get_async_read_db
 
 logger = logging.getLogger(__name__)
 
@@ -282,6 +283,7 @@ class OrganizationService:
 
         target_user.role = new_role
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(target_user)
 
         logger.info(f"Updated role for user {user_id} to {new_role}")
@@ -320,6 +322,7 @@ class OrganizationService:
 
         target_user.org_id = None
         await self.db.commit()
+        user_cache.invalidate(user_id)
 
         logger.info(f"Removed user {user_id} from org {org_id}")
         return True
@@ -331,3 +334,10 @@ async def get_organization_service(
 ) -> OrganizationService:
     """Get an OrganizationService instance with async database session."""
     return OrganizationService(db)
+
+
+async def get_organization_read_service(
+    db: AsyncSession = Depends(get_async_read_db)
+) -> OrganizationService:
+    """Get an OrganizationService instance for read-only endpoints (replica when configured)."""
+    return OrganizationService(db)
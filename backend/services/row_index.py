@@ -0,0 +1,297 @@
+"""
+Row Index - maintains the per-row side indexes (table_row_values, table_row_search).
+
+Sorting and filtering rows through JSON_EXTRACT forces a full scan of the
+table's rows. Instead, every row write also writes one TableRowValue entry per
+declared column, typed by the column definition, and RowService.list joins
+against it. Text and select values are also joined into a TableRowSearch
+document under a FULLTEXT index for RowService.search. The functions here
+never commit — callers own the transaction.
+"""
+
+import json
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, delete, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import TableRow, TableRowValue, TableRowSearch
+
+logger = logging.getLogger(__name__)
+
+INDEXED_TEXT_LENGTH = 255   # Must match TableRowValue.value_text length
+INDEX_BATCH_SIZE = 1000     # Rows per chunk when (re)indexing a whole table
+
+SEARCHABLE_TYPES = ("text", "select")  # Column types included in search documents
+SEARCH_CONTENT_MAX_BYTES = 65535       # TableRowSearch.content is a TEXT column
+
+_TRUE_WORDS = {"true", "yes", "y", "1"}
+_FALSE_WORDS = {"false", "no", "n", "0"}
+
+
+def as_number(value: Any) -> Optional[float]:
+    """
+    Interpret a value as a number, or None if it isn't one.
+
+    NaN and infinities ("nan", "inf", "-Infinity", 1e999) aren't numbers
+    here: MySQL can't store them in value_num, so they're indexed as text.
+    """
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    try:
+        if isinstance(value, (int, float)):
+            num = float(value)
+        elif isinstance(value, str):
+            num = float(value.replace(",", ""))
+        else:
+            return None
+    except (ValueError, OverflowError):
+        return None
+    return num if math.isfinite(num) else None
+
+
+def index_value(value: Any, col_type: str) -> Optional[Tuple[Optional[float], Optional[str]]]:
+    """
+    Compute the (value_num, value_text) index entry for one cell.
+
+    Returns None for empty values, which get no entry at all.
+    """
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, bool) or isinstance(value, (int, float)):
+        num = as_number(value)
+        if num is not None:
+            return num, None
+        return None, str(value)[:INDEXED_TEXT_LENGTH]
+
+    if isinstance(value, (dict, list)):
+        return None, json.dumps(value, default=str)[:INDEXED_TEXT_LENGTH]
+
+    text = str(value)
+    if col_type == "number":
+        num = as_number(text)
+        if num is not None:
+            return num, None
+    elif col_type == "boolean":
+        lowered = text.strip().lower()
+        if lowered in _TRUE_WORDS:
+            return 1.0, None
+        if lowered in _FALSE_WORDS:
+            return 0.0, None
+
+    return None, text[:INDEXED_TEXT_LENGTH]
+
+
+def typed_value(value_num: Optional[float], value_text: Optional[str]) -> Any:
+    """Collapse an index entry back to a single value (ints stay ints)."""
+    if value_num is None:
+        return value_text
+    return int(value_num) if value_num.is_integer() else value_num
+
+
+def build_entries(
+    table_id: int,
+    columns: List[Dict[str, Any]],
+    row_id: int,
+    data: Dict[str, Any],
+    column_ids: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Build TableRowValue insert params for one row's declared columns."""
+    entries = []
+    for col in columns:
+        col_id = col["id"]
+        if column_ids is not None and col_id not in column_ids:
+            continue
+        entry = index_value((data or {}).get(col_id), col.get("type", "text"))
+        if entry is None:
+            continue
+        entries.append({
+            "row_id": row_id,
+            "column_id": col_id,
+            "table_id": table_id,
+            "value_num": entry[0],
+            "value_text": entry[1],
+        })
+    return entries
+
+
+def search_content(columns: List[Dict[str, Any]], data: Dict[str, Any]) -> str:
+    """
+    Join a row's searchable (text/select) values into one search document.
+
+    The document is cut to the first 64KB (the TEXT column's size), so text
+    past that point in very large rows isn't full-text searchable.
+    """
+    parts = []
+    for col in columns:
+        if col.get("type") not in SEARCHABLE_TYPES:
+            continue
+        value = (data or {}).get(col["id"])
+        if value is not None and value != "":
+            parts.append(str(value))
+    content = "\n".join(parts)
+    encoded = content.encode("utf-8")
+    if len(encoded) <= SEARCH_CONTENT_MAX_BYTES:
+        return content
+    # Cut on bytes, dropping any character split at the boundary
+    return encoded[:SEARCH_CONTENT_MAX_BYTES].decode("utf-8", errors="ignore")
+
+
+def _searchable_ids(columns: List[Dict[str, Any]]) -> Set[str]:
+    return {col["id"] for col in columns or [] if col.get("type") in SEARCHABLE_TYPES}
+
+
+async def _insert_entries(db: AsyncSession, entries: List[Dict[str, Any]]) -> None:
+    """Insert index entries in fixed-size multi-row batches."""
+    for start in range(0, len(entries), INDEX_BATCH_SIZE):
+        await db.execute(insert(TableRowValue), entries[start:start + INDEX_BATCH_SIZE])
+
+
+async def _upsert_search_docs(db: AsyncSession, docs: List[Dict[str, Any]]) -> None:
+    """Insert or replace search documents in fixed-size multi-row batches."""
+    if not docs:
+        return
+    stmt = mysql_insert(TableRowSearch)
+    stmt = stmt.on_duplicate_key_update(content=stmt.inserted.content)
+    for start in range(0, len(docs), INDEX_BATCH_SIZE):
+        await db.execute(stmt, docs[start:start + INDEX_BATCH_SIZE])
+
+
+async def index_rows(
+    db: AsyncSession,
+    table_id: int,
+    columns: List[Dict[str, Any]],
+    rows: Iterable[Tuple[int, Dict[str, Any]]],
+    column_ids: Optional[Set[str]] = None,
+) -> None:
+    """
+    (Re)write index entries for the given rows.
+
+    Args:
+        db: Database session (not committed)
+        table_id: Table the rows belong to
+        columns: Column definitions from the table schema
+        rows: (row_id, data) pairs
+        column_ids: Restrict to these columns (e.g. the keys of a partial update).
+            The search document is rebuilt from the full row data whenever a
+            searchable column is among them.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    row_ids = [row_id for row_id, _ in rows]
+    stmt = delete(TableRowValue).where(TableRowValue.row_id.in_(row_ids))
+    if column_ids is not None:
+        stmt = stmt.where(TableRowValue.column_id.in_(column_ids))
+    await db.execute(stmt)
+
+    entries: List[Dict[str, Any]] = []
+    for row_id, data in rows:
+        entries.extend(build_entries(table_id, columns, row_id, data, column_ids))
+    await _insert_entries(db, entries)
+
+    if column_ids is None or column_ids & _searchable_ids(columns):
+        await _upsert_search_docs(db, [
+            {"row_id": row_id, "table_id": table_id, "content": search_content(columns, data)}
+            for row_id, data in rows
+        ])
+
+
+async def drop_columns(db: AsyncSession, table_id: int, column_ids: Sequence[str]) -> None:
+    """Remove index entries for columns that no longer exist."""
+    if not column_ids:
+        return
+    await db.execute(
+        delete(TableRowValue).where(
+            TableRowValue.table_id == table_id,
+            TableRowValue.column_id.in_(list(column_ids)),
+        )
+    )
+
+
+async def reindex_columns(
+    db: AsyncSession,
+    table_id: int,
+    columns: List[Dict[str, Any]],
+    column_ids: Optional[Set[str]] = None,
+    rebuild_search: Optional[bool] = None,
+) -> int:
+    """
+    Rebuild index entries for a whole table, or only some of its columns.
+
+    Walks the table in id-ordered chunks so it never holds more than
+    INDEX_BATCH_SIZE rows in memory. Search documents are rebuilt too when
+    rebuild_search is set (default: when reindexing the whole table or any
+    searchable column). Returns the number of rows visited.
+    """
+    if rebuild_search is None:
+        rebuild_search = column_ids is None or bool(column_ids & _searchable_ids(columns))
+    if column_ids is not None and not column_ids and not rebuild_search:
+        return 0
+    stmt = delete(TableRowValue).where(TableRowValue.table_id == table_id)
+    if column_ids is not None:
+        stmt = stmt.where(TableRowValue.column_id.in_(column_ids))
+    await db.execute(stmt)
+
+    visited = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(TableRow.id, TableRow.data)
+            .where(TableRow.table_id == table_id, TableRow.id > last_id)
+            .order_by(TableRow.id)
+            .limit(INDEX_BATCH_SIZE)
+        )
+        chunk = result.all()
+        if not chunk:
+            break
+
+        entries: List[Dict[str, Any]] = []
+        for row_id, data in chunk:
+            entries.extend(build_entries(table_id, columns, row_id, data, column_ids))
+        await _insert_entries(db, entries)
+
+        if rebuild_search:
+            await _upsert_search_docs(db, [
+                {"row_id": row_id, "table_id": table_id, "content": search_content(columns, data)}
+                for row_id, data in chunk
+            ])
+
+        visited += len(chunk)
+        last_id = chunk[-1][0]
+
+    return visited
+
+
+def changed_columns(
+    old_columns: List[Dict[str, Any]],
+    new_columns: List[Dict[str, Any]],
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Diff two column lists for indexing purposes.
+
+    Returns:
+        Tuple of (removed_column_ids, reindex_column_ids) — reindex covers
+        columns that are new or whose type changed.
+    """
+    old_types = {col["id"]: col.get("type") for col in old_columns or []}
+    new_types = {col["id"]: col.get("type") for col in new_columns or []}
+
+    removed = set(old_types) - set(new_types)
+    reindex = {
+        col_id for col_id, col_type in new_types.items()
+        if old_types.get(col_id) != col_type
+    }
+    return removed, reindex
+
+
+def search_changed(
+    old_columns: List[Dict[str, Any]],
+    new_columns: List[Dict[str, Any]],
+) -> bool:
+    """Whether a schema change alters which columns feed the search documents."""
+    return _searchable_ids(old_columns) != _searchable_ids(new_columns)
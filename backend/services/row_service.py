@@ -3,17 +3,145 @@ Row Service - CRUD operations for table rows with filtering, sorting, and pagina
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete, text, case, literal_column
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy import select, func, delete, update, insert, case, literal, and_, or_, false
 from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta
 from fastapi import HTTPException, status, Depends
+import base64
+import json
 import logging
+import re
 
-from models import TableRow, TableDefinition
-from schemas.table import RowCreate, RowUpdate
-from database import get_async_db
+from models import TableRow, TableDefinition, TableRowValue, TableRowSearch, TableRowTombstone
+from schemas.table import RowCreate, RowUpdate, RowOperation, RowOperationAction, AggregateMetric, AggregateOp
+from config.settings import settings
+from database import get_async_db, get_async_read_db
+from services import row_index
+from services.table_service import bump_version, record_row_changes, row_limit
 
 logger = logging.getLogger(__name__)
 
+BULK_WRITE_BATCH = 500  # Rows per multi-row INSERT / CASE-keyed UPDATE statement
+
+NUMERIC_TYPES = ("number", "boolean")  # Column types aggregated on value_num
+ISO_DATE_PATTERN = "^[0-9]{4}-[0-9]{2}-[0-9]{2}"  # Date values min/max can order as text
+
+CHANGES_CURSOR = "_version"  # Cursor sort tag for delta sync pages (ordered by version, id)
+
+
+# =============================================================================
+# Keyset cursors
+# =============================================================================
+
+def _encode_cursor(sort_column: Optional[str], descending: bool, key: List[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    payload = json.dumps({"s": sort_column, "d": descending, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_column: Optional[str], descending: bool) -> List[Any]:
+    """Decode a cursor, checking it was issued for the same sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = list(payload["k"])
+        valid = payload.get("s") == sort_column and payload.get("d") == descending
+        # Default ordering keys on created_at, which travels as an ISO string
+        if valid and sort_column is None and key and isinstance(key[0], str):
+            key[0] = datetime.fromisoformat(key[0])
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or stale cursor for this sort order"
+        )
+    return key
+
+
+def _seek_condition(exprs: List[Any], key: List[Any], descending: bool):
+    """
+    Build the keyset predicate "sort key comes strictly after `key`".
+
+    Expands the tuple comparison into (a > x) OR (a = x AND b > y) ... so
+    NULLs can be handled: MySQL sorts NULL first ascending, last descending.
+    """
+    clauses = []
+    for i, (expr, value) in enumerate(zip(exprs, key)):
+        if value is None:
+            after = None if descending else expr.is_not(None)
+        elif descending:
+            after = or_(expr < value, expr.is_(None))
+        else:
+            after = expr > value
+        if after is None:
+            continue
+        prefix = [
+            e.is_(None) if v is None else e == v
+            for e, v in zip(exprs[:i], key[:i])
+        ]
+        clauses.append(and_(*prefix, after))
+    return or_(*clauses) if clauses else false()
+
+
+# =============================================================================
+# Full-text search
+# =============================================================================
+
+FULLTEXT_MIN_TOKEN = 3  # InnoDB innodb_ft_min_token_size default
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fulltext_query(query: str) -> Optional[str]:
+    """
+    Turn a user query into a BOOLEAN MODE query requiring every word as a prefix.
+
+    Returns None when the query has no words or a word too short for the
+    full-text index, so the caller can fall back to a substring match.
+    """
+    words = _WORD_RE.findall(query)
+    if not words or any(len(w) < FULLTEXT_MIN_TOKEN for w in words):
+        return None
+    return " ".join(f"+{w}*" for w in words)
+
+
+# =============================================================================
+# Row data
+# =============================================================================
+
+def remap_column_keys(data: dict, columns: list) -> dict:
+    """Remap column names to column IDs in row data.
+
+    The LLM sometimes uses column names (or fabricated col_<name> patterns)
+    instead of actual column IDs. This maps them back to real IDs so data
+    is stored correctly.
+    """
+    valid_ids = {col["id"] for col in columns}
+    # Build name → id lookup (case-insensitive)
+    name_to_id = {}
+    for col in columns:
+        name_to_id[col["name"].lower()] = col["id"]
+        # Also handle "col_<name>" fabrication pattern
+        name_to_id[f"col_{col['name'].lower()}"] = col["id"]
+        # Handle underscore-separated lowercase: "col_license_type" for "License Type"
+        slug = col["name"].lower().replace(" ", "_")
+        name_to_id[f"col_{slug}"] = col["id"]
+
+    remapped = {}
+    for key, val in data.items():
+        if key in valid_ids:
+            remapped[key] = val
+        elif key.lower() in name_to_id:
+            remapped[name_to_id[key.lower()]] = val
+        else:
+            # Unknown key — keep as-is rather than silently dropping
+            remapped[key] = val
+    return remapped
+
 
 class RowService:
     """Service for table row CRUD operations."""
@@ -21,13 +149,32 @@ class RowService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, table_id: int, data: RowCreate) -> TableRow:
+    async def _get_columns(self, table_id: int) -> List[Dict[str, Any]]:
+        """Load a table's column definitions (for callers that didn't pass them)."""
+        result = await self.db.execute(
+            select(TableDefinition.columns).where(TableDefinition.id == table_id)
+        )
+        return result.scalar() or []
+
+    async def create(
+        self,
+        table_id: int,
+        data: RowCreate,
+        columns: Optional[List[Dict[str, Any]]] = None,
+    ) -> TableRow:
         """Create a new row in a table."""
+        if columns is None:
+            columns = await self._get_columns(table_id)
+
         row = TableRow(
             table_id=table_id,
             data=data.data,
+            version=await bump_version(self.db, table_id),
         )
         self.db.add(row)
+        await self.db.flush()
+        await row_index.index_rows(self.db, table_id, columns, [(row.id, row.data)])
+        await record_row_changes(self.db, table_id, 1)
         await self.db.commit()
         await self.db.refresh(row)
         return row
@@ -48,6 +195,127 @@ class RowService:
             )
         return row
 
+    # -------------------------------------------------------------------------
+    # Ownership-scoped operations
+    #
+    # For endpoints that would otherwise load the table (TableService.get) and
+    # then touch the row: each folds the ownership check into a statement it
+    # has to run anyway — the version bump for writes, the row SELECT for
+    # reads — so the table definition is never fetched on its own. Missing or
+    # foreign tables raise 404 "Table not found" as TableService.get does.
+    # -------------------------------------------------------------------------
+
+    async def get_owned(self, table_id: int, user_id: int, row_id: int) -> TableRow:
+        """Get a row of a table the user owns, in one query."""
+        result = await self.db.execute(
+            select(TableDefinition.id, TableRow)
+            .outerjoin(TableRow, and_(TableRow.table_id == TableDefinition.id, TableRow.id == row_id))
+            .where(TableDefinition.id == table_id, TableDefinition.user_id == user_id)
+        )
+        found = result.first()
+        if found is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table not found"
+            )
+        if found[1] is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Row not found"
+            )
+        return found[1]
+
+    async def create_owned(
+        self,
+        table_id: int,
+        user_id: int,
+        data: Dict[str, Any],
+        remap_keys: bool = False,
+    ) -> TableRow:
+        """
+        Create a row in a table the user owns, enforcing the table's row limit.
+
+        Args:
+            remap_keys: Map column names in `data` to column IDs (see remap_column_keys)
+        """
+        version = await bump_version(self.db, table_id, user_id)
+        result = await self.db.execute(
+            select(TableDefinition.columns, TableDefinition.row_count, TableDefinition.max_rows)
+            .where(TableDefinition.id == table_id)
+        )
+        table = result.one()
+        if table.row_count >= row_limit(table):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Table has reached the maximum of {row_limit(table)} rows.",
+            )
+        if remap_keys:
+            data = remap_column_keys(data, table.columns)
+
+        row = TableRow(table_id=table_id, data=data, version=version)
+        self.db.add(row)
+        await self.db.flush()
+        await row_index.index_rows(self.db, table_id, table.columns, [(row.id, row.data)])
+        await record_row_changes(self.db, table_id, 1)
+        await self.db.commit()
+        return row
+
+    async def update_owned(
+        self,
+        table_id: int,
+        user_id: int,
+        row_id: int,
+        data: Dict[str, Any],
+        remap_keys: bool = False,
+    ) -> TableRow:
+        """Merge `data` into a row of a table the user owns."""
+        version = await bump_version(self.db, table_id, user_id)  # Before the read, so the merge can't race
+        result = await self.db.execute(
+            select(TableRow, TableDefinition.columns)
+            .join(TableDefinition, TableDefinition.id == TableRow.table_id)
+            .where(TableRow.id == row_id, TableRow.table_id == table_id)
+        )
+        found = result.first()
+        if found is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Row not found"
+            )
+        row, columns = found
+        if remap_keys:
+            data = remap_column_keys(data, columns)
+
+        current_data = dict(row.data) if row.data else {}
+        current_data.update(data)
+        row.data = current_data
+        row.version = version
+
+        await self.db.flush()
+        await row_index.index_rows(
+            self.db, table_id, columns, [(row.id, current_data)], column_ids=set(data)
+        )
+        await self.db.commit()
+        return row
+
+    async def delete_owned(self, table_id: int, user_id: int, row_ids: List[int], require_all: bool = False) -> int:
+        """
+        Delete rows of a table the user owns. Returns the number deleted.
+
+        Args:
+            require_all: Raise 404 (writing nothing) unless every row existed
+        """
+        version = await bump_version(self.db, table_id, user_id)
+        deleted = await self._delete_rows(table_id, row_ids, version)
+        if require_all and deleted < len(set(row_ids)):
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Row not found"
+            )
+        await record_row_changes(self.db, table_id, -deleted)
+        await self.db.commit()
+        return deleted
+
     async def list(
         self,
         table_id: int,
@@ -64,52 +332,62 @@ class RowService:
             table_id: Table to query
             offset: Pagination offset
             limit: Pagination limit
-            sort_column: Column ID to sort by (sorts via JSON_EXTRACT)
+            sort_column: Column ID to sort by (sorts via the typed row index)
             sort_direction: 'asc' or 'desc'
             filters: Dict of {column_id: {operator: value}} for filtering
 
         Returns:
             Tuple of (rows, total_count)
         """
+        rows, total, _ = await self.list_page(
+            table_id,
+            offset=offset,
+            limit=limit,
+            sort_column=sort_column,
+            sort_direction=sort_direction,
+            filters=filters,
+        )
+        return rows, total
+
+    async def list_page(
+        self,
+        table_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        sort_column: Optional[str] = None,
+        sort_direction: str = "asc",
+        filters: Optional[Dict[str, Any]] = None,
+        after: Optional[str] = None,
+    ) -> Tuple[List[TableRow], int, Optional[str]]:
+        """
+        List one page of rows, with a cursor for the next page.
+
+        With `after` (a cursor from a previous page) the page starts right
+        after that row using a keyset seek on the sort key plus row ID, and
+        `offset` is ignored. Deep pages then cost the same as the first one,
+        and rows inserted while paging don't shift the window.
+
+        Returns:
+            Tuple of (rows, total_count, next_cursor) — next_cursor is None
+            when this page is the last one.
+        """
+        descending = sort_direction == "desc"
+
         # Base query
         query = select(TableRow).where(TableRow.table_id == table_id)
         count_query = select(func.count(TableRow.id)).where(TableRow.table_id == table_id)
 
-        # Apply filters
+        # Apply filters (resolved against the typed row index, not the JSON blob)
         if filters:
             for col_id, filter_spec in filters.items():
                 if isinstance(filter_spec, dict):
-                    operator = filter_spec.get("operator", "equals")
-                    value = filter_spec.get("value")
-                    json_path = f"$.{col_id}"
-
-                    if operator == "equals":
-                        condition = func.json_extract(TableRow.data, json_path) == value
-                    elif operator == "contains":
-                        condition = func.json_extract(TableRow.data, json_path).like(f"%{value}%")
-                    elif operator == "gt":
-                        condition = func.json_extract(TableRow.data, json_path) > value
-                    elif operator == "lt":
-                        condition = func.json_extract(TableRow.data, json_path) < value
-                    elif operator == "gte":
-                        condition = func.json_extract(TableRow.data, json_path) >= value
-                    elif operator == "lte":
-                        condition = func.json_extract(TableRow.data, json_path) <= value
-                    elif operator == "is_true":
-                        condition = func.json_extract(TableRow.data, json_path) == True
-                    elif operator == "is_false":
-                        condition = func.json_extract(TableRow.data, json_path) == False
-                    elif operator == "is_empty":
-                        condition = (
-                            (func.json_extract(TableRow.data, json_path) == None) |
-                            (func.json_extract(TableRow.data, json_path) == "")
-                        )
-                    elif operator == "is_not_empty":
-                        condition = (
-                            (func.json_extract(TableRow.data, json_path) != None) &
-                            (func.json_extract(TableRow.data, json_path) != "")
-                        )
-                    else:
+                    condition = self._filter_condition(
+                        table_id,
+                        col_id,
+                        filter_spec.get("operator", "equals"),
+                        filter_spec.get("value"),
+                    )
+                    if condition is None:
                         continue
 
                     query = query.where(condition)
@@ -119,42 +397,376 @@ class RowService:
         total_result = await self.db.execute(count_query)
         total = total_result.scalar() or 0
 
-        # Apply sorting
+        # Apply sorting — the sort key always ends with TableRow.id so it is unique
         if sort_column:
-            json_path = f"$.{sort_column}"
-            sort_expr = func.json_extract(TableRow.data, json_path)
-            if sort_direction == "desc":
-                query = query.order_by(sort_expr.desc())
-            else:
-                query = query.order_by(sort_expr.asc())
+            sort_value = aliased(TableRowValue)
+            query = query.outerjoin(
+                sort_value,
+                and_(
+                    sort_value.row_id == TableRow.id,
+                    sort_value.column_id == sort_column,
+                ),
+            ).add_columns(sort_value.value_num, sort_value.value_text)
+            sort_exprs = [sort_value.value_num, sort_value.value_text, TableRow.id]
+        else:
+            # Default: newest first, backed by the (table_id, created_at, id) index
+            descending = True
+            query = query.add_columns(TableRow.created_at)
+            sort_exprs = [TableRow.created_at, TableRow.id]
+
+        if descending:
+            query = query.order_by(*[e.desc() for e in sort_exprs])
         else:
-            query = query.order_by(TableRow.created_at.desc())
+            query = query.order_by(*[e.asc() for e in sort_exprs])
 
         # Apply pagination
-        query = query.offset(offset).limit(limit)
+        if after:
+            key = _decode_cursor(after, sort_column, descending)
+            query = query.where(_seek_condition(sort_exprs, key, descending)).limit(limit)
+        else:
+            query = query.offset(offset).limit(limit)
 
         result = await self.db.execute(query)
-        rows = result.scalars().all()
+        records = result.all()
+        rows = [record[0] for record in records]
 
-        return rows, total
+        next_cursor = None
+        if len(records) == limit:
+            last = records[-1]
+            next_cursor = _encode_cursor(sort_column, descending, [*last[1:], last[0].id])
+
+        return rows, total, next_cursor
+
+    @staticmethod
+    def _filter_condition(table_id: int, col_id: str, operator: str, value: Any):
+        """
+        Build a WHERE condition for one column filter using the row index.
+
+        Returns None for unknown operators (the filter is ignored).
+        """
+        entries = select(TableRowValue.row_id).where(
+            TableRowValue.table_id == table_id,
+            TableRowValue.column_id == col_id,
+        )
+
+        # Empty values have no index entry
+        if operator == "is_empty":
+            return TableRow.id.not_in(entries)
+        if operator == "is_not_empty":
+            return TableRow.id.in_(entries)
+
+        num = row_index.as_number(value)
+        if operator == "equals":
+            if isinstance(value, (bool, int, float)):
+                condition = TableRowValue.value_num == num
+            elif num is not None:
+                condition = or_(TableRowValue.value_num == num, TableRowValue.value_text == str(value))
+            else:
+                condition = TableRowValue.value_text == str(value)
+        elif operator == "contains":
+            pattern = f"%{value}%"
+            # value_text holds a 255-char prefix and nothing for numbers, so
+            # those entries fall back to matching the full JSON value
+            needs_json = or_(
+                TableRowValue.value_num.is_not(None),
+                func.char_length(TableRowValue.value_text) >= row_index.INDEXED_TEXT_LENGTH,
+            )
+            json_value = func.json_unquote(func.json_extract(TableRow.data, f'$."{col_id}"'))
+            return or_(
+                TableRow.id.in_(entries.where(TableRowValue.value_text.like(pattern))),
+                and_(TableRow.id.in_(entries.where(needs_json)), json_value.like(pattern)),
+            )
+        elif operator in ("gt", "lt", "gte", "lte"):
+            target = TableRowValue.value_num if num is not None else TableRowValue.value_text
+            operand = num if num is not None else str(value)
+            condition = {
+                "gt": target > operand,
+                "lt": target < operand,
+                "gte": target >= operand,
+                "lte": target <= operand,
+            }[operator]
+        elif operator == "is_true":
+            condition = TableRowValue.value_num == 1
+        elif operator == "is_false":
+            condition = TableRowValue.value_num == 0
+        else:
+            return None
+
+        return TableRow.id.in_(entries.where(condition))
+
+    async def aggregate(
+        self,
+        table_id: int,
+        columns: List[Dict[str, Any]],
+        group_by: List[str],
+        metrics: List[AggregateMetric],
+        filters: Optional[Dict[str, Any]] = None,
+        sort_by: Optional[str] = None,
+        sort_direction: str = "asc",
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Group rows and compute aggregates in a single SQL statement.
+
+        Group and metric columns are outer-joined from the typed row index,
+        so numeric aggregates run on value_num with no JSON casting. Rows with
+        no value in a group column fall into a null group. value_text keeps
+        only a 255-char prefix, so values that fill it are also grouped on
+        the full JSON value; distinct long values never merge.
+
+        Returns:
+            Tuple of (groups, truncated) — each group is
+            {"key": {column_id: value}, "values": {metric_name: value}}.
+        """
+        col_types = {col["id"]: col.get("type", "text") for col in columns}
+        for col_id in [*group_by, *(m.column_id for m in metrics if m.column_id)]:
+            if col_id not in col_types:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown column: {col_id}",
+                )
+
+        joined: Dict[str, Any] = {}
+
+        def value_of(col_id: str):
+            if col_id not in joined:
+                joined[col_id] = aliased(TableRowValue)
+            return joined[col_id]
+
+        group_exprs = []
+        for col_id in group_by:
+            value = value_of(col_id)
+            full_text = case(
+                (
+                    func.char_length(value.value_text) >= row_index.INDEXED_TEXT_LENGTH,
+                    func.json_unquote(func.json_extract(TableRow.data, f'$."{col_id}"')),
+                ),
+                else_=None,
+            )
+            group_exprs.extend([value.value_num, value.value_text, full_text])
+
+        metric_exprs = {}
+        for metric in metrics:
+            name = metric.alias or (f"{metric.op.value}_{metric.column_id}" if metric.column_id else metric.op.value)
+            if name in metric_exprs:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Duplicate metric name: {name}",
+                )
+            metric_exprs[name] = self._metric_expr(
+                metric,
+                value_of(metric.column_id) if metric.column_id else None,
+                col_types.get(metric.column_id),
+            ).label(f"m{len(metric_exprs)}")
+
+        if sort_by is not None and sort_by not in metric_exprs:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown metric to sort by: {sort_by}",
+            )
+
+        query = select(*group_exprs, *metric_exprs.values()).select_from(TableRow)
+        for col_id, value in joined.items():
+            query = query.outerjoin(
+                value,
+                and_(value.row_id == TableRow.id, value.column_id == col_id),
+            )
+        query = query.where(TableRow.table_id == table_id)
+
+        for col_id, filter_spec in (filters or {}).items():
+            if isinstance(filter_spec, dict):
+                condition = self._filter_condition(
+                    table_id,
+                    col_id,
+                    filter_spec.get("operator", "equals"),
+                    filter_spec.get("value"),
+                )
+                if condition is not None:
+                    query = query.where(condition)
+
+        if group_exprs:
+            query = query.group_by(*group_exprs)
+        order = [metric_exprs[sort_by]] if sort_by else []
+        order.extend(group_exprs)
+        if order:
+            query = query.order_by(*[e.desc() if sort_direction == "desc" else e.asc() for e in order])
+
+        # Fetch one extra group to detect truncation
+        result = await self.db.execute(query.limit(limit + 1))
+        records = result.all()
+
+        groups = []
+        for record in records[:limit]:
+            key = {}
+            for i, col_id in enumerate(group_by):
+                value_num, value_text, full_text = record[3 * i:3 * i + 3]
+                key[col_id] = row_index.typed_value(value_num, full_text or value_text)
+            values = {}
+            for name, raw in zip(metric_exprs, record[len(group_exprs):]):
+                # Numeric results (incl. DECIMAL) come back as plain ints/floats
+                if raw is not None and not isinstance(raw, str):
+                    raw = row_index.typed_value(float(raw), None)
+                values[name] = raw
+            groups.append({"key": key, "values": values})
+
+        return groups, len(records) > limit
+
+    @staticmethod
+    def _metric_expr(metric: AggregateMetric, value: Any, col_type: Optional[str]):
+        """Build the SQL aggregate for one metric over a joined TableRowValue alias."""
+        op = metric.op
+        if value is None:
+            if op != AggregateOp.COUNT:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"'{op.value}' requires a column_id",
+                )
+            return func.count(TableRow.id)
+
+        if op == AggregateOp.COUNT:
+            return func.count(value.row_id)
+        if op == AggregateOp.DISTINCT:
+            return func.count(func.distinct(value.value_num)) + func.count(func.distinct(value.value_text))
+        if op in (AggregateOp.SUM, AggregateOp.AVG):
+            if col_type not in NUMERIC_TYPES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"'{op.value}' requires a number or boolean column, got {col_type}",
+                )
+            return func.sum(value.value_num) if op == AggregateOp.SUM else func.avg(value.value_num)
+
+        # min / max: numbers compare numerically, dates as ISO strings (other text in them is skipped)
+        if col_type in NUMERIC_TYPES:
+            target = value.value_num
+        elif col_type == "date":
+            target = case((value.value_text.regexp_match(ISO_DATE_PATTERN), value.value_text), else_=None)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"'{op.value}' requires a number, boolean or date column, got {col_type}",
+            )
+        return func.min(target) if op == AggregateOp.MIN else func.max(target)
+
+    async def changes(
+        self,
+        table_id: int,
+        since: int,
+        limit: int = 500,
+        after: Optional[str] = None,
+    ) -> Tuple[int, List[TableRow], List[int], Optional[str]]:
+        """
+        Rows created or updated, and rows deleted, since a table version.
+
+        Every write stamps its rows (or tombstones) with the table version it
+        bumped to, so this is a range scan on (table_id, version). Changed
+        rows are paged by (version, id), then tombstones the same way once
+        the rows run out; one cursor walks both. since=0 is a full resync:
+        every row is returned whatever its version (rows written before
+        versioning, and duplicated tables, sit at 0) and tombstones are
+        skipped, since the client has nothing to drop. All reads share one
+        transaction snapshot, so the returned version covers exactly what
+        was read. Tombstones are only kept for TOMBSTONE_RETENTION_DAYS; a
+        since older than the pruned ones gets 410 Gone, and the client
+        resyncs from 0.
+
+        Returns:
+            Tuple of (current_version, changed_rows, deleted_row_ids, next_cursor)
+        """
+        result = await self.db.execute(
+            select(TableDefinition.version, TableDefinition.tombstones_pruned_version)
+            .where(TableDefinition.id == table_id)
+        )
+        table = result.one_or_none()
+        version, pruned_version = (table.version, table.tombstones_pruned_version) if table else (0, 0)
+        if since > version:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"since={since} is ahead of the table's version ({version}); resync from 0",
+            )
+        if since and since < pruned_version:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Deletions before version {pruned_version} are no longer kept; resync from 0",
+            )
+
+        # Cursor key: [phase, version, id] — phase 0 pages rows, phase 1 tombstones
+        phase, key = 0, None
+        if after:
+            cursor_key = _decode_cursor(after, CHANGES_CURSOR, False)
+            if len(cursor_key) != 3 or cursor_key[0] not in (0, 1):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid or stale cursor for this sort order"
+                )
+            phase, key = cursor_key[0], cursor_key[1:]
+
+        rows: List[TableRow] = []
+        if phase == 0:
+            sort_exprs = [TableRow.version, TableRow.id]
+            query = select(TableRow).where(TableRow.table_id == table_id)
+            if since:
+                query = query.where(TableRow.version > since)
+            if key:
+                query = query.where(_seek_condition(sort_exprs, key, False))
+            result = await self.db.execute(query.order_by(*sort_exprs).limit(limit + 1))
+            rows = list(result.scalars().all())
+            if len(rows) > limit:
+                rows = rows[:limit]
+                return version, rows, [], _encode_cursor(CHANGES_CURSOR, False, [0, rows[-1].version, rows[-1].id])
+            key = None
+
+        deleted: List[int] = []
+        next_cursor = None
+        if since:
+            sort_exprs = [TableRowTombstone.version, TableRowTombstone.id]
+            query = select(TableRowTombstone.row_id, *sort_exprs).where(
+                TableRowTombstone.table_id == table_id, TableRowTombstone.version > since
+            )
+            if key:
+                query = query.where(_seek_condition(sort_exprs, key, False))
+            result = await self.db.execute(query.order_by(*sort_exprs).limit(limit + 1))
+            tombstones = result.all()
+            if len(tombstones) > limit:
+                tombstones = tombstones[:limit]
+                last = tombstones[-1]
+                next_cursor = _encode_cursor(CHANGES_CURSOR, False, [1, last.version, last.id])
+            deleted = [t.row_id for t in tombstones]
 
-    async def update(self, table_id: int, row_id: int, data: RowUpdate) -> TableRow:
+        return version, rows, deleted, next_cursor
+
+    async def update(
+        self,
+        table_id: int,
+        row_id: int,
+        data: RowUpdate,
+        columns: Optional[List[Dict[str, Any]]] = None,
+    ) -> TableRow:
         """Update a row's data (merge with existing)."""
+        version = await bump_version(self.db, table_id)  # Before the read, so the merge can't race
         row = await self.get(table_id, row_id)
+        if columns is None:
+            columns = await self._get_columns(table_id)
 
         # Merge new data into existing
         current_data = dict(row.data) if row.data else {}
         current_data.update(data.data)
         row.data = current_data
+        row.version = version
 
+        await self.db.flush()
+        await row_index.index_rows(
+            self.db, table_id, columns, [(row.id, current_data)], column_ids=set(data.data)
+        )
         await self.db.commit()
         await self.db.refresh(row)
         return row
 
     async def delete(self, table_id: int, row_id: int) -> bool:
         """Delete a single row."""
-        row = await self.get(table_id, row_id)
-        await self.db.delete(row)
+        await self.get(table_id, row_id)
+        version = await bump_version(self.db, table_id)
+        deleted = await self._delete_rows(table_id, [row_id], version)
+        await record_row_changes(self.db, table_id, -deleted)
         await self.db.commit()
         return True
 
@@ -169,15 +781,225 @@ class RowService:
 
     async def bulk_delete(self, table_id: int, row_ids: List[int]) -> int:
         """Delete multiple rows. Returns count of deleted rows."""
+        version = await bump_version(self.db, table_id)
+        deleted = await self._delete_rows(table_id, row_ids, version)
+        await record_row_changes(self.db, table_id, -deleted)
+        await self.db.commit()
+        return deleted
+
+    async def _delete_rows(self, table_id: int, row_ids: List[int], version: int) -> int:
+        """
+        Delete rows and their index entries, leaving a tombstone for each row
+        that existed. Does not commit.
+
+        Returns:
+            Number of rows deleted
+        """
+        if not row_ids:
+            return 0
+        targets = select(
+            literal(table_id), TableRow.id, literal(version), literal(datetime.utcnow())
+        ).where(TableRow.table_id == table_id, TableRow.id.in_(row_ids))
+        await self.db.execute(
+            insert(TableRowTombstone).from_select(
+                ["table_id", "row_id", "version", "deleted_at"], targets
+            )
+        )
+        await self._prune_tombstones(table_id)
+        # Explicit, since a partitioned table_rows has no cascading foreign keys
+        for model in (TableRowValue, TableRowSearch):
+            await self.db.execute(
+                delete(model).where(model.table_id == table_id, model.row_id.in_(row_ids))
+            )
         result = await self.db.execute(
             delete(TableRow).where(
                 TableRow.table_id == table_id,
                 TableRow.id.in_(row_ids),
             )
         )
-        await self.db.commit()
         return result.rowcount
 
+    async def _prune_tombstones(self, table_id: int) -> None:
+        """
+        Drop tombstones older than TOMBSTONE_RETENTION_DAYS. Does not commit.
+
+        Runs inside a delete, under its version lock. The newest pruned
+        version is kept on the table, so changes() can refuse syncs that
+        would need the dropped tombstones.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        result = await self.db.execute(
+            select(func.max(TableRowTombstone.version)).where(
+                TableRowTombstone.table_id == table_id,
+                TableRowTombstone.deleted_at < cutoff,
+            )
+        )
+        pruned_version = result.scalar()
+        if pruned_version is None:
+            return
+        await self.db.execute(
+            delete(TableRowTombstone).where(
+                TableRowTombstone.table_id == table_id,
+                TableRowTombstone.version <= pruned_version,
+            )
+        )
+        await self.db.execute(
+            update(TableDefinition)
+            .where(TableDefinition.id == table_id)
+            .values(tombstones_pruned_version=pruned_version, updated_at=TableDefinition.updated_at)
+        )
+
+    async def bulk_apply(
+        self,
+        table_id: int,
+        operations: List[RowOperation],
+        columns: List[Dict[str, Any]],
+    ) -> Tuple[List[int], int, int]:
+        """
+        Apply mixed create/update/delete operations in one transaction.
+
+        Writes are set-based: one DELETE, one SELECT of update targets, one
+        CASE-keyed UPDATE and one multi-row INSERT per BULK_WRITE_BATCH
+        operations, followed by batched index writes and a single commit.
+        Repeated updates to the same row are merged in request order. The
+        row limit is checked on the net change after the deletes, so it
+        counts only rows that existed.
+
+        Returns:
+            Tuple of (created_ids in request order, updated_count, deleted_count)
+        """
+        creates: List[Dict[str, Any]] = []
+        updates: Dict[int, Dict[str, Any]] = {}
+        delete_ids: set = set()
+
+        for i, op in enumerate(operations):
+            if op.action == RowOperationAction.CREATE:
+                if op.data is None:
+                    raise HTTPException(status_code=400, detail=f"Operation {i}: create requires data")
+                creates.append(op.data)
+            elif op.row_id is None:
+                raise HTTPException(status_code=400, detail=f"Operation {i}: {op.action.value} requires row_id")
+            elif op.action == RowOperationAction.UPDATE:
+                if op.data is None:
+                    raise HTTPException(status_code=400, detail=f"Operation {i}: update requires data")
+                updates.setdefault(op.row_id, {}).update(op.data)
+            else:
+                delete_ids.add(op.row_id)
+
+        # Updates to rows deleted in the same request are moot
+        for row_id in delete_ids:
+            updates.pop(row_id, None)
+
+        # Taking the version locks the table's writes, so update targets can't change under us
+        version = await bump_version(self.db, table_id)
+
+        # Load update targets first so a bad row_id fails before anything is written
+        merged: Dict[int, Dict[str, Any]] = {}
+        if updates:
+            result = await self.db.execute(
+                select(TableRow.id, TableRow.data).where(
+                    TableRow.table_id == table_id,
+                    TableRow.id.in_(list(updates)),
+                )
+            )
+            current = {row_id: data for row_id, data in result.all()}
+            missing = sorted(set(updates) - set(current))
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Rows not found: {', '.join(str(r) for r in missing)}"
+                )
+            for row_id, changes in updates.items():
+                data = dict(current[row_id] or {})
+                data.update(changes)
+                merged[row_id] = data
+
+        deleted = await self._delete_rows(table_id, list(delete_ids), version)
+
+        # Under the version lock, and net of rows that actually existed to delete
+        if creates:
+            result = await self.db.execute(
+                select(TableDefinition.row_count, TableDefinition.max_rows)
+                .where(TableDefinition.id == table_id)
+            )
+            table = result.one()
+            if table.row_count + len(creates) - deleted > row_limit(table):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Table would exceed the maximum of {row_limit(table)} rows.",
+                )
+
+        update_ids = list(merged)
+        for start in range(0, len(update_ids), BULK_WRITE_BATCH):
+            chunk = update_ids[start:start + BULK_WRITE_BATCH]
+            new_data = case(
+                {row_id: literal(merged[row_id], TableRow.data.type) for row_id in chunk},
+                value=TableRow.id,
+            )
+            await self.db.execute(
+                update(TableRow)
+                .where(TableRow.table_id == table_id, TableRow.id.in_(chunk))
+                .values(data=new_data, version=version)
+                .execution_options(synchronize_session=False)
+            )
+
+        created_ids = await self.insert_many(table_id, creates, version)
+
+        await row_index.index_rows(
+            self.db,
+            table_id,
+            columns,
+            [*zip(created_ids, creates), *merged.items()],
+        )
+        await record_row_changes(self.db, table_id, len(created_ids) - deleted)
+        await self.db.commit()
+
+        return created_ids, len(merged), deleted
+
+    async def insert_many(self, table_id: int, rows_data: List[Dict[str, Any]], version: int) -> List[int]:
+        """
+        Insert rows with multi-row core INSERTs, without indexing or committing.
+
+        Rows are stamped with `version`, from bump_version at the start of the write.
+
+        Returns:
+            The new row IDs, in input order
+        """
+        created_ids: List[int] = []
+        now = datetime.utcnow()
+        for start in range(0, len(rows_data), BULK_WRITE_BATCH):
+            chunk = rows_data[start:start + BULK_WRITE_BATCH]
+            result = await self.db.execute(
+                insert(TableRow.__table__).values([
+                    {"table_id": table_id, "data": data, "version": version, "created_at": now, "updated_at": now}
+                    for data in chunk
+                ])
+            )
+            created_ids.extend(await self._inserted_ids(table_id, result.lastrowid, len(chunk)))
+        return created_ids
+
+    async def _inserted_ids(self, table_id: int, first_id: int, count: int) -> List[int]:
+        """
+        IDs assigned by a single multi-row INSERT.
+
+        InnoDB allocates a "simple insert" (row count known up front) one
+        consecutive block of auto-increment values, and LAST_INSERT_ID() is
+        the first of them. Verified with a range count so a server configured
+        otherwise fails loudly instead of returning wrong IDs.
+        """
+        ids = list(range(first_id, first_id + count))
+        result = await self.db.execute(
+            select(func.count(TableRow.id)).where(
+                TableRow.table_id == table_id,
+                TableRow.id.between(ids[0], ids[-1]),
+            )
+        )
+        if result.scalar() != count:
+            raise RuntimeError(
+                f"Bulk insert into table {table_id} did not receive consecutive row IDs"
+            )
+        return ids
+
     async def search(
         self,
         table_id: int,
@@ -186,7 +1008,12 @@ class RowService:
         limit: int = 50,
     ) -> List[TableRow]:
         """
-        Search across text columns for matching rows.
+        Search across text columns for matching rows, best matches first.
+
+        Uses the FULLTEXT index on the row search documents: every word in the
+        query must match the start of a word in the row. Queries with words
+        shorter than the full-text minimum token size fall back to a substring
+        match on the same documents.
 
         Args:
             table_id: Table to search
@@ -194,33 +1021,27 @@ class RowService:
             columns: Column definitions from the table schema
             limit: Max results to return
         """
-        # Find text columns to search
-        text_col_ids = [
-            col["id"] for col in columns
-            if col.get("type") in ("text", "select")
-        ]
-
-        if not text_col_ids:
+        if not any(col.get("type") in row_index.SEARCHABLE_TYPES for col in columns):
             return []
 
-        # Build OR conditions for each text column
-        conditions = []
-        for col_id in text_col_ids:
-            json_path = f"$.{col_id}"
-            conditions.append(
-                func.json_extract(TableRow.data, json_path).like(f"%{query}%")
-            )
-
-        from sqlalchemy import or_
         stmt = (
             select(TableRow)
+            .join(TableRowSearch, TableRowSearch.row_id == TableRow.id)
             .where(
+                TableRowSearch.table_id == table_id,
                 TableRow.table_id == table_id,
-                or_(*conditions),
             )
             .limit(limit)
         )
 
+        boolean_query = _fulltext_query(query)
+        if boolean_query:
+            score = match(TableRowSearch.content, against=boolean_query).in_boolean_mode()
+            stmt = stmt.where(score > 0).order_by(score.desc(), TableRow.id)
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            stmt = stmt.where(TableRowSearch.content.like(f"%{escaped}%")).order_by(TableRow.id)
+
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
@@ -228,3 +1049,8 @@ class RowService:
 async def get_row_service(db: AsyncSession = Depends(get_async_db)) -> RowService:
     """Dependency injection provider."""
     return RowService(db)
+
+
+async def get_row_read_service(db: AsyncSession = Depends(get_async_read_db)) -> RowService:
+    """Dependency injection provider for read-only endpoints (replica when configured)."""
+    return RowService(db)
@@ -0,0 +1,220 @@
+"""
+Schema Migration - rewrites stored row data when a table's columns change.
+
+TableService.update used to swap the columns JSON only, so removed columns
+left dead keys in every row's data and type changes left values in their old
+representation. migrate_rows brings the rows in line, walking the table in
+id-ordered chunks so it never holds more than MIGRATION_BATCH_SIZE rows:
+
+- removed columns only: one UPDATE ... JSON_REMOVE per chunk, in SQL
+- type changes: each chunk is loaded and the changed columns are converted
+  with the CSV import coercers (formats inferred from the first chunk), then
+  written back with one CASE-keyed UPDATE
+
+Rewritten rows are stamped with the write's table version so delta sync
+picks them up. Nothing here commits — callers own the transaction.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select, update, func, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import TableRow
+from services import row_index
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 1000  # Rows per chunk
+
+TEXT_TYPES = ("text", "select", "url")
+
+
+@dataclass
+class MigrationProgress:
+    """Progress of a row migration."""
+    rows_done: int          # Rows visited so far
+    rows_changed: int       # Rows rewritten so far
+    total_rows: int         # Rows in the table when the migration started
+    done: bool = False      # Set on the final update
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the table visited, 0.0 to 1.0."""
+        if self.done:
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(self.rows_done / self.total_rows, 1.0)
+
+
+def retyped_columns(
+    old_columns: List[Dict[str, Any]],
+    new_columns: List[Dict[str, Any]],
+) -> Dict[str, str]:
+    """Existing columns whose type changed, as {column_id: new_type}."""
+    old_types = {col["id"]: col.get("type", "text") for col in old_columns or []}
+    return {
+        col["id"]: col.get("type", "text")
+        for col in new_columns or []
+        if col["id"] in old_types and old_types[col["id"]] != col.get("type", "text")
+    }
+
+
+def _as_text(value: Any) -> str:
+    """A stored value as a string (the form the import coercers take)."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _converter(col_type: str, sample: List[str]) -> Callable[[Any], Any]:
+    """
+    Build the function converting one stored value to `col_type`.
+
+    Values that don't fit the new type are kept as they are (the import
+    coercers' convention), so a type change never loses data.
+    """
+    from services.import_export_service import compile_coercer, infer_format
+
+    if col_type in TEXT_TYPES:
+        return lambda value: value if isinstance(value, str) else _as_text(value)
+
+    if col_type == "boolean":
+        def convert_boolean(value: Any) -> Any:
+            if isinstance(value, bool):
+                return value
+            num, _ = row_index.index_value(value, "boolean")
+            return value if num is None else num != 0.0
+
+        return convert_boolean
+
+    coerce = compile_coercer(infer_format(sample, col_type))
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and col_type == "number":
+            return value
+        return coerce(_as_text(value))
+
+    return convert
+
+
+async def _next_chunk(db: AsyncSession, table_id: int, last_id: int, with_data: bool) -> List[Any]:
+    columns = (TableRow.id, TableRow.data) if with_data else (TableRow.id,)
+    result = await db.execute(
+        select(*columns)
+        .where(TableRow.table_id == table_id, TableRow.id > last_id)
+        .order_by(TableRow.id)
+        .limit(MIGRATION_BATCH_SIZE)
+    )
+    return result.all()
+
+
+async def migrate_rows(
+    db: AsyncSession,
+    table_id: int,
+    removed: Set[str],
+    retyped: Dict[str, str],
+    version: int,
+    total_rows: int = 0,
+) -> AsyncIterator[MigrationProgress]:
+    """
+    Rewrite a table's rows for removed and retyped columns.
+
+    Args:
+        db: Database session (not committed)
+        table_id: Table being changed
+        removed: Column IDs to strip from every row
+        retyped: {column_id: new_type} for columns whose type changed
+        version: Table version of this write, stamped on rewritten rows
+        total_rows: Row count, for progress reporting
+
+    Yields:
+        MigrationProgress after each chunk; the last one has done=True
+    """
+    visited = changed = 0
+    if not removed and not retyped:
+        yield MigrationProgress(visited, changed, total_rows, done=True)
+        return
+
+    paths = [f'$."{col_id}"' for col_id in sorted(removed)]
+    converters: Optional[Dict[str, Callable[[Any], Any]]] = None
+    last_id = 0
+    while True:
+        chunk = await _next_chunk(db, table_id, last_id, with_data=bool(retyped))
+        if not chunk:
+            break
+        first_id, last_id = chunk[0][0], chunk[-1][0]
+
+        if not retyped:
+            # Dead keys only: strip them in SQL without loading the rows
+            result = await db.execute(
+                update(TableRow)
+                .where(
+                    TableRow.table_id == table_id,
+                    TableRow.id.between(first_id, last_id),
+                    func.json_contains_path(TableRow.data, "one", *paths),
+                )
+                .values(data=func.json_remove(TableRow.data, *paths), version=version)
+                .execution_options(synchronize_session=False)
+            )
+            changed += result.rowcount
+        else:
+            if converters is None:
+                # Infer value formats (date order, number locale) from the first chunk
+                converters = {
+                    col_id: _converter(col_type, [
+                        _as_text(data[col_id]).strip() for _, data in chunk
+                        if data and data.get(col_id) not in (None, "")
+                    ])
+                    for col_id, col_type in retyped.items()
+                }
+
+            rewritten: Dict[int, Dict[str, Any]] = {}
+            for row_id, data in chunk:
+                data = data or {}
+                new_data = {key: value for key, value in data.items() if key not in removed}
+                dirty = len(new_data) != len(data)
+                for col_id, convert in converters.items():
+                    value = new_data.get(col_id)
+                    if value is None or value == "":
+                        continue
+                    converted = convert(value)
+                    # Compare types too: True == 1, but the stored JSON differs
+                    if converted == value and type(converted) is type(value):
+                        continue
+                    dirty = True
+                    if converted is None:
+                        new_data.pop(col_id)
+                    else:
+                        new_data[col_id] = converted
+                if dirty:
+                    rewritten[row_id] = new_data
+
+            if rewritten:
+                await db.execute(
+                    update(TableRow)
+                    .where(TableRow.table_id == table_id, TableRow.id.in_(list(rewritten)))
+                    .values(
+                        data=case(
+                            {row_id: literal(data, TableRow.data.type) for row_id, data in rewritten.items()},
+                            value=TableRow.id,
+                        ),
+                        version=version,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            changed += len(rewritten)
+
+        visited += len(chunk)
+        yield MigrationProgress(visited, changed, total_rows)
+
+    logger.info(f"Migrated table {table_id}: {changed}/{visited} rows rewritten")
+    yield MigrationProgress(visited, changed, total_rows, done=True)
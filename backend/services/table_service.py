@@ -3,18 +3,98 @@ Table Definition Service - CRUD operations for table schemas.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
-from typing import Optional, List
+from sqlalchemy import select, func, delete, update, insert, case, literal
+from typing import AsyncIterator, Dict, Optional, List
 from fastapi import HTTPException, status, Depends
 import logging
+import uuid
 
-from models import TableDefinition, TableRow, User
+from models import TableDefinition, TableRow, TableRowValue, TableRowSearch, TableRowTombstone, User
 from schemas.table import TableCreate, TableUpdate, ColumnDefinition
-from database import get_async_db
+from database import get_async_db, get_async_read_db
+from config import settings
+from services import row_index, schema_migration
+from services.schema_migration import MigrationProgress
 
 logger = logging.getLogger(__name__)
 
 
+def row_limit(table: TableDefinition) -> int:
+    """A table's row cap: its own max_rows, else the configured default."""
+    return table.max_rows or settings.MAX_ROWS_PER_TABLE
+
+
+async def delete_table_data(db: AsyncSession, table_ids: List[int]) -> None:
+    """
+    Delete tables' rows and everything hanging off them, set-based. Does not commit.
+
+    Explicit rather than left to ON DELETE CASCADE, which loses its foreign
+    keys when table_rows is partitioned (migrations/partition_table_rows.sql),
+    and which the ORM would otherwise emulate by loading every row.
+    """
+    if not table_ids:
+        return
+    for model in (TableRowValue, TableRowSearch, TableRowTombstone, TableRow):
+        await db.execute(delete(model).where(model.table_id.in_(table_ids)))
+
+
+def generate_column_id() -> str:
+    """Generate a stable column ID."""
+    return f"col_{uuid.uuid4().hex[:8]}"
+
+
+async def bump_version(db: AsyncSession, table_id: int, user_id: Optional[int] = None) -> int:
+    """
+    Start a write to a table: increment its version and return the new value.
+
+    Every row or schema write calls this first, in its own transaction, and
+    stamps the rows it writes with the returned version (backing ETags and
+    delta sync). The increment locks the table's definition row until
+    commit, so writes to one table commit in version order. Does not commit.
+
+    The new version comes back in the UPDATE's own result through
+    LAST_INSERT_ID(expr), so this is a single round trip. With user_id the
+    same statement checks ownership, raising 404 for someone else's table.
+    """
+    stmt = update(TableDefinition).where(TableDefinition.id == table_id)
+    if user_id is not None:
+        stmt = stmt.where(TableDefinition.user_id == user_id)
+    result = await db.execute(
+        stmt.values(
+            version=func.last_insert_id(TableDefinition.version + 1),
+            updated_at=TableDefinition.updated_at,
+        ).execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        if user_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table not found"
+            )
+        return 0
+    return result.lastrowid
+
+
+async def record_row_changes(db: AsyncSession, table_id: int, row_delta: int) -> None:
+    """
+    Apply a row insert/delete to the table's denormalized row_count.
+
+    Runs as an atomic in-database increment in the caller's transaction, so
+    concurrent writers can't lose updates. Does not commit. updated_at is
+    left alone — it tracks schema edits, not row activity.
+    """
+    if not row_delta:
+        return
+    await db.execute(
+        update(TableDefinition)
+        .where(TableDefinition.id == table_id)
+        .values(
+            row_count=TableDefinition.row_count + row_delta,
+            updated_at=TableDefinition.updated_at,
+        )
+    )
+
+
 class TableService:
     """Service for table definition CRUD operations."""
 
@@ -29,6 +109,9 @@ class TableService:
             name=data.name,
             description=data.description,
             columns=columns_json,
+            row_count=0,
+            column_count=len(columns_json),
+            version=0,
         )
         self.db.add(table)
         await self.db.commit()
@@ -51,63 +134,237 @@ class TableService:
             )
         return table
 
+    async def get_version(self, table_id: int, user_id: int) -> int:
+        """Get a table's write version, verifying ownership (no columns JSON loaded)."""
+        result = await self.db.execute(
+            select(TableDefinition.version).where(
+                TableDefinition.id == table_id,
+                TableDefinition.user_id == user_id,
+            )
+        )
+        version = result.scalar()
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table not found"
+            )
+        return version
+
     async def list(self, user_id: int) -> List[dict]:
         """List all tables for a user with row counts."""
-        # Get tables
+        # Counts are denormalized, so this never touches table_rows or the columns JSON
         result = await self.db.execute(
-            select(TableDefinition)
+            select(
+                TableDefinition.id,
+                TableDefinition.name,
+                TableDefinition.description,
+                TableDefinition.column_count,
+                TableDefinition.row_count,
+                TableDefinition.created_at,
+                TableDefinition.updated_at,
+            )
             .where(TableDefinition.user_id == user_id)
             .order_by(TableDefinition.updated_at.desc())
         )
-        tables = result.scalars().all()
-
-        # Get row counts per table
-        count_result = await self.db.execute(
-            select(TableRow.table_id, func.count(TableRow.id).label("row_count"))
-            .where(TableRow.table_id.in_([t.id for t in tables]))
-            .group_by(TableRow.table_id)
-        )
-        row_counts = {row.table_id: row.row_count for row in count_result}
 
         return [
             {
                 "id": t.id,
                 "name": t.name,
                 "description": t.description,
-                "column_count": len(t.columns) if t.columns else 0,
-                "row_count": row_counts.get(t.id, 0),
+                "column_count": t.column_count,
+                "row_count": t.row_count,
                 "created_at": t.created_at,
                 "updated_at": t.updated_at,
             }
-            for t in tables
+            for t in result.all()
         ]
 
     async def update(self, table_id: int, user_id: int, data: TableUpdate) -> TableDefinition:
-        """Update a table definition."""
+        """Update a table definition, migrating existing rows to a changed schema."""
+        async for _ in self.update_stream(table_id, user_id, data):
+            pass
+        table = await self.get(table_id, user_id)
+        await self.db.refresh(table)
+        return table
+
+    async def update_stream(
+        self,
+        table_id: int,
+        user_id: int,
+        data: TableUpdate,
+    ) -> AsyncIterator[MigrationProgress]:
+        """
+        Update a table definition, yielding progress while rows are migrated.
+
+        When columns are removed or change type, the stored row data is
+        rewritten in chunks (see schema_migration) and the row indexes are
+        rebuilt for the affected columns, all in one transaction.
+
+        Yields:
+            MigrationProgress per chunk of rows; the last one (done=True)
+            comes after the commit
+        """
         table = await self.get(table_id, user_id)
+        version = await bump_version(self.db, table.id)
 
         if data.name is not None:
             table.name = data.name
         if data.description is not None:
             table.description = data.description
+
+        final = MigrationProgress(0, 0, table.row_count, done=True)
         if data.columns is not None:
-            table.columns = [col.model_dump() for col in data.columns]
+            new_columns = [col.model_dump() for col in data.columns]
+            removed, reindex = row_index.changed_columns(table.columns, new_columns)
+            retyped = schema_migration.retyped_columns(table.columns, new_columns)
+            rebuild_search = row_index.search_changed(table.columns, new_columns)
+
+            # Rewrite row data first, so the indexes are rebuilt from converted values
+            async for progress in schema_migration.migrate_rows(
+                self.db, table.id, removed, retyped, version, table.row_count
+            ):
+                if progress.done:
+                    final = progress
+                else:
+                    yield progress
+
+            table.columns = new_columns
+            table.column_count = len(new_columns)
+
+            # Keep the row indexes in step with the declared columns
+            await row_index.drop_columns(self.db, table.id, removed)
+            await row_index.reindex_columns(
+                self.db, table.id, new_columns, reindex, rebuild_search=rebuild_search
+            )
 
         await self.db.commit()
-        await self.db.refresh(table)
-        return table
+        yield final
+
+    async def duplicate(
+        self,
+        table_id: int,
+        user_id: int,
+        name: Optional[str] = None,
+        remap_column_ids: bool = False,
+    ) -> TableDefinition:
+        """
+        Copy a table's definition, rows and row indexes inside the database.
+
+        Rows, index entries and search documents are each copied with one
+        INSERT ... SELECT, so no row data passes through Python. Copied rows
+        are paired with their sources by position (both sides numbered in id
+        order), which holds because one INSERT assigns increasing IDs in
+        select order.
+
+        Args:
+            table_id: Table to copy
+            user_id: Owner (must own the source; owns the copy)
+            name: Name for the copy (default: "<name> (copy)")
+            remap_column_ids: Give the copy fresh column IDs, rewriting row data keys
+        """
+        # Hold off writers to the source (bump_version) until the copy commits
+        await self.db.execute(
+            select(TableDefinition.id).where(TableDefinition.id == table_id).with_for_update(read=True)
+        )
+        source = await self.get(table_id, user_id)
+
+        columns = [dict(col) for col in source.columns or []]
+        id_map: Dict[str, str] = {}
+        if remap_column_ids:
+            for col in columns:
+                id_map[col["id"]] = col["id"] = generate_column_id()
+
+        copy = TableDefinition(
+            user_id=user_id,
+            name=name or f"{source.name} (copy)"[:255],
+            description=source.description,
+            columns=columns,
+            row_count=source.row_count,
+            column_count=len(columns),
+            max_rows=source.max_rows,  # The copy holds as many rows as the source
+            version=1,  # The copy is its first write, so delta sync sees its rows
+        )
+        self.db.add(copy)
+        await self.db.flush()
+
+        data = TableRow.data
+        column_id = TableRowValue.column_id
+        if id_map:
+            # Drop the old keys, then merge in the new ones (MERGE_PATCH skips the nulls of absent keys)
+            data = func.json_merge_patch(
+                func.json_remove(TableRow.data, *[f'$."{old}"' for old in id_map]),
+                func.json_object(*[
+                    arg for old, new in id_map.items()
+                    for arg in (new, func.json_extract(TableRow.data, f'$."{old}"'))
+                ]),
+            )
+            column_id = case(id_map, value=TableRowValue.column_id, else_=TableRowValue.column_id)
+
+        await self.db.execute(
+            insert(TableRow).from_select(
+                ["table_id", "data", "version", "created_at", "updated_at"],
+                select(literal(copy.id), data, literal(1), TableRow.created_at, TableRow.updated_at)
+                .where(TableRow.table_id == source.id)
+                .order_by(TableRow.id),
+            )
+        )
+
+        def numbered(tid: int):
+            return (
+                select(TableRow.id, func.row_number().over(order_by=TableRow.id).label("n"))
+                .where(TableRow.table_id == tid)
+                .subquery()
+            )
+
+        old_rows, new_rows = numbered(source.id), numbered(copy.id)
+        pairs = old_rows.join(new_rows, old_rows.c.n == new_rows.c.n)
+        await self.db.execute(
+            insert(TableRowValue).from_select(
+                ["row_id", "column_id", "table_id", "value_num", "value_text"],
+                select(new_rows.c.id, column_id, literal(copy.id), TableRowValue.value_num, TableRowValue.value_text)
+                .select_from(pairs.join(TableRowValue, TableRowValue.row_id == old_rows.c.id)),
+            )
+        )
+        await self.db.execute(
+            insert(TableRowSearch).from_select(
+                ["row_id", "table_id", "content"],
+                select(new_rows.c.id, literal(copy.id), TableRowSearch.content)
+                .select_from(pairs.join(TableRowSearch, TableRowSearch.row_id == old_rows.c.id)),
+            )
+        )
+
+        await self.db.commit()
+        await self.db.refresh(copy)
+        return copy
 
     async def delete(self, table_id: int, user_id: int) -> bool:
         """Delete a table and all its rows (cascade)."""
         table = await self.get(table_id, user_id)
+        await delete_table_data(self.db, [table.id])
         await self.db.delete(table)
         await self.db.commit()
         return True
 
+    async def set_row_limit(self, table_id: int, max_rows: Optional[int]) -> TableDefinition:
+        """Set a table's row cap (None restores the default). No ownership check — admin only."""
+        await bump_version(self.db, table_id)  # max_rows is served behind the version ETag
+        result = await self.db.execute(select(TableDefinition).where(TableDefinition.id == table_id))
+        table = result.scalars().first()
+        if not table:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Table not found"
+            )
+        table.max_rows = max_rows
+        await self.db.commit()
+        await self.db.refresh(table)
+        return table
+
     async def get_row_count(self, table_id: int) -> int:
-        """Get the number of rows in a table."""
+        """Get the number of rows in a table (denormalized, O(1))."""
         result = await self.db.execute(
-            select(func.count(TableRow.id)).where(TableRow.table_id == table_id)
+            select(TableDefinition.row_count).where(TableDefinition.id == table_id)
         )
         return result.scalar() or 0
 
@@ -115,3 +372,8 @@ class TableService:
 async def get_table_service(db: AsyncSession = Depends(get_async_db)) -> TableService:
     """Dependency injection provider."""
     return TableService(db)
+
+
+async def get_table_read_service(db: AsyncSession = Depends(get_async_read_db)) -> TableService:
+    """Dependency injection provider for read-only endpoints (replica when configured)."""
+    return TableService(db)
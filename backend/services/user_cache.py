@@ -0,0 +1,79 @@
+"""
+User Cache - in-process cache of the user fields validate_token needs.
+
+Every authenticated request (including polled and SSE endpoints) used to
+look its user up by email. Entries here are keyed by user_id, bounded
+(LRU, AUTH_USER_CACHE_SIZE) and expire after AUTH_USER_CACHE_TTL_SECONDS,
+so a cache hit costs only the JWT decode.
+
+Writes that change a user's access (role, active flag, organization,
+profile, deletion) call invalidate() after they commit. Each worker has its
+own cache: set_broadcaster() installs a hook (e.g. a pub/sub publish) that
+invalidate() calls so other workers can drop the entry too — they apply it
+with invalidate(user_id, broadcast=False). Without one, other workers serve
+the old fields for at most the TTL.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+from models import User
+
+logger = logging.getLogger(__name__)
+
+# Scalar User columns held in the cache (never the password or one-time tokens)
+CACHED_FIELDS = (
+    "user_id", "org_id", "email", "full_name", "job_title", "is_active",
+    "is_guest", "role", "registration_date", "created_at", "updated_at",
+)
+
+_entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_broadcaster: Optional[Callable[[int], None]] = None
+
+
+def get(user_id: int) -> Optional[User]:
+    """A fresh, session-less User built from the cached fields, or None on a miss."""
+    entry = _entries.get(user_id)
+    if entry is None:
+        return None
+    expires, fields = entry
+    if time.monotonic() >= expires:
+        _entries.pop(user_id, None)
+        return None
+    _entries.move_to_end(user_id)
+    return User(**fields)
+
+
+def put(user: User) -> None:
+    """Cache a user's fields (e.g. after a database lookup)."""
+    if settings.AUTH_USER_CACHE_TTL_SECONDS <= 0:
+        return
+    fields = {name: getattr(user, name) for name in CACHED_FIELDS}
+    _entries[user.user_id] = (time.monotonic() + settings.AUTH_USER_CACHE_TTL_SECONDS, fields)
+    _entries.move_to_end(user.user_id)
+    while len(_entries) > settings.AUTH_USER_CACHE_SIZE:
+        _entries.popitem(last=False)
+
+
+def invalidate(user_id: int, broadcast: bool = True) -> None:
+    """Drop a user's entry here and, unless broadcast=False, on other workers."""
+    _entries.pop(user_id, None)
+    if broadcast and _broadcaster is not None:
+        try:
+            _broadcaster(user_id)
+        except Exception as e:
+            logger.warning(f"User cache broadcast failed for user {user_id}: {e}")
+
+
+def set_broadcaster(broadcaster: Optional[Callable[[int], None]]) -> None:
+    """Install the cross-worker invalidation hook (None to remove it)."""
+    global _broadcaster
+    _broadcaster = broadcaster
+
+
+def clear() -> None:
+    """Drop every entry."""
+    _entries.clear()
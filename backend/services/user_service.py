@@ -21,10 +21,12 @@ import logging
 from models import (
     User as UserModel, Organization, UserRole as UserRoleModel,
     Conversation, UserEvent, ToolTrace, ChatConfig, HelpContentOverride,
-    TableDefinition, TableRow,
+    TableDefinition,
 )
 from schemas.user import UserRole, OrgMember
-from database import get_async_db
+from database import get_async_db, get_async_read_db
+from services import user_cache
+from services.table_service import delete_table_data
 
 logger = logging.getLogger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -270,6 +272,7 @@ class UserService:
                 setattr(user, field, value)
 
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(user)
 
         logger.info(f"Updated user {user_id}: {list(updates.keys())}")
@@ -358,6 +361,7 @@ class UserService:
 
         user.is_active = False
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(user)
 
         logger.info(f"Deactivated user {user_id}")
@@ -380,6 +384,7 @@ class UserService:
 
         user.is_active = True
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(user)
 
         logger.info(f"Reactivated user {user_id}")
@@ -440,6 +445,7 @@ class UserService:
 
         user.role = UserRoleModel(new_role.value)
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(user)
 
         logger.info(f"Updated role for user {user_id} to {new_role.value}")
@@ -478,6 +484,7 @@ class UserService:
 
         user.org_id = org_id
         await self.db.commit()
+        user_cache.invalidate(user_id)
         await self.db.refresh(user)
 
         logger.info(f"Assigned user {user_id} to org {org_id}")
@@ -519,7 +526,11 @@ class UserService:
         # Order matters: delete children before parents.
 
         # Delete rows with non-nullable FK to users
-        await self.db.execute(delete(TableDefinition).where(TableDefinition.user_id == user_id))  # table_rows cascade via ondelete
+        table_ids = (await self.db.execute(
+            select(TableDefinition.id).where(TableDefinition.user_id == user_id)
+        )).scalars().all()
+        await delete_table_data(self.db, list(table_ids))
+        await self.db.execute(delete(TableDefinition).where(TableDefinition.user_id == user_id))
         await self.db.execute(delete(Conversation).where(Conversation.user_id == user_id))  # messages cascade via ondelete
         await self.db.execute(delete(UserEvent).where(UserEvent.user_id == user_id))
         await self.db.execute(delete(ToolTrace).where(ToolTrace.user_id == user_id))
@@ -531,6 +542,7 @@ class UserService:
         # Delete the user
         await self.db.delete(user)
         await self.db.commit()
+        user_cache.invalidate(user_id)
 
         logger.info(f"Deleted user {user_id} ({email})")
         return True
@@ -558,3 +570,10 @@ async def get_user_service(
 ) -> UserService:
     """Get a UserService instance with async database session."""
     return UserService(db)
+
+
+async def get_user_read_service(
+    db: AsyncSession = Depends(get_async_read_db)
+) -> UserService:
+    """Get a UserService instance for read-only endpoints (replica when configured)."""
+    return UserService(db)
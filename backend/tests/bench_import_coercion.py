@@ -0,0 +1,140 @@
+"""
+Import Coercion Benchmark — per-cell format probing vs compiled per-column coercers
+
+Builds a wide CSV (50 columns x 20,000 rows = 1M cells) mixing number, date,
+boolean and text columns, then times coercing every cell two ways:
+
+- before: the previous per-cell `_coerce_value`, which re-tries up to seven
+  strptime formats for every date cell (kept below as `_legacy_coerce_value`)
+- after: `infer_format` on a 100-record sample, then one compiled coercer per
+  column applied by `_coerce_records`
+
+Parsing the CSV text itself is excluded from both timings.
+
+Run:
+    cd backend
+    python -m tests.bench_import_coercion [--rows N]
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from services.import_export_service import (
+    SCHEMA_SAMPLE_SIZE, _coerce_records, _compile_coercers,
+)
+
+COLUMN_TYPES = ["number", "date", "date", "boolean", "text"]  # Repeated to 50 columns
+NUM_COLUMNS = 50
+
+
+def _legacy_coerce_value(raw: str, col_type: str) -> Any:
+    """The pre-compilation coercer, verbatim."""
+    raw = raw.strip()
+    if not raw:
+        return None
+
+    if col_type == "number":
+        try:
+            cleaned = raw.replace(",", "")
+            if "." in cleaned:
+                return float(cleaned)
+            return int(cleaned)
+        except ValueError:
+            return raw
+
+    if col_type == "boolean":
+        return raw.lower() in ("true", "yes", "1", "y")
+
+    if col_type == "date":
+        from datetime import datetime
+        date_formats = [
+            "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y",
+            "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S",
+            "%Y/%m/%d", "%d-%m-%Y",
+        ]
+        for fmt in date_formats:
+            try:
+                return datetime.strptime(raw, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+        return raw
+
+    return raw
+
+
+def _legacy_coerce_records(records: List[List[str]], columns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rows = []
+    for row_data in records:
+        data: Dict[str, Any] = {}
+        for csv_idx, col in enumerate(columns):
+            if csv_idx < len(row_data):
+                value = _legacy_coerce_value(row_data[csv_idx], col["type"])
+                if value is not None:
+                    data[col["id"]] = value
+        if data:
+            rows.append(data)
+    return rows
+
+
+def _cell(col_type: str, col_idx: int, rng: random.Random) -> str:
+    day = datetime(2015, 1, 1).toordinal() + rng.randrange(3650)
+    if col_type == "number":
+        return f"{rng.uniform(0, 100000):,.2f}"
+    if col_type == "date":
+        # Alternate ISO and US-style date columns (US dates miss the first format)
+        fmt = "%Y-%m-%d" if col_idx % 2 else "%m/%d/%Y"
+        return datetime.fromordinal(day).strftime(fmt)
+    if col_type == "boolean":
+        return rng.choice(["yes", "no"])
+    return f"value {rng.randrange(1000)}"
+
+
+def build_csv(rows: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    types = [COLUMN_TYPES[i % len(COLUMN_TYPES)] for i in range(NUM_COLUMNS)]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow([f"Col {i}" for i in range(NUM_COLUMNS)])
+    for _ in range(rows):
+        writer.writerow([_cell(t, i, rng) for i, t in enumerate(types)])
+    return out.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=20_000, help="CSV rows (x50 columns)")
+    args = parser.parse_args()
+
+    text = build_csv(args.rows)
+    reader = csv.reader(io.StringIO(text))
+    next(reader)
+    records = list(reader)
+    columns = [
+        {"id": f"col_{i}", "name": f"Col {i}", "type": COLUMN_TYPES[i % len(COLUMN_TYPES)]}
+        for i in range(NUM_COLUMNS)
+    ]
+    cells = len(records) * NUM_COLUMNS
+    print(f"{len(records):,} rows x {NUM_COLUMNS} columns = {cells:,} cells, {len(text) / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    before = _legacy_coerce_records(records, columns)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    coercers = _compile_coercers(dict(enumerate(columns)), records[:SCHEMA_SAMPLE_SIZE])
+    after = _coerce_records(records, coercers)
+    compiled_seconds = time.perf_counter() - start
+
+    assert before == after, "compiled coercers changed the coerced values"
+    print(f"before (per-cell probing):   {legacy_seconds:7.2f}s  {cells / legacy_seconds:12,.0f} cells/s")
+    print(f"after  (compiled coercers):  {compiled_seconds:7.2f}s  {cells / compiled_seconds:12,.0f} cells/s")
+    print(f"speedup: {legacy_seconds / compiled_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
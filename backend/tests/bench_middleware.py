@@ -0,0 +1,146 @@
+"""
+Middleware Benchmark — requests/sec on the row CRUD endpoints, old vs new middleware
+
+Drives the real app in-process (httpx ASGITransport, no network) with
+concurrent clients, each running create → get → update → delete cycles
+against /api/tables/{id}/rows, two ways:
+
+- before: the previous stack, a BaseHTTPMiddleware LoggingMiddleware that
+  logged every request and response in full, plus the @app.middleware("http")
+  token_refresh_middleware (both reproduced below)
+- after: the raw ASGI LoggingMiddleware with sampled verbose logging
+
+Reports requests/sec and p50/p95 per-request latency. Needs the database
+from .env; registers a throwaway user to own the benchmark table.
+
+Run:
+    cd backend
+    python -m tests.bench_middleware [--clients N] [--cycles N] [--sample-rate R]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import List
+
+import httpx
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import main as app_main
+from config.settings import settings
+from middleware import LoggingMiddleware
+
+logger = logging.getLogger("middleware.logging_middleware")
+
+COLUMNS = [
+    {"id": "col_name", "name": "Name", "type": "text"},
+    {"id": "col_score", "name": "Score", "type": "number"},
+]
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The removed BaseHTTPMiddleware version: full request and response logs on every call."""
+
+    async def dispatch(self, request, call_next):
+        request.state.request_id = request_id = str(uuid.uuid4())
+        start = time.time()
+        logger.info(f"Request: {request.method} {request.url.path}", extra={
+            "request_id": request_id,
+            "query_params": dict(request.query_params),
+            "client_host": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+        })
+        response = await call_next(request)
+        duration_ms = (time.time() - start) * 1000
+        logger.info(f"Response: {response.status_code} - {duration_ms:.2f}ms",
+                    extra={"request_id": request_id, "status_code": response.status_code})
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+async def token_refresh_middleware(request, call_next):
+    response = await call_next(request)
+    if getattr(request.state, "new_token", None):
+        response.headers["X-New-Token"] = request.state.new_token
+    return response
+
+
+def use_stack(legacy: bool) -> None:
+    """Swap the app's logging layer and force the middleware stack to rebuild."""
+    stack = [
+        m for m in app_main.app.user_middleware
+        if m.cls not in (LoggingMiddleware, LegacyLoggingMiddleware, BaseHTTPMiddleware)
+    ]
+    if legacy:
+        stack = [Middleware(BaseHTTPMiddleware, dispatch=token_refresh_middleware)] + stack
+        stack.append(Middleware(LegacyLoggingMiddleware))
+    else:
+        stack.append(Middleware(LoggingMiddleware))
+    app_main.app.user_middleware = stack
+    app_main.app.middleware_stack = None
+
+
+async def run_clients(client: httpx.AsyncClient, table_id: int, clients: int, cycles: int) -> List[float]:
+    latencies: List[float] = []
+    rows = f"/api/tables/{table_id}/rows"
+
+    async def timed(method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        resp = await client.request(method, url, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+        return resp
+
+    async def worker(w: int) -> None:
+        for i in range(cycles):
+            row = (await timed("POST", rows, json={"data": {"col_name": f"w{w} r{i}", "col_score": i}})).json()
+            await timed("GET", f"{rows}/{row['id']}")
+            await timed("PUT", f"{rows}/{row['id']}", json={"data": {"col_score": i + 1}})
+            await timed("DELETE", f"{rows}/{row['id']}")
+
+    await asyncio.gather(*(worker(w) for w in range(clients)))
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    settings.LOG_VERBOSE_SAMPLE_RATE = args.sample_rate
+    await app_main.app.router.startup()
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        email = f"bench_mw_{uuid.uuid4().hex[:8]}@test.example.com"
+        token = (await client.post("/api/auth/register", json={"email": email, "password": "BenchPass123!"})).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        table_id = (await client.post("/api/tables", json={"name": "Middleware benchmark", "columns": COLUMNS})).json()["id"]
+        try:
+            for label, legacy in (("before", True), ("after", False)):
+                use_stack(legacy)
+                await run_clients(client, table_id, args.clients, 5)  # Warm-up
+                start = time.perf_counter()
+                latencies = await run_clients(client, table_id, args.clients, args.cycles)
+                elapsed = time.perf_counter() - start
+                quantiles = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{label:6s}  {len(latencies) / elapsed:8.1f} req/s   "
+                    f"p50 {quantiles[49]:6.2f} ms   p95 {quantiles[94]:6.2f} ms"
+                )
+        finally:
+            await client.delete(f"/api/tables/{table_id}")
+    await app_main.app.router.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--cycles", type=int, default=100, help="CRUD cycles per client")
+    parser.add_argument("--sample-rate", type=float, default=settings.LOG_VERBOSE_SAMPLE_RATE,
+                        help="LOG_VERBOSE_SAMPLE_RATE for the new middleware")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Row CRUD Benchmark — table-then-row round trips vs ownership-scoped queries
+
+Runs single-row get / update / create+delete cycles from concurrent workers,
+each on its own session, two ways:
+
+- before: TableService.get for the ownership check, then the RowService call
+  (the way the row endpoints worked before the scoped layer)
+- after: RowService.get_owned / update_owned / create_owned / delete_owned,
+  which fold the ownership check into the row statement or version bump
+
+Reports p50/p95 latency per operation. Needs a scratch database and a user
+to own the benchmark table.
+
+Run:
+    cd backend
+    python -m tests.bench_row_crud --user-id N [--workers N] [--ops N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from database import AsyncSessionLocal
+from schemas.table import ColumnDefinition, RowCreate, RowUpdate, TableCreate
+from services.row_service import RowService
+from services.table_service import TableService
+
+COLUMNS = [
+    ColumnDefinition(id="col_name", name="Name", type="text"),
+    ColumnDefinition(id="col_score", name="Score", type="number"),
+]
+
+Op = Callable[[TableService, RowService, int], Awaitable[None]]
+
+
+def _ops(table_id: int, user_id: int, row_ids: List[int]) -> Dict[str, Dict[str, Op]]:
+    async def get_before(tables, rows, i):
+        await tables.get(table_id, user_id)
+        await rows.get(table_id, row_ids[i % len(row_ids)])
+
+    async def get_after(tables, rows, i):
+        await rows.get_owned(table_id, user_id, row_ids[i % len(row_ids)])
+
+    async def update_before(tables, rows, i):
+        table = await tables.get(table_id, user_id)
+        await rows.update(table_id, row_ids[i % len(row_ids)], RowUpdate(data={"col_score": i}), table.columns)
+
+    async def update_after(tables, rows, i):
+        await rows.update_owned(table_id, user_id, row_ids[i % len(row_ids)], {"col_score": i})
+
+    async def create_delete_before(tables, rows, i):
+        table = await tables.get(table_id, user_id)
+        row = await rows.create(table_id, RowCreate(data={"col_name": f"tmp {i}"}), table.columns)
+        await tables.get(table_id, user_id)
+        await rows.delete(table_id, row.id)
+
+    async def create_delete_after(tables, rows, i):
+        row = await rows.create_owned(table_id, user_id, {"col_name": f"tmp {i}"})
+        await rows.delete_owned(table_id, user_id, [row.id], require_all=True)
+
+    return {
+        "get": {"before": get_before, "after": get_after},
+        "update": {"before": update_before, "after": update_after},
+        "create+delete": {"before": create_delete_before, "after": create_delete_after},
+    }
+
+
+async def _run(op: Op, workers: int, ops: int) -> List[float]:
+    latencies: List[float] = []
+
+    async def worker(w: int) -> None:
+        for i in range(w, ops, workers):
+            async with AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                await op(TableService(db), RowService(db), i)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker(w) for w in range(workers)))
+    return latencies
+
+
+def _p(values: List[float], pct: int) -> float:
+    return statistics.quantiles(values, n=100)[pct - 1]
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with AsyncSessionLocal() as db:
+        table = await TableService(db).create(args.user_id, TableCreate(name="CRUD benchmark", columns=COLUMNS))
+        await TableService(db).set_row_limit(table.id, args.rows + args.ops)
+        row_ids = await RowService(db).insert_many(
+            table.id, [{"col_name": f"row {i}", "col_score": i} for i in range(args.rows)], version=0
+        )
+        await db.commit()
+
+    try:
+        for name, variants in _ops(table.id, args.user_id, row_ids).items():
+            for label, op in variants.items():
+                latencies = await _run(op, args.workers, args.ops)
+                print(f"{name:14s} {label:6s}  p50 {_p(latencies, 50):6.2f} ms   p95 {_p(latencies, 95):6.2f} ms")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await TableService(db).delete(table.id, args.user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--user-id", type=int, required=True, help="User to own the benchmark table")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent workers")
+    parser.add_argument("--ops", type=int, default=2000, help="Operations per variant")
+    parser.add_argument("--rows", type=int, default=1000, help="Rows in the benchmark table")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
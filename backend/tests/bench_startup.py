@@ -0,0 +1,77 @@
+"""
+Startup Benchmark — worker boot time with and without create_all at startup
+
+Boots the app in a fresh interpreter per run (as a new or restarted worker
+would) and times three phases:
+
+- import: importing main (routers, services, engines)
+- startup: the startup handlers (create_all when DB_CREATE_ALL_ON_STARTUP)
+- ready: until /api/ready first answers 200
+
+Each configuration runs --runs times; medians are reported. Needs the
+database from .env to be reachable.
+
+Run:
+    cd backend
+    python -m tests.bench_startup [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Runs in the child interpreter; prints one JSON line of phase timings (ms)
+CHILD = """
+import asyncio, json, time
+from starlette.responses import Response
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def boot():
+    await main.app.router.startup()
+    t2 = time.perf_counter()
+    while isinstance(await main.readiness_check(), Response):  # 503 until ready
+        await asyncio.sleep(0.01)
+    t3 = time.perf_counter()
+    await main.app.router.shutdown()
+    return t2, t3
+
+t2, t3 = asyncio.run(boot())
+print(json.dumps({"import": (t1 - t0) * 1000, "startup": (t2 - t1) * 1000, "ready": (t3 - t0) * 1000}))
+"""
+
+CONFIGS = {
+    "create_all at startup": {"DB_CREATE_ALL_ON_STARTUP": "true"},
+    "schema step before boot": {"DB_CREATE_ALL_ON_STARTUP": "false"},
+}
+
+
+def boot_once(env_overrides: Dict[str, str]) -> Dict[str, float]:
+    env = dict(os.environ, **env_overrides)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5, help="Boots per configuration")
+    args = parser.parse_args()
+
+    for label, overrides in CONFIGS.items():
+        runs: List[Dict[str, float]] = [boot_once(overrides) for _ in range(args.runs)]
+        medians = {phase: statistics.median(run[phase] for run in runs) for phase in runs[0]}
+        print(
+            f"{label:26s} import {medians['import']:7.0f} ms   startup {medians['startup']:7.0f} ms"
+            f"   ready {medians['ready']:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
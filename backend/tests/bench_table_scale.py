@@ -0,0 +1,212 @@
+"""
+Table Scale Benchmark — row reads against large tables, checked against SLOs
+
+Seeds one table with --rows rows (default 1M), then duplicates it until the
+row store holds --total rows (default 50M) so the big table competes with
+realistic neighbours, and times the row operations the UI depends on:
+
+- first page (default order) and a deep keyset page
+- a page sorted by a number column (typed row index)
+- full-text search
+- a full CSV export (stream_csv)
+
+Each timing is checked against the SLO below; the script exits non-zero if
+any is breached. Seeding uses set-based SQL (rows double with INSERT ...
+SELECT) and row_index.reindex_columns, so it needs a scratch database and
+a user to own the tables. Run it before and after
+migrations/partition_table_rows.sql to compare.
+
+Run:
+    cd backend
+    python -m tests.bench_table_scale --user-id N [--rows N] [--total N] [--keep]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import func, insert, select, update
+
+from database import AsyncSessionLocal
+from models import TableDefinition, TableRow
+from schemas.table import ColumnDefinition, TableCreate
+from services import row_index
+from services.import_export_service import stream_csv
+from services.row_service import RowService
+from services.table_service import TableService
+
+SEED_ROWS = 10_000  # Rows inserted through RowService before doubling
+
+# operation -> max seconds
+SLOS = {
+    "first page": 0.25,
+    "deep page": 0.25,
+    "sorted page": 0.5,
+    "search": 0.5,
+    "row count": 0.5,
+}
+EXPORT_ROWS_PER_SECOND = 50_000
+
+COLUMNS = [
+    ColumnDefinition(id="col_name", name="Name", type="text"),
+    ColumnDefinition(id="col_amount", name="Amount", type="number"),
+    ColumnDefinition(id="col_status", name="Status", type="select", options=["open", "won", "lost"]),
+    ColumnDefinition(id="col_closed", name="Closed", type="date"),
+]
+
+
+def _seed_row(i: int) -> Dict[str, Any]:
+    return {
+        "col_name": f"account {i}",
+        "col_amount": (i * 7919) % 100_000,
+        "col_status": ("open", "won", "lost")[i % 3],
+        "col_closed": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+    }
+
+
+async def seed_table(user_id: int, rows: int) -> int:
+    """Create the benchmark table and fill it with `rows` indexed rows."""
+    async with AsyncSessionLocal() as db:
+        table = await TableService(db).create(
+            user_id, TableCreate(name="Scale benchmark", columns=COLUMNS)
+        )
+        columns = table.columns
+
+        row_service = RowService(db)
+        seed = [_seed_row(i) for i in range(min(SEED_ROWS, rows))]
+        await row_service.insert_many(table.id, seed, version=0)
+
+        # Double until full; each copy gets a fresh random amount and name
+        count = len(seed)
+        while count < rows:
+            batch = min(count, rows - count)
+            source = (
+                select(
+                    TableRow.table_id,
+                    func.json_set(
+                        TableRow.data,
+                        '$."col_amount"', func.round(func.rand() * 100_000, 2),
+                        '$."col_name"', func.concat("account ", func.floor(func.rand() * 10_000_000)),
+                    ),
+                    TableRow.version,
+                    TableRow.created_at,
+                    TableRow.updated_at,
+                )
+                .where(TableRow.table_id == table.id)
+                .limit(batch)
+            )
+            await db.execute(
+                insert(TableRow).from_select(
+                    ["table_id", "data", "version", "created_at", "updated_at"], source
+                )
+            )
+            await db.commit()
+            count += batch
+            print(f"  seeded {count:,} rows")
+
+        await row_index.reindex_columns(db, table.id, columns)
+        await db.execute(
+            update(TableDefinition).where(TableDefinition.id == table.id).values(row_count=count)
+        )
+        await db.commit()
+        return table.id
+
+
+async def add_neighbours(user_id: int, table_id: int, rows: int, total: int) -> List[int]:
+    """Duplicate the benchmark table until the row store holds `total` rows."""
+    copies = []
+    async with AsyncSessionLocal() as db:
+        stored = (await db.execute(select(func.count(TableRow.id)))).scalar_one()
+        while stored + rows <= total:
+            copy = await TableService(db).duplicate(table_id, user_id, name=f"Scale benchmark {len(copies) + 1}")
+            copies.append(copy.id)
+            stored += rows
+            print(f"  row store at {stored:,} rows")
+    return copies
+
+
+async def _timed(label: str, run: Callable[[], Awaitable[Any]], results: Dict[str, float]) -> Any:
+    start = time.perf_counter()
+    value = await run()
+    results[label] = time.perf_counter() - start
+    return value
+
+
+async def measure(table_id: int, user_id: int) -> bool:
+    """Time the row operations; print them and return whether all SLOs held."""
+    results: Dict[str, float] = {}
+    async with AsyncSessionLocal() as db:
+        rows = RowService(db)
+        table = await TableService(db).get(table_id, user_id)
+
+        _, total, cursor = await _timed("first page", lambda: rows.list_page(table_id, limit=100), results)
+        for _ in range(50):  # Walk 50 pages in, then time the next one
+            _, _, cursor = await rows.list_page(table_id, limit=100, after=cursor)
+        await _timed("deep page", lambda: rows.list_page(table_id, limit=100, after=cursor), results)
+        await _timed(
+            "sorted page",
+            lambda: rows.list_page(table_id, limit=100, sort_column="col_amount", sort_direction="desc"),
+            results,
+        )
+        await _timed("search", lambda: rows.search(table_id, "account 4242", table.columns), results)
+        await _timed(
+            "row count",
+            lambda: db.execute(select(func.count(TableRow.id)).where(TableRow.table_id == table_id)),
+            results,
+        )
+
+    async def export() -> int:
+        size = 0
+        async for chunk in stream_csv(table_id, table.columns):
+            size += len(chunk)
+        return size
+
+    size = await _timed("export", export, results)
+
+    ok = True
+    print(f"\n{total:,} rows in the benchmark table")
+    for label, limit in SLOS.items():
+        seconds = results[label]
+        status = "ok" if seconds <= limit else "SLOW"
+        ok &= seconds <= limit
+        print(f"{label:12s} {seconds * 1000:9.1f} ms  (SLO {limit * 1000:.0f} ms)  {status}")
+    rate = total / results["export"]
+    status = "ok" if rate >= EXPORT_ROWS_PER_SECOND else "SLOW"
+    ok &= rate >= EXPORT_ROWS_PER_SECOND
+    print(f"{'export':12s} {results['export']:9.1f} s   {rate:,.0f} rows/s, {size / 1e6:.0f} MB  "
+          f"(SLO {EXPORT_ROWS_PER_SECOND:,} rows/s)  {status}")
+    return ok
+
+
+async def run(args: argparse.Namespace) -> bool:
+    print(f"Seeding {args.rows:,} rows...")
+    table_id = await seed_table(args.user_id, args.rows)
+    tables = [table_id]
+    try:
+        if args.total > args.rows:
+            print(f"Adding neighbour tables up to {args.total:,} rows...")
+            tables += await add_neighbours(args.user_id, table_id, args.rows, args.total)
+        return await measure(table_id, args.user_id)
+    finally:
+        if not args.keep:
+            async with AsyncSessionLocal() as db:
+                for tid in tables:
+                    await TableService(db).delete(tid, args.user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--user-id", type=int, required=True, help="User to own the benchmark tables")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the measured table")
+    parser.add_argument("--total", type=int, default=50_000_000, help="Rows in the whole row store")
+    parser.add_argument("--keep", action="store_true", help="Keep the tables afterwards")
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
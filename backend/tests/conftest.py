@@ -7,7 +7,7 @@ Configure test settings by setting environment variables or editing the values b
 import os
 import time
 import uuid
-from typing import List
+from typing import List, Optional
 
 import pytest
 import requests
@@ -53,8 +53,8 @@ class APIClient:
     def _url(self, path: str) -> str:
         return f"{self.base_url}{path}"
 
-    def _headers(self) -> dict:
-        headers = {}
+    def _headers(self, extra: Optional[dict] = None) -> dict:
+        headers = dict(extra or {})
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
@@ -84,16 +84,16 @@ class APIClient:
         return resp
 
     def get(self, path: str, **kwargs) -> requests.Response:
-        return self.session.get(self._url(path), headers=self._headers(), **kwargs)
+        return self.session.get(self._url(path), headers=self._headers(kwargs.pop("headers", None)), **kwargs)
 
     def post(self, path: str, **kwargs) -> requests.Response:
-        return self.session.post(self._url(path), headers=self._headers(), **kwargs)
+        return self.session.post(self._url(path), headers=self._headers(kwargs.pop("headers", None)), **kwargs)
 
     def put(self, path: str, **kwargs) -> requests.Response:
-        return self.session.put(self._url(path), headers=self._headers(), **kwargs)
+        return self.session.put(self._url(path), headers=self._headers(kwargs.pop("headers", None)), **kwargs)
 
     def delete(self, path: str, **kwargs) -> requests.Response:
-        return self.session.delete(self._url(path), headers=self._headers(), **kwargs)
+        return self.session.delete(self._url(path), headers=self._headers(kwargs.pop("headers", None)), **kwargs)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -9,13 +9,18 @@ Run:
     python -m pytest tests/test_core_flow.py -v -s
 """
 
+import base64
+import csv
+import gzip
+import io
+import json
 import time
 import uuid
 from pathlib import Path
 
 import pytest
 
-from tests.conftest import APIClient, TEST_BASE_URL
+from tests.conftest import APIClient, TEST_BASE_URL, TEST_ADMIN_EMAIL, TEST_ADMIN_PASSWORD
 from tests.helpers import FlowResultsWriter
 
 RESULTS_FILE = Path(__file__).parent / "results" / "core_flow_results.md"
@@ -244,6 +249,45 @@ class TestPopulateData:
                 _cleanup_table(client, tid)
         results.finish_test()
 
+    def test_create_row_non_finite_number(self, client, results):
+        """CF Step 2: "NaN"/"inf" in a number column are stored as text, not a 500."""
+        results.start_test("create_row_non_finite_number", SECTION_POPULATE, 'POST "NaN" and "inf" into a number column')
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "NaN Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+
+            nan_resp = client.post(f"/api/tables/{tid}/rows", json={
+                "data": {"col_name": "Not a number", "col_age": "NaN"}
+            })
+            results.add_step("POST", f"Age=NaN → {nan_resp.status_code}")
+            inf_resp = client.post(f"/api/tables/{tid}/rows", json={
+                "data": {"col_name": "Infinite", "col_age": "-Infinity"}
+            })
+            results.add_step("POST", f"Age=-Infinity → {inf_resp.status_code}")
+
+            agg_resp = client.post(f"/api/tables/{tid}/aggregate", json={
+                "metrics": [{"op": "count"}, {"op": "sum", "column_id": "col_age"}],
+            })
+            results.add_step("POST", f"/aggregate sum(Age) → {agg_resp.status_code}")
+            results.set_output(f"nan={nan_resp.json().get('data')}, inf={inf_resp.json().get('data')}")
+            ok = (
+                nan_resp.status_code == 201
+                and nan_resp.json()["data"]["col_age"] == "NaN"
+                and inf_resp.status_code == 201
+                and agg_resp.status_code == 200
+            )
+            results.set_passed(ok)
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
     def test_create_multiple_rows(self, client, results):
         """CF Step 2: Sequential row creation, GET returns all."""
         results.start_test("create_multiple_rows", SECTION_POPULATE, "Create 3 rows then GET all")
@@ -299,11 +343,17 @@ class TestPopulateData:
             results.add_step("GET", f"offset=2&limit=2 → {page_resp.status_code}")
             rows = data.get("rows", [])
             total = data.get("total", 0)
+
+            # A well-formed cursor whose created_at isn't a date is a client error, not a 500
+            bad_cursor = base64.urlsafe_b64encode(b'{"s":null,"d":true,"k":["not-a-date",1]}').decode().rstrip("=")
+            bad_resp = client.get(f"/api/tables/{tid}/rows", params={"after": bad_cursor})
+            results.add_step("GET", f"after=<bad created_at> → {bad_resp.status_code}")
             results.set_output(f"rows={len(rows)}, total={total}")
             ok = (
                 page_resp.status_code == 200
                 and len(rows) == 2
                 and total == 5
+                and bad_resp.status_code == 400
             )
             results.set_passed(ok)
         except Exception as e:
@@ -351,6 +401,121 @@ class TestPopulateData:
                 _cleanup_table(client, tid)
         results.finish_test()
 
+    def test_table_stats(self, client, results):
+        """CF Step 2: GET /tables/{id}/stats aggregates column values."""
+        results.start_test("table_stats", SECTION_POPULATE, "Column stats after inserts and an edit")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "Stats Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+
+            row_ids = []
+            for name, age, active in [("A", 30, True), ("B", 30, False), ("C", 45, True), ("D", None, True)]:
+                data = {"col_name": name, "col_active": active}
+                if age is not None:
+                    data["col_age"] = age
+                row_ids.append(client.post(f"/api/tables/{tid}/rows", json={"data": data}).json()["id"])
+            results.add_step("POST", "Created 4 rows")
+
+            before = {c["column_id"]: c for c in client.get(f"/api/tables/{tid}/stats").json()["columns"]}
+            # An edit must be reflected in the cached stats
+            client.put(f"/api/tables/{tid}/rows/{row_ids[0]}", json={"data": {"col_age": 60}})
+            stats_resp = client.get(f"/api/tables/{tid}/stats")
+            after = {c["column_id"]: c for c in stats_resp.json()["columns"]}
+            results.add_step("GET", f"/stats → {stats_resp.status_code}")
+            results.set_output(f"before={before['col_age']}, after={after['col_age']}")
+
+            results.set_passed(
+                stats_resp.status_code == 200
+                and before["col_age"]["distinct_count"] == 2
+                and before["col_age"]["empty"] == 1
+                and before["col_age"]["top_values"][0] == [30, 2]
+                and dict(map(tuple, before["col_active"]["top_values"])) == {1: 3, 0: 1}
+                and after["col_age"]["distinct_count"] == 3
+                and after["col_age"]["max_value"] == 60
+                and after["col_name"]["distinct_count"] == 4
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+
+    def test_aggregate_rows(self, client, results):
+        """CF Step 2: POST /tables/{id}/aggregate groups and totals rows in SQL."""
+        results.start_test("aggregate_rows", SECTION_POPULATE, "Group by Active with count/sum/avg/max")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "Aggregate Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+
+            for name, age, active in [("A", 20, True), ("B", 40, True), ("C", 35, False), ("D", None, False)]:
+                data = {"col_name": name, "col_active": active}
+                if age is not None:
+                    data["col_age"] = age
+                client.post(f"/api/tables/{tid}/rows", json={"data": data})
+            results.add_step("POST", "Created 4 rows")
+
+            agg_resp = client.post(f"/api/tables/{tid}/aggregate", json={
+                "group_by": ["col_active"],
+                "metrics": [
+                    {"op": "count"},
+                    {"op": "sum", "column_id": "col_age"},
+                    {"op": "avg", "column_id": "col_age", "alias": "avg_age"},
+                    {"op": "max", "column_id": "col_age"},
+                ],
+                "filters": {"col_name": {"operator": "is_not_empty"}},
+            })
+            body = agg_resp.json()
+            results.add_step("POST", f"/aggregate → {agg_resp.status_code}")
+            results.set_output(str(body))
+            by_key = {g["key"]["col_active"]: g["values"] for g in body.get("groups", [])}
+
+            bad_resp = client.post(f"/api/tables/{tid}/aggregate", json={
+                "metrics": [{"op": "sum", "column_id": "col_name"}],
+            })
+            results.add_step("POST", f"/aggregate sum over text → {bad_resp.status_code}")
+            bad_max = client.post(f"/api/tables/{tid}/aggregate", json={
+                "metrics": [{"op": "max", "column_id": "col_name"}],
+            })
+            results.add_step("POST", f"/aggregate max over text → {bad_max.status_code}")
+
+            # Two names sharing the 255-char indexed prefix stay separate groups
+            prefix = "x" * 300
+            for suffix in ("1", "2"):
+                client.post(f"/api/tables/{tid}/rows", json={"data": {"col_name": prefix + suffix}})
+            long_resp = client.post(f"/api/tables/{tid}/aggregate", json={
+                "group_by": ["col_name"],
+                "filters": {"col_name": {"operator": "contains", "value": "xxx"}},
+            })
+            long_keys = sorted(g["key"]["col_name"] for g in long_resp.json().get("groups", []))
+            results.add_step("POST", f"/aggregate group by long name → {len(long_keys)} groups")
+
+            results.set_passed(
+                agg_resp.status_code == 200
+                and body["truncated"] is False
+                and by_key[1] == {"count": 2, "sum_col_age": 60, "avg_age": 30, "max_col_age": 40}
+                and by_key[0]["count"] == 2
+                and by_key[0]["sum_col_age"] == 35
+                and bad_resp.status_code == 400
+                and bad_max.status_code == 400
+                and long_keys == [prefix + "1", prefix + "2"]
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Step 3: Add Column
@@ -447,6 +612,49 @@ class TestAddColumn:
                 _cleanup_table(client, tid)
         results.finish_test()
 
+    def test_schema_change_migrates_rows(self, client, results):
+        """CF Step 3: Removing a column strips it from rows; retyping converts values."""
+        results.start_test("schema_change_migrates_rows", SECTION_SCHEMA, "Remove 'Notes', retype 'Score' text → number")
+        tid = None
+        try:
+            tid = client.post("/api/tables", json={
+                "name": "Migrate Table",
+                "columns": [
+                    {"id": "col_name", "name": "Name", "type": "text"},
+                    {"id": "col_notes", "name": "Notes", "type": "text"},
+                    {"id": "col_score", "name": "Score", "type": "text"},
+                ],
+            }).json()["id"]
+            client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": "A", "col_notes": "x", "col_score": "1,250"}},
+                {"action": "create", "data": {"col_name": "B", "col_notes": "y", "col_score": "n/a"}},
+            ]})
+            results.add_step("POST", "Created table + 2 rows")
+
+            put_resp = client.put(f"/api/tables/{tid}", params={"stream": "true"}, json={
+                "columns": [
+                    {"id": "col_name", "name": "Name", "type": "text"},
+                    {"id": "col_score", "name": "Score", "type": "number"},
+                ],
+            })
+            results.add_step("PUT", f"/api/tables/{tid}?stream=true → {put_resp.status_code}")
+
+            rows = client.get(f"/api/tables/{tid}/rows").json()["rows"]
+            by_name = {r["data"]["col_name"]: r["data"] for r in rows}
+            results.set_output(f"rows={by_name}, stream_tail={put_resp.text[-120:]!r}")
+            results.set_passed(
+                put_resp.status_code == 200
+                and "event: complete" in put_resp.text
+                and by_name["A"] == {"col_name": "A", "col_score": 1250}
+                and by_name["B"] == {"col_name": "B", "col_score": "n/a"}
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Step 4: Update Rows
@@ -539,6 +747,73 @@ class TestUpdateRows:
         results.finish_test()
 
 
+    def test_bulk_rows(self, client, results):
+        """CF Step 4: Mixed create/update/delete in one bulk request."""
+        results.start_test("bulk_rows", SECTION_UPDATE, "POST /rows/bulk with create+update+delete")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "Bulk Rows Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+
+            keep = client.post(f"/api/tables/{tid}/rows", json={"data": {"col_name": "Keep", "col_age": 1}}).json()["id"]
+            drop = client.post(f"/api/tables/{tid}/rows", json={"data": {"col_name": "Drop"}}).json()["id"]
+            results.add_step("POST", f"Created rows {keep}, {drop}")
+
+            bulk_resp = client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": "New A", "col_age": 30}},
+                {"action": "create", "data": {"col_name": "New B", "col_active": True}},
+                {"action": "update", "row_id": keep, "data": {"col_age": 2}},
+                {"action": "delete", "row_id": drop},
+            ]})
+            body = bulk_resp.json()
+            results.add_step("POST", f"/rows/bulk → {bulk_resp.status_code}: {body}")
+
+            rows = client.get(f"/api/tables/{tid}/rows").json().get("rows", [])
+            by_id = {r["id"]: r for r in rows}
+            table = client.get(f"/api/tables/{tid}").json()
+            results.set_output(f"rows={len(rows)}, row_count={table.get('row_count')}")
+            results.set_passed(
+                bulk_resp.status_code == 200
+                and len(body["created_ids"]) == 2
+                and body["updated"] == 1
+                and body["deleted"] == 1
+                and set(by_id) == {keep, *body["created_ids"]}
+                and by_id[keep]["data"] == {"col_name": "Keep", "col_age": 2}
+                and by_id[body["created_ids"][0]]["data"]["col_name"] == "New A"
+                and table.get("row_count") == 3
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_bulk_rows_limit_ignores_phantom_deletes(self, client, results):
+        """Deletes of rows that don't exist don't make room for extra creates."""
+        results.start_test("bulk_rows_phantom_deletes", SECTION_UPDATE, "Row limit counts only real deletes")
+        tid = None
+        try:
+            tid = client.post("/api/tables", json={"name": "Bulk Limit Table", "columns": BASIC_COLUMNS}).json()["id"]
+            count = 2000  # Above the default row limit
+            ops = [{"action": "create", "data": {"col_name": f"R{i}"}} for i in range(count)]
+            ops += [{"action": "delete", "row_id": 2_000_000_000 + i} for i in range(count)]
+            resp = client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": ops})
+            results.add_step("POST", f"/rows/bulk ({count} creates + {count} phantom deletes) → {resp.status_code}")
+            table = client.get(f"/api/tables/{tid}").json()
+            results.set_output(f"status={resp.status_code}, row_count={table.get('row_count')}")
+            results.set_passed(resp.status_code == 400 and table.get("row_count") == 0)
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Full Lifecycle
 # ═══════════════════════════════════════════════════════════════════════════
@@ -658,6 +933,235 @@ class TestCrossCutting:
                 _cleanup_table(client, tid)
         results.finish_test()
 
+    def test_conditional_get(self, client, results):
+        results.start_test("conditional_get", SECTION_CROSS, "ETag / If-None-Match on table and rows")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={"name": "ETag Table", "columns": BASIC_COLUMNS})
+            tid = resp.json()["id"]
+            row_id = client.post(f"/api/tables/{tid}/rows", json={"data": {"col_name": "Alice", "col_age": 30}}).json()["id"]
+
+            first = client.get(f"/api/tables/{tid}/rows")
+            etag = first.headers.get("etag")
+            table_etag = client.get(f"/api/tables/{tid}").headers.get("etag")
+            again = client.get(f"/api/tables/{tid}/rows", headers={"If-None-Match": etag})
+            table_again = client.get(f"/api/tables/{tid}", headers={"If-None-Match": table_etag})
+            other_page = client.get(f"/api/tables/{tid}/rows", params={"limit": 5}, headers={"If-None-Match": etag})
+            results.add_step("GET", f"rows → {first.status_code}, repeat → {again.status_code}, other page → {other_page.status_code}")
+
+            client.put(f"/api/tables/{tid}/rows/{row_id}", json={"data": {"col_age": 31}})
+            after_edit = client.get(f"/api/tables/{tid}/rows", headers={"If-None-Match": etag})
+            table_after = client.get(f"/api/tables/{tid}", headers={"If-None-Match": table_etag})
+            results.add_step("GET", f"after edit → rows {after_edit.status_code}, table {table_after.status_code}")
+
+            results.set_output(f"etag={etag}, table_etag={table_etag}")
+            results.set_passed(
+                first.status_code == 200
+                and bool(etag)
+                and again.status_code == 304
+                and table_again.status_code == 304
+                and other_page.status_code == 200
+                and after_edit.status_code == 200
+                and after_edit.headers.get("etag") != etag
+                and after_edit.json()["rows"][0]["data"]["col_age"] == 31
+                and table_after.status_code == 200
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_row_changes(self, client, results):
+        results.start_test("row_changes", SECTION_CROSS, "GET /rows/changes returns deltas and tombstones")
+        tid = None
+        try:
+            tid = client.post("/api/tables", json={"name": "Sync Table", "columns": BASIC_COLUMNS}).json()["id"]
+            client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": f"Row {i}", "col_age": i}} for i in range(5)
+            ]})
+            full = client.get(f"/api/tables/{tid}/rows/changes", params={"since": 0, "limit": 3})
+            page_2 = client.get(f"/api/tables/{tid}/rows/changes", params={"since": 0, "after": full.json()["next_cursor"]})
+            since = full.json()["version"]
+            ids = {r["data"]["col_name"]: r["id"] for r in full.json()["rows"] + page_2.json()["rows"]}
+            results.add_step("GET", f"since=0 → {len(ids)} rows over 2 pages, version {since}")
+
+            client.put(f"/api/tables/{tid}/rows/{ids['Row 1']}", json={"data": {"col_age": 10}})
+            client.delete(f"/api/tables/{tid}/rows/{ids['Row 2']}")
+            delta = client.get(f"/api/tables/{tid}/rows/changes", params={"since": since}).json()
+            idle = client.get(f"/api/tables/{tid}/rows/changes", params={"since": delta["version"]}).json()
+            results.add_step("GET", f"since={since} → rows={[r['id'] for r in delta['rows']]}, deleted={delta['deleted']}")
+
+            resync = client.get(f"/api/tables/{tid}/rows/changes", params={"since": 0}).json()
+            results.add_step("GET", f"since=0 → rows={len(resync['rows'])}, deleted={resync['deleted']}")
+
+            # Tombstones page like rows
+            client.post(f"/api/tables/{tid}/rows/bulk-delete", json={"row_ids": [ids["Row 3"], ids["Row 4"]]})
+            del_1 = client.get(f"/api/tables/{tid}/rows/changes", params={"since": delta["version"], "limit": 1}).json()
+            del_2 = client.get(
+                f"/api/tables/{tid}/rows/changes",
+                params={"since": delta["version"], "limit": 1, "after": del_1["next_cursor"]},
+            ).json()
+            results.add_step("GET", f"deletions paged → {del_1['deleted']}, {del_2['deleted']}")
+
+            results.set_output(f"delta={delta}, idle={idle}")
+            results.set_passed(
+                full.status_code == 200
+                and len(ids) == 5
+                and page_2.json()["next_cursor"] is None
+                and [r["id"] for r in delta["rows"]] == [ids["Row 1"]]
+                and delta["rows"][0]["data"]["col_age"] == 10
+                and delta["deleted"] == [ids["Row 2"]]
+                and delta["version"] > since
+                and idle["rows"] == [] and idle["deleted"] == []
+                and len(resync["rows"]) == 4 and resync["deleted"] == []
+                and del_1["rows"] == [] and del_1["next_cursor"] is not None
+                and sorted(del_1["deleted"] + del_2["deleted"]) == sorted([ids["Row 3"], ids["Row 4"]])
+                and del_2["next_cursor"] is None
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_duplicate_table(self, client, results):
+        results.start_test("duplicate_table", SECTION_CROSS, "POST /duplicate copies rows, with and without column remap")
+        tids = []
+        try:
+            tid = client.post("/api/tables", json={"name": "Fork Source", "columns": BASIC_COLUMNS}).json()["id"]
+            tids.append(tid)
+            client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": f"Row {i}", "col_age": i, "col_active": i % 2 == 0}}
+                for i in range(30)
+            ]})
+            results.add_step("POST", "Created 30 rows")
+
+            plain = client.post(f"/api/tables/{tid}/duplicate")
+            remapped = client.post(f"/api/tables/{tid}/duplicate", json={"name": "Fork B", "remap_column_ids": True})
+            tids += [r.json()["id"] for r in (plain, remapped) if r.status_code == 201]
+            results.add_step("POST", f"/duplicate → {plain.status_code}, remapped → {remapped.status_code}")
+
+            plain_rows = client.get(f"/api/tables/{plain.json()['id']}/rows", params={"limit": 100}).json()["rows"]
+            new_ids = {c["name"]: c["id"] for c in remapped.json()["columns"]}
+            sorted_rows = client.get(
+                f"/api/tables/{remapped.json()['id']}/rows",
+                params={"sort_column": new_ids["Age"], "sort_direction": "desc", "limit": 1},
+            ).json()["rows"]
+            top = sorted_rows[0]["data"] if sorted_rows else {}
+            synced = client.get(f"/api/tables/{plain.json()['id']}/rows/changes", params={"since": 0, "limit": 100}).json()
+            results.add_step("GET", f"copy /rows/changes?since=0 → version {synced.get('version')}, rows={len(synced.get('rows', []))}")
+            results.set_output(f"plain={plain.json()['name']!r} rows={len(plain_rows)}, remapped ids={new_ids}, top={top}")
+            results.set_passed(
+                plain.status_code == 201
+                and plain.json()["name"] == "Fork Source (copy)"
+                and plain.json()["row_count"] == 30
+                and len(plain_rows) == 30
+                and synced["version"] == 1
+                and len(synced["rows"]) == 30
+                and remapped.status_code == 201
+                and remapped.json()["name"] == "Fork B"
+                and new_ids["Age"] != "col_age"
+                and top == {new_ids["Name"]: "Row 29", new_ids["Age"]: 29, new_ids["Active"]: False}
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            for tid in tids:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_row_limit_admin_only(self, client, results):
+        results.start_test("row_limit_admin_only", SECTION_CROSS, "Per-table row limits default to null and are admin-only")
+        tid = None
+        try:
+            tid = client.post("/api/tables", json={"name": "Limit Table", "columns": BASIC_COLUMNS}).json()["id"]
+            table = client.get(f"/api/tables/{tid}").json()
+            resp = client.put(f"/api/admin/tables/{tid}/row-limit", json={"max_rows": 5000})
+            results.add_step("PUT", f"/admin/tables/{tid}/row-limit → {resp.status_code}")
+            results.set_output(f"max_rows={table.get('max_rows')!r}, status={resp.status_code}")
+            results.set_passed("max_rows" in table and table["max_rows"] is None and resp.status_code == 403)
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_row_limit_read_back(self, client, results):
+        admin = APIClient(TEST_BASE_URL)
+        if admin.login(TEST_ADMIN_EMAIL, TEST_ADMIN_PASSWORD).status_code != 200:
+            pytest.skip("Admin login unavailable (set TEST_ADMIN_EMAIL / TEST_ADMIN_PASSWORD)")
+        results.start_test("row_limit_read_back", SECTION_CROSS, "An admin-set row limit shows on the table and its copy")
+        tids = []
+        try:
+            tid = client.post("/api/tables", json={"name": "Limit Read Table", "columns": BASIC_COLUMNS}).json()["id"]
+            tids.append(tid)
+            etag = client.get(f"/api/tables/{tid}").headers.get("ETag")
+            resp = admin.put(f"/api/admin/tables/{tid}/row-limit", json={"max_rows": 5000})
+            results.add_step("PUT", f"/admin/tables/{tid}/row-limit (admin) → {resp.status_code}")
+            revalidated = client.get(f"/api/tables/{tid}", headers={"If-None-Match": etag})
+            results.add_step("GET", f"/tables/{tid} with the old ETag → {revalidated.status_code}")
+
+            fetched = client.get(f"/api/tables/{tid}").json()
+            updated = client.put(f"/api/tables/{tid}", json={"description": "Limited"}).json()
+            copy = client.post(f"/api/tables/{tid}/duplicate")
+            if copy.status_code == 201:
+                tids.append(copy.json()["id"])
+            results.add_step("GET/PUT/POST", f"max_rows → {fetched.get('max_rows')}, {updated.get('max_rows')}, {copy.json().get('max_rows')}")
+            results.set_output(f"get={fetched.get('max_rows')}, put={updated.get('max_rows')}, duplicate={copy.json().get('max_rows')}")
+            results.set_passed(
+                resp.status_code == 200
+                and revalidated.status_code == 200
+                and fetched["max_rows"] == 5000
+                and updated["max_rows"] == 5000
+                and copy.status_code == 201
+                and copy.json()["max_rows"] == 5000
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            for tid in tids:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_profile_update_visible(self, client, results):
+        results.start_test("profile_update_visible", SECTION_CROSS, "Profile updates and password changes are seen by the next request")
+        try:
+            client.get("/api/user/me")  # Warms the auth user cache
+            name = f"Core Test {uuid.uuid4().hex[:6]}"
+            resp = client.put("/api/user/me", json={"full_name": name})
+            results.add_step("PUT", f"/user/me → {resp.status_code}")
+            me = client.get("/api/user/me").json()
+            pw = client.post("/api/user/me/password", json={
+                "current_password": "TestPass123!", "new_password": "TestPass123!",
+            })
+            results.add_step("POST", f"/user/me/password → {pw.status_code}")
+            results.set_output(f"full_name={me.get('full_name')!r}, password status={pw.status_code}")
+            results.set_passed(me.get("full_name") == name and pw.status_code == 200)
+        except Exception as e:
+            results.set_error(str(e))
+        results.finish_test()
+
+    def test_tracking_batch(self, client, results):
+        results.start_test("tracking_batch", SECTION_CROSS, "Batched tracking events are accepted in one request")
+        try:
+            events = [
+                {"event_type": "view_data", "event_data": {"table_id": i}, "client_ts": "2020-01-01T00:00:00Z"}
+                for i in range(3)
+            ]
+            resp = client.post("/api/tracking/events/batch", json={"events": events})
+            results.add_step("POST", f"/tracking/events/batch (3 events) → {resp.status_code}")
+            bad = client.post("/api/tracking/events/batch", json={"events": [{"event_type": "x" * 51}]})
+            results.add_step("POST", f"/tracking/events/batch (oversized type) → {bad.status_code}")
+            results.set_output(f"response={resp.json()}, oversized={bad.status_code}")
+            results.set_passed(resp.status_code == 200 and resp.json().get("accepted") == 3 and bad.status_code == 422)
+        except Exception as e:
+            results.set_error(str(e))
+        results.finish_test()
+
     def test_table_isolation(self, client, results):
         """Cross: User A can't access User B's table."""
         results.start_test("table_isolation", SECTION_CROSS, "User B cannot GET User A's table")
@@ -690,3 +1194,211 @@ class TestCrossCutting:
             if tid:
                 _cleanup_table(client, tid)
         results.finish_test()
+
+    def test_export_csv(self, client, results):
+        results.start_test("export_csv", SECTION_CROSS, "GET /export streams CSV, plain and gzip")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "Export Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+            client.post(f"/api/tables/{tid}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": f"Row {i}", "col_age": i, "col_active": i % 2 == 0}}
+                for i in range(50)
+            ]})
+            results.add_step("POST", "Created 50 rows")
+
+            plain = client.get(f"/api/tables/{tid}/export")
+            zipped = client.get(f"/api/tables/{tid}/export", params={"gzip": "true"})
+            results.add_step("GET", f"/export → {plain.status_code}, gzip → {zipped.status_code}")
+
+            records = list(csv.reader(io.StringIO(plain.content.decode("utf-8"))))
+            unzipped = gzip.decompress(zipped.content).decode("utf-8")
+            results.set_output(f"lines={len(records)}, header={records[0] if records else None}")
+            results.set_passed(
+                plain.status_code == 200
+                and records[0] == ["Name", "Age", "Active"]
+                and len(records) == 51
+                and {"Row 0", "Row 49"} <= {r[0] for r in records[1:]}
+                and zipped.status_code == 200
+                and unzipped == plain.content.decode("utf-8")
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_import_csv(self, client, results):
+        results.start_test("import_csv", SECTION_CROSS, "POST /import (JSON and SSE progress)")
+        tid = None
+        try:
+            resp = client.post("/api/tables", json={
+                "name": "Import Table",
+                "columns": BASIC_COLUMNS,
+            })
+            tid = resp.json()["id"]
+
+            body = "\ufeffName,Age,Active\n" + "".join(f"Row {i},{i},{'yes' if i % 2 else 'no'}\n" for i in range(30))
+            plain = client.post(f"/api/tables/{tid}/import", files={"file": ("rows.csv", body.encode(), "text/csv")})
+            results.add_step("POST", f"/import → {plain.status_code}: {plain.text[:100]}")
+
+            streamed = client.post(
+                f"/api/tables/{tid}/import",
+                params={"stream": "true"},
+                files={"file": ("more.csv", "Name,Age\nLate,99\n".encode(), "text/csv")},
+            )
+            results.add_step("POST", f"/import?stream=true → {streamed.status_code}")
+
+            # Period and comma decimals in one column: keep what can't be read unambiguously
+            mixed = client.post(
+                f"/api/tables/{tid}/import",
+                files={"file": ("mixed.csv", 'Name,Age\nMixA,2.75\nMixB,"1,5"\nMixC,10\n'.encode(), "text/csv")},
+            )
+            results.add_step("POST", f"/import mixed decimals → {mixed.status_code}")
+
+            rows = client.get(f"/api/tables/{tid}/rows", params={"limit": 100}).json()["rows"]
+            by_name = {r["data"].get("col_name"): r["data"] for r in rows}
+            results.set_output(f"rows={len(rows)}, stream_tail={streamed.text[-120:]!r}")
+            results.set_passed(
+                plain.status_code == 200
+                and plain.json()["imported"] == 30
+                and streamed.status_code == 200
+                and "event: complete" in streamed.text
+                and mixed.status_code == 200
+                and len(rows) == 34
+                and by_name["Row 3"] == {"col_name": "Row 3", "col_age": 3, "col_active": True}
+                and by_name["Late"]["col_age"] == 99
+                and by_name["MixA"]["col_age"] == 2.75
+                and by_name["MixB"]["col_age"] == "1,5"
+                and by_name["MixC"]["col_age"] == 10
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_import_failure_partway(self, client, results):
+        results.start_test("import_failure_partway", SECTION_CROSS, "A failing import reports kept rows; import-with-schema drops its table")
+        tid = None
+        try:
+            # New table: bad bytes after the schema sample, inside the first batch
+            body = "Name,Age\n" + "".join(f"Person number {i:04d},{i}\n" for i in range(600))
+            failed_new = client.post(
+                "/api/tables/import-with-schema",
+                params={"table_name": "Half Imported"},
+                files={"file": ("rows.csv", body.encode() + b"Bad \xff\xfe,1\n", "text/csv")},
+            )
+            leftover = [t for t in client.get("/api/tables").json() if t["name"] == "Half Imported"]
+            results.add_step("POST", f"/import-with-schema (bad bytes) → {failed_new.status_code}, tables left={len(leftover)}")
+
+            # Existing table: the second batch fails after the first committed
+            admin = APIClient(TEST_BASE_URL)
+            has_admin = admin.login(TEST_ADMIN_EMAIL, TEST_ADMIN_PASSWORD).status_code == 200
+            tid = client.post("/api/tables", json={"name": "Partial Import", "columns": BASIC_COLUMNS}).json()["id"]
+            partial_ok = True
+            if has_admin:
+                admin.put(f"/api/admin/tables/{tid}/row-limit", json={"max_rows": 5000})
+                lines = "".join(json.dumps({"Name": f"Row {i}", "Age": i}) + "\n" for i in range(1000))
+                upload = (lines + "{not json\n").encode()
+                plain = client.post(
+                    f"/api/tables/{tid}/import",
+                    params={"format": "ndjson"},
+                    files={"file": ("rows.ndjson", upload, "application/x-ndjson")},
+                )
+                streamed = client.post(
+                    f"/api/tables/{tid}/import",
+                    params={"format": "ndjson", "stream": "true"},
+                    files={"file": ("rows.ndjson", upload, "application/x-ndjson")},
+                )
+                errors = [
+                    json.loads(line[len("data:"):])
+                    for event in streamed.text.split("event: error")[1:2]
+                    for line in event.splitlines() if line.startswith("data:")
+                ]
+                row_count = client.get(f"/api/tables/{tid}").json()["row_count"]
+                results.add_step("POST", f"/import ndjson (bad line 1001) → {plain.status_code}: {plain.text[:120]}")
+                results.add_step("POST", f"/import ndjson stream → error={errors}, row_count={row_count}")
+                partial_ok = (
+                    plain.status_code == 400
+                    and "1000 rows imported" in plain.json()["detail"]
+                    and errors and errors[0]["imported"] == 1000
+                    and row_count == 2000
+                )
+            else:
+                results.add_step("SKIP", "Admin login unavailable; partial-commit checks skipped")
+
+            results.set_output(f"new_table={failed_new.status_code}, leftover={len(leftover)}, admin={has_admin}")
+            results.set_passed(failed_new.status_code == 400 and leftover == [] and partial_ok)
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            if tid:
+                _cleanup_table(client, tid)
+        results.finish_test()
+
+    def test_columnar_round_trip(self, client, results):
+        results.start_test("columnar_round_trip", SECTION_CROSS, "Export and re-import NDJSON and Parquet")
+        source = target = streamed_target = None
+        try:
+            source = client.post("/api/tables", json={"name": "Columnar Source", "columns": BASIC_COLUMNS}).json()["id"]
+            target = client.post("/api/tables", json={"name": "Columnar Target", "columns": BASIC_COLUMNS}).json()["id"]
+            streamed_target = client.post("/api/tables", json={"name": "Columnar Streamed", "columns": BASIC_COLUMNS}).json()["id"]
+            client.post(f"/api/tables/{source}/rows/bulk", json={"operations": [
+                {"action": "create", "data": {"col_name": f"Row {i}", "col_age": i, "col_active": i % 2 == 0}}
+                for i in range(20)
+            ]})
+            results.add_step("POST", "Created 20 rows")
+
+            imported = {}
+            for fmt in ("ndjson", "parquet"):
+                exported = client.get(f"/api/tables/{source}/export", params={"format": fmt})
+                results.add_step("GET", f"/export?format={fmt} → {exported.status_code}, {len(exported.content)} bytes")
+                if exported.status_code == 501:  # pyarrow not installed on the server
+                    continue
+                resp = client.post(
+                    f"/api/tables/{target}/import",
+                    params={"format": fmt},
+                    files={"file": (f"rows.{fmt}", exported.content, "application/octet-stream")},
+                )
+                results.add_step("POST", f"/import?format={fmt} → {resp.status_code}: {resp.text[:100]}")
+                imported[fmt] = resp.json().get("imported") if resp.status_code == 200 else None
+
+            # The final progress event comes after the upload has been read to the end
+            ndjson = client.get(f"/api/tables/{source}/export", params={"format": "ndjson"}).content
+            streamed = client.post(
+                f"/api/tables/{streamed_target}/import",
+                params={"format": "ndjson", "stream": "true"},
+                files={"file": ("rows.ndjson", ndjson, "application/x-ndjson")},
+            )
+            complete = [
+                json.loads(line[len("data:"):])
+                for event in streamed.text.split("event: complete")[1:2]
+                for line in event.splitlines() if line.startswith("data:")
+            ]
+            results.add_step("POST", f"/import?format=ndjson&stream=true → {streamed.status_code}, complete={complete}")
+
+            rows = client.get(f"/api/tables/{target}/rows", params={"limit": 100}).json()["rows"]
+            row_3 = [r["data"] for r in rows if r["data"].get("col_name") == "Row 3"]
+            results.set_output(f"imported={imported}, rows={len(rows)}, row_3={row_3[:1]}")
+            results.set_passed(
+                imported.get("ndjson") == 20
+                and streamed.status_code == 200
+                and "event: error" not in streamed.text
+                and complete and complete[0]["imported"] == 20
+                and all(count == 20 for count in imported.values())
+                and len(rows) == 20 * len(imported)
+                and row_3[0] == {"col_name": "Row 3", "col_age": 3, "col_active": False}
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        finally:
+            for tid in (source, target, streamed_target):
+                if tid:
+                    _cleanup_table(client, tid)
+        results.finish_test()
@@ -603,6 +603,25 @@ class TestTableTools:
             results.set_error(str(e))
         results.finish_test()
 
+    async def test_aggregate_rows(self, test_table, results):
+        table, _ = test_table
+        results.start_test("aggregate_rows", SECTION_3, 'group_by=["Industry"], metrics=[count, distinct Founded]')
+        try:
+            from tools.builtin.table_data import execute_aggregate_rows
+
+            out = await run_with_session(lambda s: execute_aggregate_rows(
+                {"group_by": ["Industry"], "metrics": [{"op": "count"}, {"op": "distinct", "column": "Founded"}]},
+                s, TEST_USER_ID, {"table_id": table.id},
+            ))
+            results.set_output(out)
+            results.set_passed(
+                "Industry=Healthcare" in out and "count=" in out and "distinct_col_founded=" in out
+                and "Error" not in out
+            )
+        except Exception as e:
+            results.set_error(str(e))
+        results.finish_test()
+
     async def test_search_rows(self, test_table, results):
         table, _ = test_table
         results.start_test("search_rows", SECTION_3, 'query="Anthropic"')
@@ -12,16 +12,18 @@ from typing import Any, AsyncGenerator, Dict, Optional, Union
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import settings
 from tools.registry import ToolConfig, ToolProgress, ToolResult, register_tool
 from models import TableDefinition, TableRow
-from services.table_service import TableService
+from services.table_service import TableService, row_limit
 from services.row_service import RowService
-from schemas.table import RowCreate, RowUpdate
+from services.column_stats_service import ColumnStatsService
+from schemas.table import RowCreate, RowUpdate, AggregateMetric
 
 logger = logging.getLogger(__name__)
 
 # ── Limits ────────────────────────────────────────────────────────────────
-MAX_ROWS_PER_TABLE = 100        # Hard cap on rows in any single table
+MAX_ROWS_PER_TABLE = settings.MAX_ROWS_PER_TABLE  # Default row cap (tables may override, see row_limit)
 MAX_ROWS_PER_ENRICH = 20        # Max row_ids accepted by the enrich_column tool
 
 
@@ -67,10 +69,8 @@ async def execute_create_row(
         return "Error: Table not found or access denied."
 
     # Check row limit
-    table_service = TableService(db)
-    current_count = await table_service.get_row_count(table_id)
-    if current_count >= MAX_ROWS_PER_TABLE:
-        return f"Error: Table has reached the maximum of {MAX_ROWS_PER_TABLE} rows."
+    if table.row_count >= row_limit(table):
+        return f"Error: Table has reached the maximum of {row_limit(table)} rows."
 
     values = params.get("values", {})
     if not values:
@@ -91,7 +91,7 @@ async def execute_create_row(
         return f"Error: Unknown columns: {', '.join(unmapped)}. Available columns: {available}"
 
     row_service = RowService(db)
-    row = await row_service.create(table_id, RowCreate(data=data))
+    row = await row_service.create(table_id, RowCreate(data=data), table.columns)
 
     # Format response
     display = {col["name"]: data.get(col["id"], "") for col in table.columns if col["id"] in data}
@@ -136,7 +136,7 @@ async def execute_update_row(
 
     row_service = RowService(db)
     try:
-        await row_service.update(table_id, row_id, RowUpdate(data=mapped_data))
+        await row_service.update(table_id, row_id, RowUpdate(data=mapped_data), table.columns)
     except HTTPException:
         return f"Error: Row #{row_id} not found in this table."
 
@@ -228,9 +228,7 @@ async def execute_describe_table(
     if not table:
         return "Error: Table not found or access denied."
 
-    # Get row count
-    table_service = TableService(db)
-    row_count = await table_service.get_row_count(table_id)
+    row_count = table.row_count
 
     lines = [
         f"Table: {table.name}",
@@ -246,25 +244,45 @@ async def execute_describe_table(
             col_type += f" [{', '.join(col['options'])}]"
         lines.append(f"  - {col['name']} [id: {col['id']}] ({col_type}){required}")
 
+    if row_count == 0:
+        return "\n".join(lines)
+
+    # Column statistics are aggregated in the database and cached per column
+    stats = await ColumnStatsService(db).get_stats(table_id, table.columns, row_count, table.version)
+
     # Value distributions for select and boolean columns
     distributable = [c for c in table.columns if c.get("type") in ("select", "boolean")]
-    if distributable and row_count > 0:
-        row_service = RowService(db)
-        all_rows, _ = await row_service.list(table_id, offset=0, limit=MAX_ROWS_PER_TABLE)
-
+    if distributable:
         lines.append(f"\nValue distributions:")
         for col in distributable:
-            counts: Dict[str, int] = {}
-            for row in all_rows:
-                val = row.data.get(col["id"]) if row.data else None
-                if col["type"] == "boolean":
-                    key = "Yes" if val else "No"
-                else:
-                    key = str(val) if val is not None else "(empty)"
-                counts[key] = counts.get(key, 0) + 1
+            col_stats = stats.columns[col["id"]]
+            empty = stats.null_count(col["id"])
+            if col["type"] == "boolean":
+                yes = sum(n for value, n in col_stats.top_values if value == 1)
+                counts = {"Yes": yes, "No": row_count - yes}
+            else:
+                counts = {str(value): n for value, n in col_stats.top_values}
+                if empty:
+                    counts["(empty)"] = empty
             dist_parts = [f"{k}: {v}" for k, v in sorted(counts.items(), key=lambda x: -x[1])]
+            if col["type"] == "select" and col_stats.distinct_count > len(col_stats.top_values):
+                dist_parts.append(f"... ({col_stats.distinct_count} distinct values)")
             lines.append(f"  {col['name']}: {', '.join(dist_parts)}")
 
+    # Ranges for number and date columns
+    rangeable = [c for c in table.columns if c.get("type") in ("number", "date")]
+    if rangeable:
+        lines.append(f"\nValue ranges:")
+        for col in rangeable:
+            col_stats = stats.columns[col["id"]]
+            if not col_stats.non_empty:
+                lines.append(f"  {col['name']}: (all empty)")
+                continue
+            lines.append(
+                f"  {col['name']}: {col_stats.min_value} to {col_stats.max_value} "
+                f"({col_stats.distinct_count} distinct, {stats.null_count(col['id'])} empty)"
+            )
+
     return "\n".join(lines)
 
 
@@ -374,7 +392,7 @@ async def execute_get_rows(
     user_id: int,
     context: Dict[str, Any],
 ) -> str:
-    """Retrieve rows from the current table with offset/limit pagination."""
+    """Retrieve rows from the current table with offset/limit or cursor pagination."""
     table_id = _get_table_id(context)
     if not table_id:
         return "Error: No table context available."
@@ -383,19 +401,30 @@ async def execute_get_rows(
     if not table:
         return "Error: Table not found or access denied."
 
-    offset = max(params.get("offset", 0), 0)
+    cursor = params.get("cursor") or None
+    offset = 0 if cursor else max(params.get("offset", 0), 0)
     limit = min(max(params.get("limit", 50), 1), 200)
 
     row_service = RowService(db)
-    rows, total = await row_service.list(table_id, offset=offset, limit=limit)
+    try:
+        rows, total, next_cursor = await row_service.list_page(
+            table_id, offset=offset, limit=limit, after=cursor
+        )
+    except HTTPException:
+        return "Error: Invalid cursor. Start again without a cursor."
 
     if not rows:
+        if cursor:
+            return f"No more rows. Table has {total} total rows."
         if offset > 0:
             return f"No rows found at offset {offset}. Table has {total} total rows."
         return "The table is empty (0 rows)."
 
     # Format results — use column IDs as keys so the LLM sees consistent IDs
-    lines = [f"Rows {offset + 1}-{offset + len(rows)} of {total} total:\n"]
+    if cursor:
+        lines = [f"{len(rows)} more row(s) of {total} total:\n"]
+    else:
+        lines = [f"Rows {offset + 1}-{offset + len(rows)} of {total} total:\n"]
     for row in rows:
         display = {}
         for col in table.columns:
@@ -405,8 +434,8 @@ async def execute_get_rows(
                 display[col_id] = val
         lines.append(f"  Row #{row.id}: {json.dumps(display, default=str)}")
 
-    if offset + len(rows) < total:
-        lines.append(f"\n(More rows available. Use offset={offset + len(rows)} to continue.)")
+    if next_cursor:
+        lines.append(f"\n(More rows available. Use cursor=\"{next_cursor}\" to continue.)")
 
     return "\n".join(lines)
 
@@ -423,6 +452,10 @@ register_tool(ToolConfig(
             "limit": {
                 "type": "integer",
                 "description": "Number of rows to return (1-200). Default: 50"
+            },
+            "cursor": {
+                "type": "string",
+                "description": "Cursor from a previous get_rows result to fetch the next page (cheaper than offset on large tables)"
             }
         },
     },
@@ -431,6 +464,108 @@ register_tool(ToolConfig(
 ))
 
 
+async def execute_aggregate_rows(
+    params: Dict[str, Any],
+    db: AsyncSession,
+    user_id: int,
+    context: Dict[str, Any],
+) -> str:
+    """Compute grouped totals/averages/counts over the current table in SQL."""
+    table_id = _get_table_id(context)
+    if not table_id:
+        return "Error: No table context available."
+
+    table = await _get_table(db, table_id, user_id)
+    if not table:
+        return "Error: Table not found or access denied."
+
+    group_by = []
+    for name in params.get("group_by") or []:
+        col_id = _resolve_column_id(table.columns, name)
+        if not col_id:
+            return f"Error: Column '{name}' not found."
+        group_by.append(col_id)
+
+    metrics = []
+    for spec in params.get("metrics") or [{"op": "count"}]:
+        column = spec.get("column")
+        col_id = _resolve_column_id(table.columns, column) if column else None
+        if column and not col_id:
+            return f"Error: Column '{column}' not found."
+        try:
+            metrics.append(AggregateMetric(op=spec.get("op", "count"), column_id=col_id))
+        except ValueError:
+            return f"Error: Unknown aggregate '{spec.get('op')}'. Use count, sum, avg, min, max or distinct."
+
+    limit = min(max(params.get("limit", 50), 1), 200)
+
+    row_service = RowService(db)
+    try:
+        groups, truncated = await row_service.aggregate(
+            table_id, table.columns, group_by, metrics, limit=limit
+        )
+    except HTTPException as e:
+        return f"Error: {e.detail}"
+
+    if not groups:
+        return "No rows to aggregate."
+
+    names = {col["id"]: col["name"] for col in table.columns}
+    lines = [f"{len(groups)} group(s):\n" if group_by else "Result:\n"]
+    for group in groups:
+        key = ", ".join(
+            f"{names[col_id]}={'(empty)' if value is None else value}"
+            for col_id, value in group["key"].items()
+        )
+        values = ", ".join(f"{name}={value}" for name, value in group["values"].items())
+        lines.append(f"  {key}: {values}" if key else f"  {values}")
+
+    if truncated:
+        lines.append(f"\n(Only the first {limit} groups are shown.)")
+
+    return "\n".join(lines)
+
+
+register_tool(ToolConfig(
+    name="aggregate_rows",
+    description="Compute totals, averages, min/max, counts or distinct counts over ALL rows of the current table, optionally grouped by one or more columns. Runs in the database — use this instead of paging through rows with get_rows to answer summary questions.",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "group_by": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Column names or IDs to group by. Omit for a single table-wide result."
+            },
+            "metrics": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "op": {
+                            "type": "string",
+                            "enum": ["count", "sum", "avg", "min", "max", "distinct"],
+                        },
+                        "column": {
+                            "type": "string",
+                            "description": "Column name or ID (omit for count of rows). sum/avg need a number or boolean column; min/max a number, boolean or date column."
+                        },
+                    },
+                    "required": ["op"],
+                },
+                "description": "Aggregates to compute per group. Default: row count."
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of groups to return (1-200). Default: 50"
+            }
+        },
+    },
+    executor=execute_aggregate_rows,
+    category="table_data",
+))
+
+
 def _row_label(row: TableRow, columns: list) -> str:
     """Get a short label for a row (first non-empty text value)."""
     for col in columns:
@@ -0,0 +1,131 @@
+"""
+Connection pool instrumentation.
+
+The engines in database.py use the pool class below, which times every
+connection checkout (waiting for a free connection, opening an overflow
+connection and the pre-ping) and counts timeouts. A checkin event tracks how
+long each connection was held, which is what shows an SSE stream sitting on
+a session for a whole agent turn. Metrics are keyed by the pool's logging name
+(pool_logging_name on the engine) so they survive pool recreation.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    """Cumulative checkout statistics for one named pool."""
+    checkouts: int = 0
+    timeouts: int = 0
+    slow_checkouts: int = 0           # Checkouts over DB_POOL_WAIT_WARNING_MS
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    max_hold_ms: float = 0.0          # Longest completed checkout
+    held_since: Dict[int, float] = field(default_factory=dict)  # id(connection info) -> checkout time
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+
+_metrics: Dict[str, PoolMetrics] = {}
+
+
+def _pool_name(pool: Pool) -> str:
+    return pool.logging_name or f"pool-{id(pool)}"
+
+
+def metrics_for(pool: Pool) -> PoolMetrics:
+    """The metrics for a pool, created on first use."""
+    name = _pool_name(pool)
+    metrics = _metrics.get(name)
+    if metrics is None:
+        metrics = _metrics[name] = PoolMetrics()
+    return metrics
+
+
+class _InstrumentedPoolMixin:
+    """Times connect() and counts timeouts; must precede the pool class."""
+
+    def connect(self):
+        metrics = metrics_for(self)
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+            connection.info["pool_metrics"] = metrics
+            metrics.held_since[id(connection.info)] = time.perf_counter()
+            return connection
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            logger.error(
+                f"DB pool '{_pool_name(self)}' timed out after {self._timeout:.0f}s "
+                f"({self.checkedout()} checked out, size {self.size()} + overflow {self._max_overflow})"
+            )
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - start) * 1000
+            metrics.record_wait(wait_ms)
+            if wait_ms > settings.DB_POOL_WAIT_WARNING_MS:
+                metrics.slow_checkouts += 1
+                logger.warning(
+                    f"Waited {wait_ms:.0f}ms for a connection from DB pool '{_pool_name(self)}' "
+                    f"({self.checkedout()} checked out, size {self.size()} + overflow {self._max_overflow})"
+                )
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics (async engines)."""
+
+
+def _on_release(dbapi_connection, connection_record, *args) -> None:
+    """Checkin, invalidation or detach: the connection is no longer held."""
+    metrics = connection_record.info.pop("pool_metrics", None)
+    if metrics is None:
+        return
+    started = metrics.held_since.pop(id(connection_record.info), None)
+    if started is not None:
+        metrics.max_hold_ms = max(metrics.max_hold_ms, (time.perf_counter() - started) * 1000)
+
+
+# On Pool itself (class-level listeners on async pool subclasses aren't supported);
+# connections from other pools carry no metrics and are ignored
+for _event in ("checkin", "invalidate", "detach"):
+    event.listen(Pool, _event, _on_release)
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """Current occupancy plus cumulative metrics for one pool."""
+    metrics = metrics_for(pool)
+    now = time.perf_counter()
+    held = sorted(((now - started) * 1000 for started in metrics.held_since.values()), reverse=True)
+    status: Dict[str, Any] = {"name": _pool_name(pool)}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout_s=pool._timeout,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    status.update(
+        checkouts=metrics.checkouts,
+        timeouts=metrics.timeouts,
+        slow_checkouts=metrics.slow_checkouts,
+        avg_wait_ms=round(metrics.total_wait_ms / metrics.checkouts, 2) if metrics.checkouts else 0.0,
+        max_wait_ms=round(metrics.max_wait_ms, 2),
+        max_hold_ms=round(metrics.max_hold_ms, 2),
+        held_ms=[round(ms, 1) for ms in held[:10]],  # Longest-held current checkouts
+    )
+    return status
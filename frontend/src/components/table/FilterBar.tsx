@@ -1,5 +1,5 @@
 import { useState, useRef, useEffect } from 'react';
-import type { ColumnDefinition, TableRow } from '../../types/table';
+import type { ColumnDefinition, TableRow, TableStats } from '../../types/table';
 
 // =============================================================================
 // Types
@@ -14,6 +14,8 @@ export interface FilterState {
 interface FilterBarProps {
   columns: ColumnDefinition[];
   rows: TableRow[];
+  /** Server-side column stats; when given, counts cover the whole table rather than the loaded rows */
+  stats?: TableStats | null;
   filters: FilterState;
   onFiltersChange: (filters: FilterState) => void;
 }
@@ -26,8 +28,19 @@ function getFilterableColumns(columns: ColumnDefinition[]): ColumnDefinition[] {
   return columns.filter((c) => c.type === 'select' || c.type === 'boolean');
 }
 
-function countValues(rows: TableRow[], columnId: string): Map<string, number> {
+function countValues(rows: TableRow[], columnId: string, stats?: TableStats | null): Map<string, number> {
   const counts = new Map<string, number>();
+  const columnStats = stats?.columns.find((c) => c.column_id === columnId);
+  // Only use stats when the top values cover every distinct value
+  if (columnStats && columnStats.top_values.length >= columnStats.distinct_count) {
+    for (const [value, count] of columnStats.top_values) {
+      // Boolean values are indexed as 1/0
+      const key = value === 1 ? 'true' : value === 0 ? 'false' : String(value);
+      counts.set(key, (counts.get(key) || 0) + count);
+    }
+    counts.set('', columnStats.empty);
+    return counts;
+  }
   for (const row of rows) {
     const val = row.data[columnId];
     const key = val === null || val === undefined ? '' : String(val);
@@ -72,15 +85,17 @@ export function applyFilters(rows: TableRow[], filters: FilterState, columns: Co
 function BooleanChip({
   column,
   rows,
+  stats,
   value,
   onChange,
 }: {
   column: ColumnDefinition;
   rows: TableRow[];
+  stats?: TableStats | null;
   value: boolean | undefined;
   onChange: (val: boolean | undefined) => void;
 }) {
-  const counts = countValues(rows, column.id);
+  const counts = countValues(rows, column.id, stats);
   const trueCount = counts.get('true') || 0;
   const falseCount = counts.get('false') || 0;
 
@@ -131,18 +146,20 @@ function BooleanChip({
 function SelectChip({
   column,
   rows,
+  stats,
   selected,
   onChange,
 }: {
   column: ColumnDefinition;
   rows: TableRow[];
+  stats?: TableStats | null;
   selected: string[];
   onChange: (val: string[]) => void;
 }) {
   const [open, setOpen] = useState(false);
   const ref = useRef<HTMLDivElement>(null);
 
-  const counts = countValues(rows, column.id);
+  const counts = countValues(rows, column.id, stats);
   const options = column.options || [];
   const isActive = selected.length > 0;
 
@@ -254,15 +271,17 @@ function SelectChip({
 function SelectTabFilter({
   column,
   rows,
+  stats,
   selected,
   onChange,
 }: {
   column: ColumnDefinition;
   rows: TableRow[];
+  stats?: TableStats | null;
   selected: string[];
   onChange: (val: string[]) => void;
 }) {
-  const counts = countValues(rows, column.id);
+  const counts = countValues(rows, column.id, stats);
   const options = column.options || [];
   const isAllSelected = selected.length === 0;
 
@@ -327,7 +346,7 @@ function SelectTabFilter({
 // FilterBar
 // =============================================================================
 
-export default function FilterBar({ columns, rows, filters, onFiltersChange }: FilterBarProps) {
+export default function FilterBar({ columns, rows, stats, filters, onFiltersChange }: FilterBarProps) {
   const filterableColumns = getFilterableColumns(columns);
 
   if (filterableColumns.length === 0) return null;
@@ -376,6 +395,7 @@ export default function FilterBar({ columns, rows, filters, onFiltersChange }: F
               key={col.id}
               column={col}
               rows={rows}
+              stats={stats}
               selected={(filters[col.id] as string[]) || []}
               onChange={(val) => handleSelectChange(col.id, val)}
             />
@@ -400,6 +420,7 @@ export default function FilterBar({ columns, rows, filters, onFiltersChange }: F
                   key={col.id}
                   column={col}
                   rows={rows}
+                  stats={stats}
                   value={filters[col.id] as boolean | undefined}
                   onChange={(val) => handleBooleanChange(col.id, val)}
                 />
@@ -412,6 +433,7 @@ export default function FilterBar({ columns, rows, filters, onFiltersChange }: F
                   key={col.id}
                   column={col}
                   rows={rows}
+                  stats={stats}
                   selected={(filters[col.id] as string[]) || []}
                   onChange={(val) => handleSelectChange(col.id, val)}
                 />
@@ -3,7 +3,7 @@ import { authApi, type LoginCredentials, type RegisterCredentials } from '../lib
 import { setTokenRefreshedHandler, type TokenPayload } from '../lib/api'
 import { setAuthToken, getAuthToken, getUserData, setUserData, clearAuthData } from '../lib/authStorage'
 import { setStreamTokenRefreshedHandler } from '../lib/api/streamUtils'
-import { trackEvent } from '../lib/api/trackingApi'
+import { trackEvent, flushTrackingEvents } from '../lib/api/trackingApi'
 import type { AuthUser, UserRole } from '../types/user'
 
 interface AuthContextType {
@@ -203,8 +203,9 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
     }
 
     const logout = () => {
-        // Track logout before clearing credentials
+        // Track logout and send buffered events before clearing credentials
         trackEvent('logout')
+        void flushTrackingEvents()
 
         clearAuthData()
         setIsAuthenticated(false)
@@ -8,7 +8,9 @@ import type {
   TableListItem,
   TableRow,
   RowsListResponse,
+  RowChangesResponse,
   ColumnDefinition,
+  TableStats,
 } from '../../types/table';
 
 // =============================================================================
@@ -46,6 +48,19 @@ export async function updateTable(
   return response.data;
 }
 
+export async function duplicateTable(
+  tableId: number,
+  data?: { name?: string; remap_column_ids?: boolean }
+): Promise<TableDefinition> {
+  const response = await api.post(`/api/tables/${tableId}/duplicate`, data ?? {});
+  return response.data;
+}
+
+export async function getTableStats(tableId: number): Promise<TableStats> {
+  const response = await api.get(`/api/tables/${tableId}/stats`);
+  return response.data;
+}
+
 export async function deleteTable(tableId: number): Promise<void> {
   await api.delete(`/api/tables/${tableId}`);
 }
@@ -61,12 +76,25 @@ export async function listRows(
     limit?: number;
     sort_column?: string;
     sort_direction?: 'asc' | 'desc';
+    after?: string;
   }
 ): Promise<RowsListResponse> {
   const response = await api.get(`/api/tables/${tableId}/rows`, { params });
   return response.data;
 }
 
+export async function getRowChanges(
+  tableId: number,
+  params: {
+    since: number;
+    limit?: number;
+    after?: string;
+  }
+): Promise<RowChangesResponse> {
+  const response = await api.get(`/api/tables/${tableId}/rows/changes`, { params });
+  return response.data;
+}
+
 export async function createRow(
   tableId: number,
   data: Record<string, unknown>
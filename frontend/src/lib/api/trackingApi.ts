@@ -1,10 +1,13 @@
 /**
  * Tracking API
  *
- * Fire-and-forget event tracking to backend.
+ * Fire-and-forget event tracking to backend. Events are buffered and sent
+ * together to POST /api/tracking/events/batch every few seconds, when the
+ * buffer fills, when the page is hidden, and before logout.
  */
 
-import { api } from './index';
+import { api, getAuthToken } from './index';
+import settings from '../../config/settings';
 
 export interface TrackEventData {
     [key: string]: string | number | boolean | null | undefined;
@@ -15,23 +18,80 @@ export interface TrackEventRequest {
     event_data?: TrackEventData;
 }
 
+interface BufferedEvent extends TrackEventRequest {
+    client_ts: string;  // ISO time the event happened
+}
+
+const FLUSH_INTERVAL_MS = 5000;
+const MAX_BUFFERED_EVENTS = 50;
+
+let buffer: BufferedEvent[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
 /**
- * Track a frontend event.
- * Fire-and-forget - errors are logged but don't throw.
+ * Send all buffered events in one request.
+ * Fire-and-forget - errors are logged but don't throw. The token is read
+ * now, so a flush right before logout still goes out authenticated;
+ * keepalive lets the request outlive a closing page.
  */
-export async function trackEvent(eventType: string, eventData?: TrackEventData): Promise<void> {
-    console.log('[tracking]', eventType, eventData);
+export async function flushTrackingEvents(keepalive = false): Promise<void> {
+    if (flushTimer) {
+        clearTimeout(flushTimer);
+        flushTimer = null;
+    }
+    if (buffer.length === 0) return;
+
+    const events = buffer;
+    buffer = [];
+    const token = getAuthToken();
+    if (!token) return;  // Not logged in - the backend would reject these anyway
+
     try {
-        await api.post('/api/tracking/events', {
-            event_type: eventType,
-            event_data: eventData
-        });
+        if (keepalive) {
+            await fetch(`${settings.apiUrl}/api/tracking/events/batch`, {
+                method: 'POST',
+                keepalive: true,
+                headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
+                body: JSON.stringify({ events })
+            });
+        } else {
+            await api.post('/api/tracking/events/batch', { events }, {
+                headers: { Authorization: `Bearer ${token}` }
+            });
+        }
     } catch (error) {
         // Silent fail - don't let tracking errors affect the app
-        console.debug('Tracking event failed:', error);
+        console.debug('Tracking batch failed:', error);
     }
 }
 
+/**
+ * Track a frontend event.
+ * Fire-and-forget - queued for the next batch, never throws.
+ */
+export async function trackEvent(eventType: string, eventData?: TrackEventData): Promise<void> {
+    console.log('[tracking]', eventType, eventData);
+    buffer.push({
+        event_type: eventType,
+        event_data: eventData,
+        client_ts: new Date().toISOString()
+    });
+
+    if (buffer.length >= MAX_BUFFERED_EVENTS) {
+        void flushTrackingEvents();
+    } else if (!flushTimer) {
+        flushTimer = setTimeout(() => void flushTrackingEvents(), FLUSH_INTERVAL_MS);
+    }
+}
+
+if (typeof document !== 'undefined') {
+    // Tab hidden or closing: send now, the page may never run its timer
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') void flushTrackingEvents(true);
+    });
+    window.addEventListener('pagehide', () => void flushTrackingEvents(true));
+}
+
 /**
  * Event types tracked in TableThat
  */
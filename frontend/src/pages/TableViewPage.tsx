@@ -5,13 +5,13 @@ import {
 } from '@heroicons/react/24/outline';
 import { showErrorToast, showSuccessToast } from '../lib/errorToast';
 
-import { getTable, updateTable, listRows, createRow, updateRow, deleteRow, bulkDeleteRows, searchRows, exportTableCsv } from '../lib/api/tableApi';
+import { getTable, getTableStats, updateTable, listRows, createRow, updateRow, deleteRow, bulkDeleteRows, searchRows, exportTableCsv } from '../lib/api/tableApi';
 import { trackEvent } from '../lib/api/trackingApi';
 import { useTableProposal } from '../hooks/useTableProposal';
 import { useChatContext } from '../context/ChatContext';
 import { useAuth } from '../context/AuthContext';
 
-import type { TableDefinition, TableRow, SortState } from '../types/table';
+import type { TableDefinition, TableRow, SortState, TableStats } from '../types/table';
 import { applySchemaOperations, type SchemaProposalData } from '../types/schemaProposal';
 import type { DataOperation } from '../types/dataProposal';
 
@@ -39,6 +39,7 @@ export default function TableViewPage() {
   const [table, setTable] = useState<TableDefinition | null>(null);
   const [rows, setRows] = useState<TableRow[]>([]);
   const [totalRows, setTotalRows] = useState(0);
+  const [stats, setStats] = useState<TableStats | null>(null);
   const [loading, setLoading] = useState(true);
 
   // Chat context
@@ -94,18 +95,28 @@ export default function TableViewPage() {
   const fetchRows = useCallback(async () => {
     if (!tableId || isNaN(tableId)) return;
     try {
-      const response = await listRows(tableId, {
-        limit: 500,
-        sort_column: sort?.column_id,
-        sort_direction: sort?.direction,
-      });
+      const [response, tableStats] = await Promise.all([
+        listRows(tableId, {
+          limit: 500,
+          sort_column: sort?.column_id,
+          sort_direction: sort?.direction,
+        }),
+        getTableStats(tableId),
+      ]);
       setRows(response.rows);
       setTotalRows(response.total);
+      setStats(tableStats);
     } catch (err) {
       showErrorToast(err, 'Failed to load rows');
     }
   }, [tableId, sort]);
 
+  // Column stats are aggregated server-side; refresh them after local row edits
+  const refreshStats = useCallback(() => {
+    if (!tableId || isNaN(tableId)) return;
+    getTableStats(tableId).then(setStats).catch(() => setStats(null));
+  }, [tableId]);
+
   // -----------------------------------------------------------------------
   // Search rows
   // -----------------------------------------------------------------------
@@ -283,6 +294,7 @@ export default function TableViewPage() {
     try {
       const updatedRow = await updateRow(tableId, rowId, { [columnId]: value });
       setRows((prev) => prev.map((r) => (r.id === rowId ? updatedRow : r)));
+      refreshStats();
     } catch (err) {
       showErrorToast(err, 'Failed to update cell');
     }
@@ -297,6 +309,7 @@ export default function TableViewPage() {
       const newRow = await createRow(tableId, data);
       setRows((prev) => [newRow, ...prev]);
       setTotalRows((prev) => prev + 1);
+      refreshStats();
       setShowAddModal(false);
       showSuccessToast('Record added successfully');
     } catch (err) {
@@ -346,6 +359,7 @@ export default function TableViewPage() {
 
       setRows((prev) => prev.filter((r) => !selectedRowIds.has(r.id)));
       setTotalRows((prev) => prev - count);
+      refreshStats();
       setSelectedRowIds(new Set());
       showSuccessToast(`Deleted ${count} row${count !== 1 ? 's' : ''}`);
     } catch (err) {
@@ -507,6 +521,7 @@ export default function TableViewPage() {
           <FilterBar
             columns={table.columns}
             rows={rows}
+            stats={searchQuery.trim() ? null : stats}
             filters={filters}
             onFiltersChange={setFilters}
           />
@@ -21,6 +21,7 @@ export interface TableDefinition {
   description?: string;
   columns: ColumnDefinition[];
   row_count?: number;
+  max_rows?: number | null;  // Per-table row cap; null = server default
   created_at: string;
   updated_at: string;
 }
@@ -48,6 +49,30 @@ export interface RowsListResponse {
   total: number;
   offset: number;
   limit: number;
+  next_cursor?: string | null;
+}
+
+export interface RowChangesResponse {
+  version: number;
+  rows: TableRow[];
+  deleted: number[];
+  next_cursor?: string | null;
+}
+
+export interface ColumnStats {
+  column_id: string;
+  non_empty: number;
+  empty: number;
+  distinct_count: number;
+  min_value?: unknown;
+  max_value?: unknown;
+  top_values: [unknown, number][];
+}
+
+export interface TableStats {
+  table_id: number;
+  row_count: number;
+  columns: ColumnStats[];
 }
 
 export interface FilterState {